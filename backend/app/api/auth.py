@@ -1,16 +1,53 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Form, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.deps import get_db_session
-from app.core.security import OAuth2ClientCredentialsRequestForm
-from app.schemas.token import Token
+from app.core.config import settings
+from app.core.deps import (
+    check_token_rate_limit,
+    get_current_principal,
+    get_db_session,
+)
+from app.core.security import (
+    OAuth2ClientCredentialsRequestForm,
+    Principal,
+    jwt_keys,
+)
+from app.core.utils import now_utc
+from app.schemas.token import (
+    JWKSet,
+    Token,
+    TokenIntrospection,
+    TokenIntrospectionBatch,
+    TokenIntrospectionBatchRequest,
+)
 from app.services.clients import service_client
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
+def set_introspection_cache_headers(
+    response: Response,
+    results: list[TokenIntrospection],
+) -> None:
+    """Let callers cache introspection results until the first active token
+    expires. Results containing no active token are not cacheable, so a
+    revoked or not-yet-valid token is never remembered as inactive."""
+    expirations = [
+        result.exp
+        for result in results
+        if result.active and result.exp is not None
+    ]
+
+    if not expirations:
+        response.headers["Cache-Control"] = "no-store"
+        return
+
+    max_age = max(min(expirations) - int(now_utc().timestamp()), 0)
+    response.headers["Cache-Control"] = f"private, max-age={max_age}"
+
+
 @router.post(
     "/token",
     summary="Obtain an access token",
@@ -21,13 +58,24 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
         "to protected endpoints.\n\n"
         "Credentials are submitted as an `application/x-www-form-urlencoded` "
         "body following the OAuth 2.0 Client Credentials grant (RFC 6749 §4.4)."
+        "\n\nRequests are rate limited per remote address and per "
+        "``client_id``, before the credentials are checked."
     ),
+    dependencies=[Depends(check_token_rate_limit)],
     response_description="A bearer access token.",
     responses={
         401: {
             "description": "Invalid credentials — the client_id does not exist "
             "or the client_secret does not match.",
         },
+        429: {
+            "description": "Too many token requests from this address or for "
+            "this client_id; retry after the ``Retry-After`` delay.",
+        },
+        503: {
+            "description": "Too many credential verifications are already "
+            "in progress; retry after the ``Retry-After`` delay.",
+        },
     },
 )
 async def new_access_token(
@@ -52,10 +100,141 @@ async def new_access_token(
 
     Raises:
         HTTPException: ``401 Unauthorized`` when either credential is missing
-            or incorrect.
+            or incorrect; ``429 Too Many Requests`` when the caller is rate
+            limited; ``503 Service Unavailable`` when the password-hashing
+            executor is saturated.
     """
     return await service_client.authenticate(
         db_session,
         client_id=form.client_id,
         client_secret=form.client_secret,
     )
+
+
+@router.get(
+    "/.well-known/jwks.json",
+    response_model=JWKSet,
+    summary="Token signing keys",
+    description=(
+        "Publishes the public keys used to sign access tokens as a JSON Web "
+        "Key Set (RFC 7517), so that other services can verify tokens "
+        "locally by matching the token's ``kid`` header. The response is "
+        "cacheable; honour its ``Cache-Control`` header and revalidate with "
+        "``If-None-Match``.\n\n"
+        "The set is empty when tokens are signed with a shared secret "
+        "(``HS*`` algorithms). This endpoint is unauthenticated."
+    ),
+    response_description="The JSON Web Key Set.",
+    responses={304: {"description": "The key set has not changed."}},
+)
+async def jwks(request: Request) -> Response:
+    """Return the public JSON Web Key Set.
+
+    The body and its ``ETag`` are computed once from the configured keys.
+
+    Args:
+        request: The incoming request, checked for ``If-None-Match``.
+
+    Returns:
+        The serialised :class:`~app.schemas.token.JWKSet`, or an empty
+        ``304 Not Modified`` response when the caller's copy is current.
+    """
+    headers = {
+        "Cache-Control": f"public, max-age={settings.JWKS_MAX_AGE_SECONDS}",
+        "ETag": jwt_keys.jwks_etag,
+    }
+
+    if request.headers.get("If-None-Match") == jwt_keys.jwks_etag:
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers=headers,
+        )
+
+    return Response(
+        content=jwt_keys.jwks_body,
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+@router.post(
+    "/introspect",
+    response_model_exclude_none=True,
+    summary="Introspect an access token",
+    description=(
+        "Report whether an access token is currently active, following the "
+        "OAuth 2.0 Token Introspection spec (RFC 7662). A token is active "
+        "when it is correctly signed, unexpired, not revoked and owned by an "
+        'active client. Any other token yields ``{"active": false}``.\n\n'
+        "The token is submitted as an `application/x-www-form-urlencoded` "
+        "body. Callers must authenticate with their own bearer token. "
+        "Results for active tokens may be cached for the ``max-age`` of the "
+        "``Cache-Control`` header, which never outlives the token."
+    ),
+    response_description="The token's introspection result.",
+    responses={
+        401: {"description": "Missing or invalid caller credentials."},
+    },
+)
+async def introspect_token(
+    response: Response,
+    token: Annotated[str, Form(description="The token to introspect.")],
+    _: Principal = Depends(get_current_principal),
+    db_session: AsyncSession = Depends(get_db_session),
+) -> TokenIntrospection:
+    """Introspect a single access token.
+
+    Args:
+        response: The outgoing response, used to set ``Cache-Control``.
+        token: The token to introspect.
+        db_session: Injected async database session.
+
+    Returns:
+        A :class:`~app.schemas.token.TokenIntrospection`.
+    """
+    result = await service_client.introspect(db_session, token)
+    set_introspection_cache_headers(response, [result])
+    return result
+
+
+@router.post(
+    "/introspect/batch",
+    response_model_exclude_none=True,
+    summary="Introspect several access tokens",
+    description=(
+        "Introspect up to 100 tokens in a single round-trip, for gateways "
+        "that validate many tokens at once. Results are returned in request "
+        "order and follow the same rules as ``POST /auth/introspect``. The "
+        "``Cache-Control`` ``max-age`` is bounded by the earliest expiry "
+        "among the active tokens."
+    ),
+    response_description="The introspection results, in request order.",
+    responses={
+        401: {"description": "Missing or invalid caller credentials."},
+    },
+)
+async def introspect_tokens(
+    response: Response,
+    batch: TokenIntrospectionBatchRequest,
+    _: Principal = Depends(get_current_principal),
+    db_session: AsyncSession = Depends(get_db_session),
+) -> TokenIntrospectionBatch:
+    """Introspect a batch of access tokens.
+
+    Tokens are introspected sequentially, as they share one database
+    session; repeated tokens and clients are served from the caches.
+
+    Args:
+        response: The outgoing response, used to set ``Cache-Control``.
+        batch: The tokens to introspect.
+        db_session: Injected async database session.
+
+    Returns:
+        A :class:`~app.schemas.token.TokenIntrospectionBatch`.
+    """
+    results = [
+        await service_client.introspect(db_session, token)
+        for token in batch.tokens
+    ]
+    set_introspection_cache_headers(response, results)
+    return TokenIntrospectionBatch(results=results)
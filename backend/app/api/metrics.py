@@ -0,0 +1,82 @@
+from fastapi import APIRouter, Depends
+
+from app.core.database import engine, replica_router
+from app.core.deps import (
+    get_current_admin_principal,
+    token_address_rate_limiter,
+    token_client_rate_limiter,
+)
+from app.core.security import password_hash_executor, token_cache
+from app.schemas.metrics import (
+    CacheMetrics,
+    ExecutorMetrics,
+    Metrics,
+    PoolMetrics,
+    RateLimiterMetrics,
+    ReplicaMetrics,
+)
+from app.services.clients import client_cache, verified_secret_cache
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["Metrics"],
+    dependencies=[Depends(get_current_admin_principal)],
+)
+
+
+@router.get(
+    "",
+    summary="Process metrics",
+    description=(
+        "Returns in-process runtime counters for this worker, such as cache "
+        "hit/miss/eviction counts, password-hashing queue depth and latency, "
+        "database pool usage and wait times, and rate limiter decisions. "
+        "Every worker keeps its own counters.\n\n"
+        "Requires an active admin bearer token."
+    ),
+    response_description="The current counters of this worker.",
+)
+async def get_metrics() -> Metrics:
+    """Return a snapshot of this worker's runtime counters.
+
+    Returns:
+        A :class:`~app.schemas.metrics.Metrics` snapshot.
+    """
+    return Metrics(
+        caches={
+            "clients": CacheMetrics.model_validate(client_cache.stats()),
+            "tokens": CacheMetrics.model_validate(token_cache.stats()),
+            "verified_secrets": CacheMetrics.model_validate(
+                verified_secret_cache.stats()
+            ),
+        },
+        executors={
+            "password_hash": ExecutorMetrics.model_validate(
+                password_hash_executor.stats()
+            ),
+        },
+        pools={
+            "primary": PoolMetrics.model_validate(
+                engine.sync_engine.pool.stats()
+            ),
+            **{
+                f"replica-{index}": PoolMetrics.model_validate(
+                    replica_engine.sync_engine.pool.stats()
+                )
+                for index, replica_engine in enumerate(replica_router.engines)
+            },
+        },
+        replicas=[
+            ReplicaMetrics.model_validate(replica)
+            for replica in replica_router.stats()
+        ],
+        rate_limiters={
+            rate_limiter.name: RateLimiterMetrics.model_validate(
+                rate_limiter.stats()
+            )
+            for rate_limiter in (
+                token_address_rate_limiter,
+                token_client_rate_limiter,
+            )
+        },
+    )
@@ -1,16 +1,24 @@
 from collections.abc import Sequence
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.consts import DataFormat
 from app.core.deps import (
-    PaginationParams,
+    ListParams,
     get_client_by_id,
-    get_current_admin_client,
+    get_count_db_session,
+    get_current_admin_principal,
     get_db_session,
-    paginate,
+    get_read_db_session,
+    list_query,
+    sparse_fields,
 )
+from app.core.exports import EXPORT_MEDIA_TYPES, export_response
+from app.core.fieldsets import rows_response
+from app.core.pagination import fetch_page
 from app.models.clients import Client
 from app.schemas.clients import (
     ClientCreate,
@@ -19,12 +27,12 @@ from app.schemas.clients import (
     ClientUpdate,
     ClientUpdateResponse,
 )
-from app.services.clients import service_client
+from app.services.clients import CLIENT_LIST_SPEC, service_client
 
 router = APIRouter(
     prefix="/clients",
     tags=["Clients"],
-    dependencies=[Depends(get_current_admin_client)],
+    dependencies=[Depends(get_current_admin_principal)],
 )
 
 
@@ -83,34 +91,132 @@ async def create_client(
     description=(
         "Returns a paginated list of registered OAuth2 clients.\n\n"
         "Use the ``active_only`` query parameter to include soft-deleted "
-        "clients in the results. Requires an active admin bearer token."
+        "clients in the results. When more results may follow, the ``Link`` "
+        '(``rel="next"``) and ``X-Next-Cursor`` headers point to the next '
+        "page.\n\n"
+        "Use ``filter`` to only list some clients, e.g. "
+        "``filter=oauth_id:eq:<client_id>``, and ``sort`` to order them, "
+        "e.g. ``sort=-id``.\n\n"
+        "Use the ``fields`` query parameter to only receive some fields of "
+        "each client, e.g. ``fields=name,is_admin``.\n\n"
+        "Requires an active admin bearer token."
     ),
     response_description="A paginated list of client records.",
 )
 async def list_clients(
-    pagination: Annotated[PaginationParams, Depends(paginate())],
+    request: Request,
+    response: Response,
+    pagination: Annotated[
+        ListParams,
+        Depends(list_query(CLIENT_LIST_SPEC)),
+    ],
     active_only: bool = Query(
         True,
         description="When true, only active clients are returned",
     ),
-    db_session: AsyncSession = Depends(get_db_session),
-) -> Sequence[Client]:
+    fields: list[str] | None = Depends(sparse_fields(ClientRead)),
+    db_session: AsyncSession = Depends(get_read_db_session),
+    count_session: AsyncSession = Depends(get_count_db_session),
+) -> Sequence[Client] | Response:
     """Return a paginated list of OAuth2 clients.
 
     Args:
-        pagination: Resolved pagination parameters (``page``, ``per_page``).
+        request: The incoming request, used to build the next page link.
+        response: The outgoing response, receiving the next page headers.
+        pagination: Resolved pagination parameters (``page``, ``per_page``,
+            ``cursor``), filters, ordering and total count request.
         active_only: When ``True`` (default), soft-deleted clients are
             excluded from the results.
-        db_session: Injected async database session.
+        fields: Fields to select, or ``None`` for all of them.
+        db_session: Injected read-only database session, on a
+            replica when available.
+        count_session: Injected read-only session counting the clients,
+            concurrently with ``db_session``.
+
+    Returns:
+        A list of :class:`~app.schemas.clients.ClientRead` objects, or, with
+        ``fields``, a response holding only these fields, serialised
+        straight from the selected rows.
+    """
+    clients, total = await fetch_page(
+        service_client.get_many(
+            db_session,
+            pagination.page,
+            pagination.per_page,
+            active_only,
+            after=pagination.after,
+            columns=fields,
+            filters=pagination.filters,
+            order_by=pagination.order_by,
+        ),
+        service_client.count_many(
+            count_session,
+            active_only,
+            pagination.filters,
+        )
+        if pagination.count
+        else None,
+        concurrently=count_session is not db_session,
+    )
+
+    if fields is not None:
+        response = rows_response(clients)
+
+    pagination.set_next_page(request, response, clients)
+    pagination.set_total_count(response, total)
+    return response if fields is not None else clients
+
+
+@router.get(
+    "/export",
+    summary="Export clients",
+    description=(
+        "Streams every registered OAuth2 client, ordered by ID, as NDJSON "
+        "(``format=ndjson``, the default) or CSV (``format=csv``, with a "
+        "header line). Unlike the list endpoint, the export is not "
+        "paginated. Use the ``active_only`` query parameter to include "
+        "soft-deleted clients.\n\n"
+        "Requires an active admin bearer token."
+    ),
+    response_class=StreamingResponse,
+    response_description="The clients, one per line.",
+    responses={
+        200: {
+            "content": {
+                media_type: {"schema": {"type": "string"}}
+                for media_type in EXPORT_MEDIA_TYPES.values()
+            },
+        },
+    },
+)
+async def export_clients(
+    data_format: DataFormat = Query(
+        DataFormat.NDJSON,
+        alias="format",
+        description="Output format",
+    ),
+    active_only: bool = Query(
+        True,
+        description="When true, only active clients are exported",
+    ),
+    db_session: AsyncSession = Depends(get_read_db_session),
+) -> StreamingResponse:
+    """Stream every OAuth2 client.
+
+    Args:
+        data_format: Output format.
+        active_only: When ``True`` (default), soft-deleted clients are
+            excluded from the export.
+        db_session: Injected read-only database session, on a replica when
+            available, released once the stream ends.
 
     Returns:
-        A list of :class:`~app.schemas.clients.ClientRead` objects.
+        A :class:`~fastapi.responses.StreamingResponse` of the clients.
     """
-    return await service_client.get_many(
-        db_session,
-        pagination.page,
-        pagination.per_page,
-        active_only,
+    return export_response(
+        service_client.export(db_session, active_only, data_format),
+        data_format,
+        "clients",
     )
 
 
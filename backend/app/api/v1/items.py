@@ -1,25 +1,50 @@
 from collections.abc import Sequence
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
+from app.core.consts import DataFormat
 from app.core.deps import (
+    IMPORT_MEDIA_TYPES,
+    ListParams,
     PaginationParams,
-    get_current_client,
+    get_count_db_session,
+    get_current_principal,
     get_db_session,
+    get_import_format,
+    get_item_bulk_update_batch,
     get_item_by_id,
+    get_item_create_batch,
+    get_read_db_session,
+    list_query,
     paginate,
+    sparse_fields,
 )
-from app.models.clients import Client
+from app.core.exports import EXPORT_MEDIA_TYPES, export_response
+from app.core.fieldsets import rows_response
+from app.core.pagination import fetch_page
+from app.core.security import Principal
 from app.models.items import Item
-from app.schemas.items import ItemCreate, ItemRead, ItemUpdate
-from app.services.items import service_item
+from app.schemas.items import (
+    ItemBulkDelete,
+    ItemBulkResult,
+    ItemBulkUpdate,
+    ItemCreate,
+    ItemImportReport,
+    ItemRead,
+    ItemSearchResult,
+    ItemUpdate,
+)
+from app.services.items import ITEM_LIST_SPEC, service_item
 
 router = APIRouter(
     prefix="/items",
     tags=["Items"],
-    dependencies=[Depends(get_current_client)],
+    dependencies=[Depends(get_current_principal)],
 )
 
 
@@ -38,7 +63,7 @@ router = APIRouter(
 )
 async def create_item(
     create_schema: ItemCreate,
-    client: Client = Depends(get_current_client),
+    principal: Principal = Depends(get_current_principal),
     db_session: AsyncSession = Depends(get_db_session),
 ) -> Item:
     """Create a new item for the authenticated client.
@@ -46,15 +71,231 @@ async def create_item(
     Args:
         create_schema: Item creation payload containing ``title`` and
             ``description``.
-        client: The authenticated :class:`~app.models.clients.Client`; its
-            ``id`` is used as the item's ``owner_id``.
+        principal: The authenticated :class:`~app.core.security.Principal`;
+            its ``id`` is used as the item's ``owner_id``.
         db_session: Injected async database session.
 
     Returns:
         The newly created :class:`~app.models.items.Item` ORM instance,
         serialised as :class:`~app.schemas.items.ItemRead`.
     """
-    return await service_item.new(db_session, client, create_schema)
+    return await service_item.new(db_session, principal.id, create_schema)
+
+
+@router.post(
+    "/bulk",
+    response_model=list[ItemRead],
+    status_code=status.HTTP_201_CREATED,
+    summary="Create items in bulk",
+    description=(
+        "Creates up to ``ITEMS_BULK_MAX_SIZE`` items owned by the currently "
+        "authenticated client in a single request and transaction: either "
+        "every item is created or none is. The items are returned in the "
+        "order of the request body.\n\n"
+        "Requires a valid bearer token."
+    ),
+    response_description="The newly created items.",
+    responses={
+        422: {
+            "description": "Validation error — the body is empty, too "
+            "large, or contains an invalid item.",
+        },
+    },
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {
+                        "type": "array",
+                        "items": {
+                            "$ref": "#/components/schemas/ItemCreate",
+                        },
+                        "minItems": 1,
+                        "maxItems": settings.ITEMS_BULK_MAX_SIZE,
+                    },
+                },
+            },
+        },
+    },
+)
+async def create_items(
+    principal: Principal = Depends(get_current_principal),
+    create_schemas: list[ItemCreate] = Depends(get_item_create_batch),
+    db_session: AsyncSession = Depends(get_db_session),
+) -> Sequence[Item]:
+    """Create several items for the authenticated client.
+
+    Args:
+        principal: The authenticated :class:`~app.core.security.Principal`;
+            its ``id`` is used as the items' ``owner_id``.
+        create_schemas: Item creation payloads, validated in one pass by the
+            ``get_item_create_batch`` dependency.
+        db_session: Injected async database session.
+
+    Returns:
+        The newly created :class:`~app.models.items.Item` ORM instances,
+        serialised as :class:`~app.schemas.items.ItemRead`.
+    """
+    return await service_item.new_many(db_session, principal.id, create_schemas)
+
+
+@router.patch(
+    "/bulk",
+    response_model=list[ItemBulkResult],
+    summary="Update items in bulk",
+    description=(
+        "Partially updates up to ``ITEMS_BULK_MAX_SIZE`` items of the "
+        "currently authenticated client in a single request and "
+        "transaction. Each entry identifies its item by ``id`` and sets at "
+        "least one of ``title`` and ``description``.\n\n"
+        "The response gives the outcome of every entry, in request order: "
+        "``updated``, or ``not_found`` for items that do not exist or "
+        "belong to another client.\n\n"
+        "Requires a valid bearer token."
+    ),
+    response_description="The outcome of every entry.",
+    responses={
+        422: {
+            "description": "Validation error — the body is empty, too "
+            "large, repeats an ID, or contains an invalid entry.",
+        },
+    },
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {
+                        "type": "array",
+                        "items": ItemBulkUpdate.model_json_schema(),
+                        "minItems": 1,
+                        "maxItems": settings.ITEMS_BULK_MAX_SIZE,
+                    },
+                },
+            },
+        },
+    },
+)
+async def update_items(
+    principal: Principal = Depends(get_current_principal),
+    update_schemas: list[ItemBulkUpdate] = Depends(get_item_bulk_update_batch),
+    db_session: AsyncSession = Depends(get_db_session),
+) -> list[ItemBulkResult]:
+    """Apply partial updates to several items of the authenticated client.
+
+    Args:
+        principal: The authenticated :class:`~app.core.security.Principal`.
+        update_schemas: Update payloads, validated in one pass by the
+            ``get_item_bulk_update_batch`` dependency.
+        db_session: Injected async database session.
+
+    Returns:
+        The :class:`~app.schemas.items.ItemBulkResult` of every entry.
+    """
+    return await service_item.update_many(
+        db_session,
+        principal.id,
+        update_schemas,
+    )
+
+
+@router.delete(
+    "/bulk",
+    response_model=list[ItemBulkResult],
+    summary="Delete items in bulk",
+    description=(
+        "Permanently removes up to ``ITEMS_BULK_MAX_SIZE`` items of the "
+        "currently authenticated client in a single statement.\n\n"
+        "The response gives the outcome of every ID, in request order: "
+        "``deleted``, or ``not_found`` for items that do not exist or "
+        "belong to another client.\n\n"
+        "Requires a valid bearer token."
+    ),
+    response_description="The outcome of every ID.",
+    responses={
+        422: {
+            "description": "Validation error — the list of IDs is empty, "
+            "too large, or repeats an ID.",
+        },
+    },
+)
+async def delete_items(
+    delete_schema: ItemBulkDelete,
+    principal: Principal = Depends(get_current_principal),
+    db_session: AsyncSession = Depends(get_db_session),
+) -> list[ItemBulkResult]:
+    """Permanently delete several items of the authenticated client.
+
+    Args:
+        delete_schema: The IDs of the items to delete.
+        principal: The authenticated :class:`~app.core.security.Principal`.
+        db_session: Injected async database session.
+
+    Returns:
+        The :class:`~app.schemas.items.ItemBulkResult` of every ID.
+    """
+    return await service_item.delete_many(
+        db_session,
+        principal.id,
+        delete_schema.ids,
+    )
+
+
+@router.post(
+    "/import",
+    response_model=ItemImportReport,
+    summary="Import items",
+    description=(
+        "Creates items owned by the currently authenticated client from a "
+        "streamed NDJSON (``application/x-ndjson``) or CSV (``text/csv``) "
+        "body, of any size. NDJSON lines hold one item object each; CSV "
+        "input starts with a ``title,description`` header line and holds "
+        "one item per line.\n\n"
+        "Valid lines are imported and invalid ones skipped. The response "
+        "reports the errors of the first ``ITEMS_IMPORT_MAX_ERRORS`` "
+        "rejected lines, by line number.\n\n"
+        "Requires a valid bearer token."
+    ),
+    response_description="The import report.",
+    responses={
+        415: {"description": "Unsupported ``Content-Type``."},
+    },
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                media_type: {"schema": {"type": "string", "format": "binary"}}
+                for media_type in IMPORT_MEDIA_TYPES
+            },
+        },
+    },
+)
+async def import_items(
+    request: Request,
+    import_format: DataFormat = Depends(get_import_format),
+    principal: Principal = Depends(get_current_principal),
+    db_session: AsyncSession = Depends(get_db_session),
+) -> ItemImportReport:
+    """Import items for the authenticated client from a streamed body.
+
+    Args:
+        request: The incoming request, whose body is read as a stream.
+        import_format: Format of the body, resolved from its
+            ``Content-Type`` by the ``get_import_format`` dependency.
+        principal: The authenticated :class:`~app.core.security.Principal`;
+            its ``id`` is used as the items' ``owner_id``.
+        db_session: Injected async database session.
+
+    Returns:
+        The :class:`~app.schemas.items.ItemImportReport` of the import.
+    """
+    return await service_item.import_stream(
+        db_session,
+        principal.id,
+        request.stream(),
+        import_format,
+    )
 
 
 @router.get(
@@ -64,32 +305,202 @@ async def create_item(
     description=(
         "Returns a paginated list of items belonging to the authenticated "
         "client. Items owned by other clients are never included.\n\n"
+        'When more results may follow, the ``Link`` (``rel="next"``) and '
+        "``X-Next-Cursor`` headers point to the next page. Following the "
+        "cursor is cheaper than increasing ``page`` on large listings.\n\n"
+        "Use ``filter`` to only list some items, e.g. "
+        "``filter=title:prefix:Red``, and ``sort`` to order them, e.g. "
+        "``sort=-title``. Titles are compared and sorted by code point.\n\n"
+        "Use the ``fields`` query parameter to only receive some fields of "
+        "each item, e.g. ``fields=title``. The fields of the sort order are "
+        "always included.\n\n"
         "Requires a valid bearer token."
     ),
     response_description="A paginated list of the client's items.",
 )
 async def list_items(
-    pagination: Annotated[PaginationParams, Depends(paginate())],
-    client: Client = Depends(get_current_client),
-    db_session: AsyncSession = Depends(get_db_session),
-) -> Sequence[Item]:
+    request: Request,
+    response: Response,
+    pagination: Annotated[ListParams, Depends(list_query(ITEM_LIST_SPEC))],
+    fields: list[str] | None = Depends(sparse_fields(ItemRead)),
+    principal: Principal = Depends(get_current_principal),
+    db_session: AsyncSession = Depends(get_read_db_session),
+    count_session: AsyncSession = Depends(get_count_db_session),
+) -> Sequence[Item] | Response:
     """Return a paginated list of items owned by the authenticated client.
 
     Args:
-        pagination: Resolved pagination parameters (``page``, ``per_page``).
-        client: The authenticated :class:`~app.models.clients.Client` used to
-            filter results by ``owner_id``.
-        db_session: Injected async database session.
+        request: The incoming request, used to build the next page link.
+        response: The outgoing response, receiving the next page headers.
+        pagination: Resolved pagination parameters (``page``, ``per_page``,
+            ``cursor``), filters, ordering and total count request.
+        fields: Fields to select, or ``None`` for all of them.
+        principal: The authenticated :class:`~app.core.security.Principal`
+            used to filter results by ``owner_id``.
+        db_session: Injected read-only database session, on a
+            replica when available.
+        count_session: Injected read-only session counting the items,
+            concurrently with ``db_session``.
+
+    Returns:
+        A list of :class:`~app.schemas.items.ItemRead` objects, or, with
+        ``fields``, a response holding only these fields, serialised
+        straight from the selected rows.
+    """
+    if fields is not None:
+        page = service_item.get_multi_rows(
+            db_session,
+            list(dict.fromkeys([*fields, *pagination.key])),
+            *pagination.filters,
+            page=pagination.page,
+            per_page=pagination.per_page,
+            order_by=pagination.order_by,
+            after=pagination.after,
+            owner_id=principal.id,
+        )
+    else:
+        page = service_item.get_multi(
+            db_session,
+            *pagination.filters,
+            page=pagination.page,
+            per_page=pagination.per_page,
+            order_by=pagination.order_by,
+            after=pagination.after,
+            owner_id=principal.id,
+        )
+
+    count = (
+        service_item.count_owned(
+            count_session,
+            principal.id,
+            pagination.filters,
+        )
+        if pagination.count
+        else None
+    )
+
+    items, total = await fetch_page(
+        page,
+        count,
+        concurrently=count_session is not db_session,
+    )
+
+    if fields is not None:
+        response = rows_response(items)
+
+    pagination.set_next_page(request, response, items)
+    pagination.set_total_count(response, total)
+    return response if fields is not None else items
+
+
+@router.get(
+    "/export",
+    summary="Export items",
+    description=(
+        "Streams every item of the currently authenticated client, ordered "
+        "by ID, as NDJSON (``format=ndjson``, the default) or CSV "
+        "(``format=csv``, with a header line). Unlike the list endpoint, "
+        "the export is not paginated.\n\n"
+        "Requires a valid bearer token."
+    ),
+    response_class=StreamingResponse,
+    response_description="The items, one per line.",
+    responses={
+        200: {
+            "content": {
+                media_type: {"schema": {"type": "string"}}
+                for media_type in EXPORT_MEDIA_TYPES.values()
+            },
+        },
+    },
+)
+async def export_items(
+    data_format: DataFormat = Query(
+        DataFormat.NDJSON,
+        alias="format",
+        description="Output format",
+    ),
+    principal: Principal = Depends(get_current_principal),
+    db_session: AsyncSession = Depends(get_read_db_session),
+) -> StreamingResponse:
+    """Stream every item owned by the authenticated client.
+
+    The rows are read through a server-side cursor while the response is
+    sent, so memory stays bounded and a slow client slows the query down.
+
+    Args:
+        data_format: Output format.
+        principal: The authenticated :class:`~app.core.security.Principal`
+            used to filter results by ``owner_id``.
+        db_session: Injected read-only database session, on a replica when
+            available, released once the stream ends.
+
+    Returns:
+        A :class:`~fastapi.responses.StreamingResponse` of the items.
+    """
+    return export_response(
+        service_item.export(db_session, principal.id, data_format),
+        data_format,
+        "items",
+    )
+
+
+@router.get(
+    "/search",
+    response_model=list[ItemSearchResult],
+    summary="Search items",
+    description=(
+        "Full-text search among the items of the authenticated client, "
+        "over their title and description. Results are ranked by relevance, "
+        "title matches first.\n\n"
+        "``q`` supports quoted phrases, ``or`` and ``-`` to exclude a "
+        'term, e.g. ``q="red apple" or pear -green``.\n\n'
+        'When more results may follow, the ``Link`` (``rel="next"``) and '
+        "``X-Next-Cursor`` headers point to the next page.\n\n"
+        "Requires a valid bearer token."
+    ),
+    response_description="The matching items, most relevant first.",
+)
+async def search_items(
+    request: Request,
+    response: Response,
+    q: str = Query(
+        min_length=1,
+        max_length=256,
+        description="Search terms",
+    ),
+    pagination: PaginationParams = Depends(
+        paginate(sort="rank", key=(("rank", float), ("id", int)))
+    ),
+    principal: Principal = Depends(get_current_principal),
+    db_session: AsyncSession = Depends(get_read_db_session),
+) -> Sequence[Row]:
+    """Return a page of the authenticated client's items matching ``q``.
+
+    Args:
+        request: The incoming request, used to build the next page link.
+        response: The outgoing response, receiving the next page headers.
+        q: The search terms.
+        pagination: Resolved pagination parameters (``page``, ``per_page``,
+            ``cursor``).
+        principal: The authenticated :class:`~app.core.security.Principal`
+            used to filter results by ``owner_id``.
+        db_session: Injected read-only database session, on a
+            replica when available.
 
     Returns:
-        A list of :class:`~app.schemas.items.ItemRead` objects.
+        A list of :class:`~app.schemas.items.ItemSearchResult` objects.
     """
-    return await service_item.get_multi(
+    rows = await service_item.search(
         db_session,
+        principal.id,
+        q,
         page=pagination.page,
         per_page=pagination.per_page,
-        owner_id=client.id,
+        after=pagination.after,
     )
+    pagination.set_next_page(request, response, rows)
+    return rows
 
 
 @router.get(
@@ -138,31 +549,38 @@ async def get_item(
             "description": "Validation error — all fields were ``null`` or "
             "the payload was otherwise invalid.",
         },
-        500: {"description": "Unexpected persistence failure."},
     },
 )
 async def update_item(
+    id: int,
     update_schema: ItemUpdate,
-    item: Item = Depends(get_item_by_id),
+    principal: Principal = Depends(get_current_principal),
     db_session: AsyncSession = Depends(get_db_session),
 ) -> Item:
     """Apply a partial update to an item.
 
     At least one field in the payload must be non-``None`` (enforced by
-    :class:`~app.schemas.base.NonEmptyModel`).
+    :class:`~app.schemas.base.NonEmptyModel`). The item is updated and
+    returned by a single statement, scoped to the authenticated client.
 
     Args:
+        id: The ``id`` of the item to update.
         update_schema: Fields to update (``title`` and/or ``description``).
-        item: The resolved :class:`~app.models.items.Item` ORM instance.
+        principal: The authenticated :class:`~app.core.security.Principal`.
         db_session: Injected async database session.
 
     Returns:
         The updated :class:`~app.models.items.Item` ORM instance.
 
     Raises:
-        HTTPException: ``500 Internal Server Error`` on unexpected failure.
+        HTTPException: ``404 Not Found`` if the client owns no such item.
     """
-    return await service_item.update_check(db_session, item, update_schema)
+    return await service_item.update_owned(
+        db_session,
+        id,
+        principal.id,
+        update_schema,
+    )
 
 
 @router.delete(
@@ -179,16 +597,22 @@ async def update_item(
     },
 )
 async def delete_item(
-    item: Item = Depends(get_item_by_id),
+    id: int,
+    principal: Principal = Depends(get_current_principal),
     db_session: AsyncSession = Depends(get_db_session),
 ) -> None:
     """Permanently delete an item.
 
     Unlike client deactivation, this is a hard delete — the record is removed
-    from the database entirely.
+    from the database entirely, by a single statement scoped to the
+    authenticated client.
 
     Args:
-        item: The resolved :class:`~app.models.items.Item` ORM instance.
+        id: The ``id`` of the item to delete.
+        principal: The authenticated :class:`~app.core.security.Principal`.
         db_session: Injected async database session.
+
+    Raises:
+        HTTPException: ``404 Not Found`` if the client owns no such item.
     """
-    await service_item.delete(db_session, db_object=item)
+    await service_item.delete_owned(db_session, id, principal.id)
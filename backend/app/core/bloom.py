@@ -0,0 +1,69 @@
+import hashlib
+import math
+from collections.abc import Iterable
+
+
+class BloomFilter:
+    """Probabilistic set membership with no false negatives.
+
+    :meth:`might_contain` is ``False`` only for items that were never added,
+    and ``True`` for added items plus a ``error_rate`` fraction of the
+    others, as long as no more than ``capacity`` items were added. Beyond
+    that the filter stays correct but its false-positive rate grows.
+
+    Items cannot be removed; rebuild the filter to drop them.
+
+    Example:
+        >>> bloom = BloomFilter(capacity=100, error_rate=0.01)
+        >>> bloom.add("a")
+        >>> bloom.might_contain("a")
+        True
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        error_rate: float = 0.001,
+        items: Iterable[str] = (),
+    ):
+        """Initialize the filter, sized for ``capacity`` items.
+
+        Args:
+            capacity: Expected number of items.
+            error_rate: Target false-positive rate, between 0 and 1.
+            items: Items to add right away.
+        """
+        capacity = max(capacity, 1)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = math.ceil(
+            -capacity * math.log(error_rate) / math.log(2) ** 2
+        )
+        self.num_hashes = max(
+            round(self.num_bits / capacity * math.log(2)),
+            1,
+        )
+        self.count = 0
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+        for item in items:
+            self.add(item)
+
+    def _positions(self, item: str) -> list[int]:
+        # Double hashing (Kirsch-Mitzenmacher): every position is derived
+        # from the two halves of a single 128-bit digest.
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8])
+        h2 = int.from_bytes(digest[8:]) | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def might_contain(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
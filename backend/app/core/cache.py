@@ -0,0 +1,152 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Point-in-time snapshot of a :class:`TTLCache`'s counters."""
+
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    invalidations: int
+
+
+class TTLCache[K: Hashable, V]:
+    """Bounded, thread-safe LRU cache whose entries expire after a TTL.
+
+    Entries are evicted in least-recently-used order once ``max_size`` is
+    reached, and are treated as missing once their time-to-live has elapsed.
+    Expired entries are dropped lazily, on access.
+
+    The cache is process-local: in multi-worker deployments each worker holds
+    its own copy, so explicit invalidation only reaches the current process
+    and the TTL bounds how long other workers may serve stale entries.
+
+    Example:
+        >>> cache: TTLCache[str, int] = TTLCache(max_size=2, ttl_seconds=60)
+        >>> cache.set("a", 1)
+        >>> cache.get("a")
+        1
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize an empty cache.
+
+        Args:
+            max_size: Maximum number of entries kept. A value of ``0`` (or a
+                non-positive ``ttl_seconds``) disables the cache entirely.
+            ttl_seconds: Default time-to-live of each entry, in seconds.
+            clock: Monotonic time source, injectable for testing.
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl_seconds > 0
+
+    def get(self, key: K) -> V | None:
+        """Return the cached value for ``key``, or ``None`` on a miss."""
+        with self._lock:
+            entry = self._data.get(key)
+
+            if entry is None:
+                self._misses += 1
+                return None
+
+            expires_at, value = entry
+
+            if expires_at <= self._clock():
+                del self._data[key]
+                self._expirations += 1
+                self._misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def set(self, key: K, value: V, ttl_seconds: float | None = None) -> None:
+        """Store ``value`` under ``key``, evicting the LRU entry if full.
+
+        Args:
+            key: Cache key.
+            value: Value to cache.
+            ttl_seconds: Optional per-entry TTL. It can only shorten the
+                cache-wide TTL, never extend it.
+        """
+        if not self.enabled:
+            return
+
+        ttl = self.ttl_seconds
+        if ttl_seconds is not None:
+            ttl = min(ttl, ttl_seconds)
+
+        if ttl <= 0:
+            return
+
+        with self._lock:
+            self._data[key] = (self._clock() + ttl, value)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, key: K) -> None:
+        """Drop ``key`` from the cache, if present."""
+        with self._lock:
+            if self._data.pop(key, None) is not None:
+                self._invalidations += 1
+
+    def invalidate_where(self, predicate: Callable[[K, V], bool]) -> None:
+        """Drop every entry for which ``predicate(key, value)`` is true.
+
+        Runs in ``O(size)``; meant for rare administrative invalidations.
+        """
+        with self._lock:
+            keys = [
+                key
+                for key, (_, value) in self._data.items()
+                if predicate(key, value)
+            ]
+            for key in keys:
+                del self._data[key]
+            self._invalidations += len(keys)
+
+    def clear(self) -> None:
+        """Drop every entry. Counters are left untouched."""
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                size=len(self._data),
+                max_size=self.max_size,
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expirations=self._expirations,
+                invalidations=self._invalidations,
+            )
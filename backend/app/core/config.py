@@ -1,5 +1,7 @@
 from pydantic_settings import BaseSettings
 
+from app.core.consts import ExecutorKind, RateLimitBackend
+
 
 class Settings(BaseSettings):
     # Database
@@ -9,12 +11,110 @@ class Settings(BaseSettings):
     DB_USERNAME: str
     DB_PASSWORD: str
 
+    # Connection pool. Unless set, pool size and overflow split
+    # DB_MAX_CONNECTIONS evenly across the WEB_CONCURRENCY workers (the
+    # variable uvicorn reads its worker count from).
+    WEB_CONCURRENCY: int = 1
+    DB_MAX_CONNECTIONS: int = 90
+    DB_POOL_SIZE: int | None = None
+    DB_MAX_OVERFLOW: int | None = None
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # Set when connecting through a transaction-mode pooler (e.g. PgBouncer):
+    # disables local pooling and prepared statement caching, and ignores the
+    # pool settings above.
+    DB_POOLER_MODE: bool = False
+
+    # Read replicas, as "host" or "host:port" entries sharing the primary's
+    # database and credentials. Reads move back to the primary when replicas
+    # are unreachable or lag by more than DB_REPLICA_MAX_LAG_SECONDS, and for
+    # DB_READ_YOUR_WRITES_SECONDS after a client's own writes.
+    DB_REPLICA_HOSTS: list[str] = []
+    DB_REPLICA_MAX_LAG_SECONDS: float = 5.0
+    DB_REPLICA_HEALTH_CHECK_SECONDS: float = 5.0
+    DB_READ_YOUR_WRITES_SECONDS: float = 10.0
+
     # Security
-    JWT_SECRET: str
+    JWT_SECRET: str | None = None
     JWT_TOKEN_TYPE: str
     JWT_ALGORITHM: str = "HS256"
+    # Only used with asymmetric algorithms (RS256, ES256, EdDSA, ...): PEM
+    # private keys keyed by key id, given as a JSON object.
+    JWT_PRIVATE_KEYS: dict[str, str] = {}
+    JWT_SIGNING_KEY_ID: str | None = None
+    JWKS_MAX_AGE_SECONDS: int = 300
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # Password hashing. Profiles are Argon2 parameters (time_cost,
+    # memory_cost, parallelism, ...) keyed by name; every client is hashed
+    # with one of them. Empty parameters use the library defaults.
+    PASSWORD_HASH_PROFILES: dict[str, dict[str, int]] = {
+        "default": {},
+        # For machine clients with generated, high-entropy secrets.
+        "machine": {"time_cost": 1, "memory_cost": 19456, "parallelism": 1},
+    }
+    PASSWORD_HASH_DEFAULT_PROFILE: str = "default"  # noqa: S105
+    PASSWORD_HASH_EXECUTOR: ExecutorKind = ExecutorKind.THREAD
+    PASSWORD_HASH_MAX_WORKERS: int | None = None
+    PASSWORD_HASH_MAX_PENDING: int = 64
+
+    # Caching
+    CLIENT_CACHE_MAX_SIZE: int = 1024
+    CLIENT_CACHE_TTL_SECONDS: float = 30.0
+    TOKEN_CACHE_MAX_SIZE: int = 4096
+    TOKEN_CACHE_TTL_SECONDS: float = 300.0
+    VERIFIED_SECRET_CACHE_ENABLED: bool = False
+    VERIFIED_SECRET_CACHE_MAX_SIZE: int = 1024
+    VERIFIED_SECRET_CACHE_TTL_SECONDS: float = 300.0
+
+    # In-memory filter of existing client ids, used to reject unknown ids
+    # without a database query. Each worker refreshes its own filter from the
+    # database periodically, so with several workers, ids created or
+    # regenerated through another worker are rejected with 401 for up to
+    # CLIENT_ID_FILTER_REFRESH_SECONDS. Opt-in: only enable it when such a
+    # delay is acceptable, e.g. with a single worker.
+    CLIENT_ID_FILTER_ENABLED: bool = False
+    CLIENT_ID_FILTER_ERROR_RATE: float = 0.001
+    CLIENT_ID_FILTER_MIN_CAPACITY: int = 1024
+    CLIENT_ID_FILTER_REFRESH_SECONDS: float = 60.0
+
+    # Rate limiting of token requests. Rates are in requests per second; a
+    # non-positive rate disables the corresponding limit. The per-address
+    # limit is keyed on the connection's remote address: it is disabled by
+    # default, since behind a proxy or load balancer every caller would
+    # share the proxy's bucket. Only enable it when the server sees the
+    # callers' addresses, e.g. with uvicorn's --forwarded-allow-ips set to
+    # the trusted proxies.
+    RATE_LIMIT_BACKEND: RateLimitBackend = RateLimitBackend.MEMORY
+    RATE_LIMIT_MEMORY_SHARDS: int = 16
+    RATE_LIMIT_MEMORY_MAX_KEYS: int = 65536
+    TOKEN_RATE_LIMIT_CLIENT_RATE: float = 0.2
+    TOKEN_RATE_LIMIT_CLIENT_BURST: int = 10
+    TOKEN_RATE_LIMIT_ADDRESS_RATE: float = 0.0
+    TOKEN_RATE_LIMIT_ADDRESS_BURST: int = 30
+
+    # Maximum number of items created, updated or deleted by a bulk request.
+    ITEMS_BULK_MAX_SIZE: int = 5000
+
+    # Streamed item imports. Rows are loaded by batches of at most
+    # ITEMS_IMPORT_BATCH_SIZE rows or ITEMS_IMPORT_BATCH_BYTES of text, and
+    # at most ITEMS_IMPORT_MAX_ERRORS line errors are reported.
+    ITEMS_IMPORT_BATCH_SIZE: int = 1000
+    ITEMS_IMPORT_BATCH_BYTES: int = 1048576
+    ITEMS_IMPORT_MAX_LINE_BYTES: int = 16384
+    ITEMS_IMPORT_MAX_ERRORS: int = 100
+
+    # Streamed exports fetch and send rows by batches of EXPORT_BATCH_SIZE.
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # Maximum number of values of an ``in`` list filter.
+    FILTER_MAX_IN_VALUES: int = 100
+
+    # Total counts of listings are exact up to this many results, and
+    # estimated by the query planner beyond.
+    COUNT_EXACT_THRESHOLD: int = 10000
+
     # Default users
     ADMIN_CLIENT_NAME: str = "Admin"
     ADMIN_CLIENT_ID: str
@@ -9,3 +9,45 @@ class Environment(StrEnum):
     DEVELOPMENT = "development"
     PRODUCTION = "production"
     TESTING = "testing"
+
+
+class ExecutorKind(StrEnum):
+    """Enum for supported pool types of blocking-work executors."""
+
+    THREAD = "thread"
+    PROCESS = "process"
+    INTERPRETER = "interpreter"
+
+
+class RateLimitBackend(StrEnum):
+    """Enum for supported rate limiter storage backends."""
+
+    MEMORY = "memory"
+    DATABASE = "database"
+
+
+class BulkOutcome(StrEnum):
+    """Enum for the per-record outcomes of bulk operations."""
+
+    UPDATED = "updated"
+    DELETED = "deleted"
+    NOT_FOUND = "not_found"
+
+
+class DataFormat(StrEnum):
+    """Enum for supported formats of streamed imports and exports."""
+
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class FilterOperator(StrEnum):
+    """Enum for the operators of list filters."""
+
+    EQ = "eq"
+    IN = "in"
+    PREFIX = "prefix"
+    GT = "gt"
+    GTE = "gte"
+    LT = "lt"
+    LTE = "lte"
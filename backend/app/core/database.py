@@ -1,15 +1,38 @@
 import asyncio
+import itertools
+import logging
 import socket
+import threading
+import time
+import uuid
+from abc import ABCMeta, abstractmethod
+from collections.abc import Hashable
+from dataclasses import dataclass
 from enum import StrEnum
+from typing import Any
 
-from sqlalchemy import URL, text
+from sqlalchemy import URL, event, text
+from sqlalchemy.engine import ExceptionContext
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import (
+    AsyncAdaptedQueuePool,
+    ConnectionPoolEntry,
+    NullPool,
+    Pool,
+    PoolProxiedConnection,
+)
 
+from app.core.cache import TTLCache
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 
 class DatabaseDriver(StrEnum):
     """Enum for supported database drivers."""
@@ -18,26 +41,205 @@ class DatabaseDriver(StrEnum):
     PSYCOPG = "postgresql+psycopg"
 
 
-def get_database_url(drivername: str = DatabaseDriver.ASYNCPG) -> URL:
-    """Construct the database URL from settings."""
+def get_database_url(
+    drivername: str = DatabaseDriver.ASYNCPG,
+    host: str | None = None,
+) -> URL:
+    """Construct the database URL from settings.
+
+    Args:
+        drivername: The SQLAlchemy driver to connect with.
+        host: Connect to this ``host`` or ``host:port`` instead of the
+            primary, e.g. a read replica.
+    """
+    port = settings.DB_PORT
+
+    if host is None:
+        host = settings.DB_HOST
+    elif ":" in host:
+        host, _, port = host.rpartition(":")
+
     return URL.create(
         drivername=drivername,
         username=settings.DB_USERNAME,
         password=settings.DB_PASSWORD,
-        host=settings.DB_HOST,
-        port=settings.DB_PORT,
+        host=host,
+        port=int(port),
         database=settings.DB_DATABASE,
     )
 
 
+@dataclass(frozen=True)
+class PoolStats:
+    """Point-in-time snapshot of an instrumented pool.
+
+    ``wait_*`` measure how long checkouts took to obtain a connection, in
+    seconds, including opening new ones.
+    """
+
+    size: int
+    max_overflow: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    timeouts: int
+    wait_total: float
+    wait_max: float
+
+
+class PoolInstrumentation(Pool, metaclass=ABCMeta):
+    """Mixin keeping checkout counters and latencies of a pool."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self._checkouts = 0
+        self._timeouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def connect(self) -> PoolProxiedConnection:
+        started_at = time.monotonic()
+
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            with self._stats_lock:
+                self._timeouts += 1
+            raise
+
+        wait = time.monotonic() - started_at
+
+        with self._stats_lock:
+            self._checkouts += 1
+            self._wait_total += wait
+            self._wait_max = max(self._wait_max, wait)
+
+        return connection
+
+    @abstractmethod
+    def _counts(self) -> dict[str, int]:
+        """Return the pool's ``size``, ``max_overflow``, ``checked_in``,
+        ``checked_out`` and ``overflow`` counts."""
+
+    def stats(self) -> PoolStats:
+        with self._stats_lock:
+            return PoolStats(
+                **self._counts(),
+                checkouts=self._checkouts,
+                timeouts=self._timeouts,
+                wait_total=self._wait_total,
+                wait_max=self._wait_max,
+            )
+
+
+class InstrumentedQueuePool(PoolInstrumentation, AsyncAdaptedQueuePool):
+    """Async queue pool that keeps checkout counters and latencies."""
+
+    def _counts(self) -> dict[str, int]:
+        return {
+            "size": self.size(),
+            "max_overflow": self._max_overflow,
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": max(self.overflow(), 0),
+        }
+
+
+class InstrumentedNullPool(PoolInstrumentation, NullPool):
+    """Non-pooling pool, opening a connection per checkout, that keeps
+    checkout counters and latencies. Meant for use behind an external
+    connection pooler."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._checked_out = 0
+
+    def connect(self) -> PoolProxiedConnection:
+        connection = super().connect()
+
+        with self._stats_lock:
+            self._checked_out += 1
+
+        return connection
+
+    def _do_return_conn(self, record: ConnectionPoolEntry) -> None:
+        with self._stats_lock:
+            self._checked_out -= 1
+
+        super()._do_return_conn(record)
+
+    def _counts(self) -> dict[str, int]:
+        return {
+            "size": 0,
+            "max_overflow": 0,
+            "checked_in": 0,
+            "checked_out": self._checked_out,
+            "overflow": 0,
+        }
+
+
+def get_pool_options(
+    pooler_mode: bool = settings.DB_POOLER_MODE,
+) -> dict[str, Any]:
+    """Return the engine's pool and driver options from the settings.
+
+    Each worker gets an even share of ``DB_MAX_CONNECTIONS``: half of it is
+    kept open in the pool (at most 20 connections) and the rest is overflow,
+    opened under load and closed when returned.
+
+    In pooler mode, for servers behind a transaction-mode pooler such as
+    PgBouncer, connections are not pooled locally, since the pooler already
+    does, and prepared statements are not cached: consecutive transactions
+    may run on different server connections. Statements are still prepared
+    by asyncpg, under unique names, so that they never clash.
+
+    Args:
+        pooler_mode: Whether to configure the engine for an external
+            transaction-mode pooler. Defaults to ``DB_POOLER_MODE``.
+    """
+    if pooler_mode:
+        return {
+            "poolclass": InstrumentedNullPool,
+            "connect_args": {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": (
+                    lambda: f"__asyncpg_{uuid.uuid4()}__"
+                ),
+            },
+        }
+
+    connections = max(settings.DB_MAX_CONNECTIONS // settings.WEB_CONCURRENCY, 1)
+    pool_size = settings.DB_POOL_SIZE or min(max(connections // 2, 1), 20)
+    max_overflow = (
+        settings.DB_MAX_OVERFLOW
+        if settings.DB_MAX_OVERFLOW is not None
+        else max(connections - pool_size, 0)
+    )
+
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
 url = get_database_url()
 
-engine = create_async_engine(url)
+engine = create_async_engine(url, **get_pool_options())
 
+# Objects keep their loaded state after commit: writes return their rows
+# through RETURNING, and reloading them would cost an extra round-trip.
 SessionManager = async_sessionmaker(
     autocommit=False,
     autoflush=False,
     bind=engine,
+    expire_on_commit=False,
     future=True,
 )
 
@@ -55,3 +257,202 @@ async def db_health_check(timeout_seconds: float = 1.0) -> bool:
         return False
 
     return True
+
+
+# Seconds the replica is behind the primary; 0 when it has replayed all the
+# WAL it received, so that an idle primary does not look like lag.
+REPLICA_LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery()
+            OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn()
+        THEN 0
+        ELSE coalesce(
+            extract(epoch FROM now() - pg_last_xact_replay_timestamp()),
+            0
+        )
+    END
+    """
+)
+
+
+@dataclass(frozen=True)
+class ReplicaStats:
+    """Point-in-time state of a read replica, as of its last health check."""
+
+    host: str
+    healthy: bool
+    lag_seconds: float | None
+    checked_at: float | None
+
+
+class ReplicaRouter:
+    """Spread read-only sessions over healthy read replicas.
+
+    Replicas are health-checked by :meth:`check_health`, which marks a
+    replica unhealthy when it is unreachable or lags by more than
+    ``max_lag_seconds``; a replica whose connection drops is marked
+    unhealthy immediately. Sessions are handed out round-robin among the
+    healthy replicas, and :meth:`get_session_manager` returns ``None`` (use
+    the primary) when there are none.
+
+    Read-your-writes: :meth:`record_write` pins a key, typically the calling
+    client, to the primary for ``sticky_seconds``. Pins are process-local.
+    """
+
+    def __init__(
+        self,
+        hosts: list[str],
+        max_lag_seconds: float,
+        sticky_seconds: float,
+    ):
+        """Initialize the router. Replicas start unhealthy until checked.
+
+        Args:
+            hosts: Replica ``host`` or ``host:port`` entries.
+            max_lag_seconds: Replication lag above which a replica is skipped.
+            sticky_seconds: How long a key is pinned to the primary after a
+                write.
+        """
+        self.hosts = hosts
+        self.max_lag_seconds = max_lag_seconds
+        self.engines: list[AsyncEngine] = [
+            create_async_engine(
+                get_database_url(host=host),
+                **get_pool_options(),
+            )
+            for host in hosts
+        ]
+        self._session_managers = [
+            async_sessionmaker(
+                autocommit=False,
+                autoflush=False,
+                bind=replica_engine,
+            )
+            for replica_engine in self.engines
+        ]
+        self._healthy = [False] * len(hosts)
+        self._lags: list[float | None] = [None] * len(hosts)
+        self._checked_at: list[float | None] = [None] * len(hosts)
+        self._round_robin = itertools.count()
+        self._recent_writers: TTLCache[Hashable, bool] = TTLCache(
+            max_size=65536,
+            ttl_seconds=sticky_seconds,
+        )
+
+        for index, replica_engine in enumerate(self.engines):
+            event.listen(
+                replica_engine.sync_engine,
+                "handle_error",
+                self._make_error_handler(index),
+            )
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.engines)
+
+    def _make_error_handler(self, index: int):
+        def handle_error(context: ExceptionContext) -> None:
+            if context.is_disconnect and self._healthy[index]:
+                logger.warning(f"Read replica {self.hosts[index]} disconnected")
+                self._healthy[index] = False
+
+        return handle_error
+
+    def record_write(self, key: Hashable) -> None:
+        """Route ``key``'s reads to the primary for a while."""
+        self._recent_writers.set(key, True)
+
+    def get_session_manager(
+        self,
+        key: Hashable | None = None,
+    ) -> async_sessionmaker | None:
+        """Return the session factory of the next healthy replica, or
+        ``None`` when reads for ``key`` must go to the primary."""
+        if key is not None and self._recent_writers.get(key):
+            return None
+
+        healthy = [
+            session_manager
+            for session_manager, is_healthy in zip(
+                self._session_managers,
+                self._healthy,
+                strict=True,
+            )
+            if is_healthy
+        ]
+
+        if not healthy:
+            return None
+
+        return healthy[next(self._round_robin) % len(healthy)]
+
+    async def check_health(self, timeout_seconds: float = 1.0) -> None:
+        """Measure every replica's lag and update its health."""
+        for index, replica_engine in enumerate(self.engines):
+            try:
+                async with replica_engine.connect() as conn:
+                    lag = await asyncio.wait_for(
+                        conn.scalar(REPLICA_LAG_QUERY),
+                        timeout=timeout_seconds,
+                    )
+            except Exception as err:  # noqa: BLE001
+                lag = None
+                logger.warning(
+                    f"Read replica {self.hosts[index]} is unreachable: {err}"
+                )
+
+            healthy = lag is not None and lag <= self.max_lag_seconds
+
+            if healthy != self._healthy[index]:
+                logger.info(
+                    f"Read replica {self.hosts[index]} is now "
+                    f"{'healthy' if healthy else 'unhealthy'} (lag: {lag})"
+                )
+
+            self._healthy[index] = healthy
+            self._lags[index] = lag
+            self._checked_at[index] = time.time()
+
+    async def monitor(self, interval_seconds: float) -> None:
+        """Run :meth:`check_health` every ``interval_seconds``, forever."""
+        while True:
+            await self.check_health()
+            await asyncio.sleep(interval_seconds)
+
+    async def dispose(self) -> None:
+        for replica_engine in self.engines:
+            await replica_engine.dispose()
+
+    def stats(self) -> list[ReplicaStats]:
+        return [
+            ReplicaStats(
+                host=host,
+                healthy=healthy,
+                lag_seconds=lag,
+                checked_at=checked_at,
+            )
+            for host, healthy, lag, checked_at in zip(
+                self.hosts,
+                self._healthy,
+                self._lags,
+                self._checked_at,
+                strict=True,
+            )
+        ]
+
+
+replica_router = ReplicaRouter(
+    settings.DB_REPLICA_HOSTS,
+    max_lag_seconds=settings.DB_REPLICA_MAX_LAG_SECONDS,
+    sticky_seconds=settings.DB_READ_YOUR_WRITES_SECONDS,
+)
+
+
+@event.listens_for(Session, "after_commit")
+def record_write(session: Session) -> None:
+    """Pin the client that committed through ``session`` to the primary, so
+    that it reads its own writes. Sessions are tagged with the client by
+    :func:`~app.core.deps.get_current_principal`."""
+    if replica_router.enabled and "principal_id" in session.info:
+        replica_router.record_write(session.info["principal_id"])
@@ -1,57 +1,306 @@
 import logging
-from dataclasses import dataclass
+import math
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Any
 
-import jwt
-from fastapi import Depends, HTTPException, Query, status
+from fastapi import Depends, HTTPException, Query, Request, Response, status
+from fastapi.exceptions import RequestValidationError
 from jwt.exceptions import ExpiredSignatureError, PyJWTError
-from pydantic import ValidationError
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from sqlalchemy import ColumnElement, UnaryExpression
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.core.database import SessionManager
-from app.core.security import oauth2_scheme
+from app.core.consts import DataFormat
+from app.core.database import SessionManager, replica_router
+from app.core.fieldsets import UnknownFieldsError, parse_fields
+from app.core.filters import (
+    InvalidQueryError,
+    ListSpec,
+    parse_filters,
+    parse_sort,
+)
+from app.core.pagination import (
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+    set_next_page_headers,
+    set_total_count_headers,
+)
+from app.core.rate_limit import create_rate_limiter
+from app.core.security import (
+    OAuth2ClientCredentialsRequestForm,
+    Principal,
+    decode_token_data,
+    oauth2_scheme,
+)
 from app.models.clients import Client
 from app.models.items import Item
+from app.schemas.items import ItemBulkUpdateBatch, ItemCreateBatch
 from app.schemas.token import TokenData
 from app.services.clients import service_client
+from app.services.crud import TotalCount
 from app.services.items import service_item
 
 EXPIRED_JWT = "Expired JWT"
 INVALID_JWT = "Invalid JWT"
+REVOKED_JWT = "Revoked JWT"
 
 logger = logging.getLogger(__name__)
 
+token_client_rate_limiter = create_rate_limiter(
+    "token-client",
+    rate=settings.TOKEN_RATE_LIMIT_CLIENT_RATE,
+    burst=settings.TOKEN_RATE_LIMIT_CLIENT_BURST,
+)
+token_address_rate_limiter = create_rate_limiter(
+    "token-address",
+    rate=settings.TOKEN_RATE_LIMIT_ADDRESS_RATE,
+    burst=settings.TOKEN_RATE_LIMIT_ADDRESS_BURST,
+)
+
 
 @dataclass
 class PaginationParams:
     page: int
     per_page: int
+    after: list[Any] | None = None
+    sort: str = "id"
+    key: tuple[str, ...] = ("id",)
 
+    def set_next_page(
+        self,
+        request: Request,
+        response: Response,
+        objects: Sequence[Any],
+    ) -> None:
+        """Link to the page following ``objects`` when it may not be the
+        last one. The cursor holds the sort ``key`` attributes of the last
+        object."""
+        if objects and len(objects) == self.per_page:
+            set_next_page_headers(
+                request,
+                response,
+                encode_cursor(
+                    self.sort,
+                    [getattr(objects[-1], name) for name in self.key],
+                ),
+            )
 
-def paginate(default_per_page: int = 50):
-    def _pagination(
-        page: int = Query(
-            1,
-            ge=1,
-            description="Page number, starting from 1",
-        ),
-        per_page: int = Query(
-            default_per_page,
-            ge=1,
-            le=50,
-            description="Number of results per page",
+
+@dataclass
+class ListParams(PaginationParams):
+    """Pagination parameters of a listing, along with its filters and
+    ordering."""
+
+    filters: list[ColumnElement[bool]] = field(default_factory=list)
+    order_by: list[UnaryExpression] | None = None
+    count: bool = False
+
+    def set_total_count(
+        self,
+        response: Response,
+        total: TotalCount | None,
+    ) -> None:
+        """Report the total number of results, when it was requested."""
+        if total is not None:
+            set_total_count_headers(response, total.value, total.exact)
+
+
+def _page_query():
+    return Query(1, ge=1, description="Page number, starting from 1")
+
+
+def _per_page_query(default_per_page: int):
+    return Query(
+        default_per_page,
+        ge=1,
+        le=50,
+        description="Number of results per page",
+    )
+
+
+def _cursor_query():
+    return Query(
+        None,
+        description=(
+            "Opaque cursor of the next page, as returned in the "
+            "``X-Next-Cursor`` and ``Link`` headers. Takes precedence "
+            "over ``page``, and costs the same at any depth."
         ),
+    )
+
+
+def _decode_after(
+    cursor: str | None,
+    sort: str,
+    key_types: Sequence[type],
+) -> list[Any] | None:
+    if cursor is None:
+        return None
+
+    try:
+        return decode_cursor(cursor, sort, key_types)
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        ) from None
+
+
+def paginate(
+    default_per_page: int = 50,
+    sort: str = "id",
+    key: Sequence[tuple[str, type]] = (("id", int),),
+):
+    """Build a pagination dependency, by offset or by cursor.
+
+    Args:
+        default_per_page: Page size when ``per_page`` is not given.
+        sort: Identifier of the ordering, embedded in cursors.
+        key: Name and type of each attribute of the sort key, which must
+            match the endpoint's ``ORDER BY`` and end with a unique column.
+    """
+    key_names = tuple(name for name, _ in key)
+    key_types = tuple(type_ for _, type_ in key)
+
+    def _pagination(
+        page: int = _page_query(),
+        per_page: int = _per_page_query(default_per_page),
+        cursor: str | None = _cursor_query(),
     ) -> PaginationParams:
-        return PaginationParams(page=page, per_page=per_page)
+        after = _decode_after(cursor, sort, key_types)
+
+        return PaginationParams(
+            page=page if after is None else 1,
+            per_page=per_page,
+            after=after,
+            sort=sort,
+            key=key_names,
+        )
 
     return _pagination
 
 
+def list_query(spec: ListSpec, default_per_page: int = 50):
+    """Build a dependency parsing the pagination, ``sort`` and ``filter``
+    query parameters of a listing allowing the filters and orderings of
+    ``spec``.
+
+    Filters and orderings outside ``spec`` are rejected with a ``400 Bad
+    Request``.
+    """
+    filters_help = "; ".join(
+        f"``{name}`` ({', '.join(sorted(filter_field.operators))})"
+        for name, filter_field in spec.filters.items()
+    )
+
+    def _list_query(
+        page: int = _page_query(),
+        per_page: int = _per_page_query(default_per_page),
+        cursor: str | None = _cursor_query(),
+        sort: str | None = Query(
+            None,
+            description=(
+                f"Sort order, among: {', '.join(spec.sorts)} (default: "
+                f"``{spec.default_sort}``). A leading ``-`` sorts in "
+                "descending order."
+            ),
+        ),
+        filter_: list[str] = Query(
+            [],
+            alias="filter",
+            description=(
+                "Filters, as ``<field>:<operator>:<value>``, e.g. "
+                "``id:gte:10``. Repeat to combine them. ``in`` takes "
+                f"comma-separated values. Allowed: {filters_help}."
+            ),
+        ),
+        count: bool = Query(
+            False,
+            description=(
+                "When true, the total number of results is returned in the "
+                "``X-Total-Count`` header. It is exact when "
+                "``X-Total-Count-Exact`` is ``true``, and otherwise a "
+                "planner estimate, for large listings."
+            ),
+        ),
+    ) -> ListParams:
+        try:
+            sort_name, sort_option = parse_sort(sort, spec)
+            filters = parse_filters(
+                filter_,
+                spec,
+                settings.FILTER_MAX_IN_VALUES,
+            )
+        except InvalidQueryError as err:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(err),
+            ) from None
+
+        after = _decode_after(
+            cursor,
+            sort_name,
+            [type_ for _, type_ in sort_option.key],
+        )
+
+        return ListParams(
+            page=page if after is None else 1,
+            per_page=per_page,
+            after=after,
+            sort=sort_name,
+            key=tuple(name for name, _ in sort_option.key),
+            filters=filters,
+            order_by=list(sort_option.order_by),
+            count=count,
+        )
+
+    return _list_query
+
+
+def sparse_fields(schema: type[BaseModel]):
+    """Build a dependency parsing the ``fields`` query parameter, a sparse
+    fieldset of ``schema``'s fields.
+
+    The dependency returns ``None`` when the parameter is absent, and
+    otherwise the fields to select, ``id`` first.
+    """
+    allowed = list(schema.model_fields)
+
+    def _sparse_fields(
+        fields: str | None = Query(
+            None,
+            description=(
+                "Comma-separated fields to include in each result, among: "
+                + ", ".join(allowed)
+                + ". ``id`` is always included. Defaults to all fields."
+            ),
+        ),
+    ) -> list[str] | None:
+        if fields is None:
+            return None
+
+        try:
+            return parse_fields(fields, allowed)
+        except UnknownFieldsError as err:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {err}",
+            ) from None
+
+    return _sparse_fields
+
+
 async def get_db_session():
     async with SessionManager() as db_session:
         yield db_session
 
 
+READ_ONLY_METHODS = frozenset(("GET", "HEAD"))
+
+
 def check_client(client: Client | None) -> Client:
     if client is None:
         raise HTTPException(
@@ -68,14 +317,36 @@ def check_client(client: Client | None) -> Client:
     return client
 
 
-def get_token_data(token: str = Depends(oauth2_scheme)) -> TokenData:
+async def check_token_rate_limit(
+    request: Request,
+    form: OAuth2ClientCredentialsRequestForm = Depends(),
+) -> None:
+    """Throttle token requests per remote address and per ``client_id``.
+
+    Runs before the credentials are verified, so throttled attempts never
+    reach the password hasher.
+    """
+    checks = []
+    if request.client is not None:
+        checks.append((token_address_rate_limiter, request.client.host))
+    if form.client_id:
+        checks.append((token_client_rate_limiter, form.client_id))
+
+    for rate_limiter, key in checks:
+        retry_after = await rate_limiter.acquire(key)
+
+        if retry_after > 0:
+            logger.warning(f"Token requests throttled for {rate_limiter.name}")
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many token requests",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+
+
+async def get_token_data(token: str = Depends(oauth2_scheme)) -> TokenData:
     try:
-        payload = jwt.decode(
-            jwt=token,
-            key=settings.JWT_SECRET,
-            algorithms=[settings.JWT_ALGORITHM],
-        )
-        token_data = TokenData(client_id=payload.get("sub"))
+        token_data = decode_token_data(token)
     except ExpiredSignatureError:
         service_client.raise_unauthorized(EXPIRED_JWT)
     except (PyJWTError, ValidationError) as e:
@@ -85,36 +356,100 @@ def get_token_data(token: str = Depends(oauth2_scheme)) -> TokenData:
     return token_data
 
 
-async def get_current_client(
+async def get_current_principal(
     token: TokenData = Depends(get_token_data),
     db_session: AsyncSession = Depends(get_db_session),
-) -> Client:
-    if token.client_id is None:
-        logger.warning("Token does not contain client_id")
+) -> Principal:
+    if (
+        token.client_id is None
+        or token.id is None
+        or token.credentials_version is None
+    ):
+        logger.warning("Token does not contain the client claims")
         service_client.raise_unauthorized(INVALID_JWT)
 
+    # Revocation check. Served from the client cache, so it only reaches the
+    # database on a miss.
     client = check_client(
-        await service_client.get(db_session, oauth_id=token.client_id)
+        await service_client.get_by_oauth_id(db_session, token.client_id)
     )
 
-    return client
+    if not service_client.is_token_current(client, token):
+        service_client.raise_unauthorized(REVOKED_JWT)
 
+    # Tags the request's primary session, so that the client's writes pin
+    # its subsequent reads to the primary (see get_read_db_session).
+    db_session.info["principal_id"] = token.id
 
-async def get_current_admin_client(
-    current_client: Client = Depends(get_current_client),
-) -> Client:
-    if not current_client.is_admin:
+    return Principal(
+        id=token.id,
+        oauth_id=token.client_id,
+        is_admin=token.is_admin,
+        credentials_version=token.credentials_version,
+    )
+
+
+async def get_read_db_session(
+    request: Request,
+    principal: Principal = Depends(get_current_principal),
+    db_session: AsyncSession = Depends(get_db_session),
+):
+    """Yield a session for read-only work.
+
+    ``GET`` and ``HEAD`` requests read from a healthy read replica, unless
+    none is configured or available, or the calling client wrote to the
+    primary within ``DB_READ_YOUR_WRITES_SECONDS``. Any other request gets
+    the primary session, so that objects it loads can be modified.
+    """
+    session_manager = (
+        replica_router.get_session_manager(principal.id)
+        if request.method in READ_ONLY_METHODS
+        else None
+    )
+
+    if session_manager is None:
+        yield db_session
+        return
+
+    async with session_manager() as replica_session:
+        yield replica_session
+
+
+async def get_count_db_session(
+    request: Request,
+    principal: Principal = Depends(get_current_principal),
+):
+    """Yield a read-only session distinct from the request's, so that the
+    total count of a listing runs concurrently with the page query.
+
+    The session is routed like :func:`get_read_db_session`, and only
+    checks out a connection when used.
+    """
+    session_manager = (
+        replica_router.get_session_manager(principal.id)
+        if request.method in READ_ONLY_METHODS
+        else None
+    ) or SessionManager
+
+    async with session_manager() as db_session:
+        yield db_session
+
+
+async def get_current_admin_principal(
+    principal: Principal = Depends(get_current_principal),
+) -> Principal:
+    if not principal.is_admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Admin privileges required",
         )
 
-    return current_client
+    return principal
 
 
 async def get_client_by_id(
     id: int,
-    db_session: AsyncSession = Depends(get_db_session),
+    db_session: AsyncSession = Depends(get_read_db_session),
 ) -> Client:
     client = check_client(await service_client.get(db_session, id=id))
     return client
@@ -122,15 +457,76 @@ async def get_client_by_id(
 
 async def get_item_by_id(
     id: int,
-    client: Client = Depends(get_current_client),
-    db_session: AsyncSession = Depends(get_db_session),
+    principal: Principal = Depends(get_current_principal),
+    db_session: AsyncSession = Depends(get_read_db_session),
 ) -> Item:
-    item = await service_item.get(db_session, id=id, owner_id=client.id)
+    item = await service_item.get(db_session, id=id, owner_id=principal.id)
 
     if item is None:
+        service_item.raise_not_found()
+
+    return item
+
+
+def validated_body[T](adapter: TypeAdapter[T]):
+    """Build a dependency parsing and validating the JSON body in a single
+    pass.
+
+    The body is validated by pydantic-core directly from its bytes, without
+    building the intermediate Python objects FastAPI would, which matters
+    for bulk payloads of thousands of entries.
+
+    The caller is authenticated first, so that anonymous requests are
+    rejected before their body is read.
+
+    Args:
+        adapter: The adapter of the expected body type.
+    """
+
+    async def _validated_body(
+        request: Request,
+        _principal: Principal = Depends(get_current_principal),
+    ) -> T:
+        try:
+            return adapter.validate_json(await request.body())
+        except ValidationError as err:
+            raise RequestValidationError(
+                [
+                    {**error, "loc": ("body", *error["loc"])}
+                    for error in err.errors(include_url=False)
+                ]
+            ) from None
+
+    return _validated_body
+
+
+get_item_create_batch = validated_body(ItemCreateBatch)
+get_item_bulk_update_batch = validated_body(ItemBulkUpdateBatch)
+
+
+IMPORT_MEDIA_TYPES = {
+    "application/x-ndjson": DataFormat.NDJSON,
+    "application/jsonl": DataFormat.NDJSON,
+    "text/csv": DataFormat.CSV,
+}
+
+
+def get_import_format(request: Request) -> DataFormat:
+    """Resolve the format of a streamed import from its ``Content-Type``.
+
+    Raises:
+        HTTPException: ``415 Unsupported Media Type`` if the content type is
+            not one of ``IMPORT_MEDIA_TYPES``.
+    """
+    media_type = request.headers.get("Content-Type", "").partition(";")[0]
+    import_format = IMPORT_MEDIA_TYPES.get(media_type.strip().lower())
+
+    if import_format is None:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Item not found",
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=(
+                "Content-Type must be one of: " + ", ".join(IMPORT_MEDIA_TYPES)
+            ),
         )
 
-    return item
+    return import_format
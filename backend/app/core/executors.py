@@ -0,0 +1,185 @@
+import asyncio
+import concurrent.futures
+import os
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from app.core.consts import ExecutorKind
+
+
+class ExecutorSaturatedError(RuntimeError):
+    """Raised when a :class:`BoundedExecutor` has no room for more work."""
+
+
+@dataclass(frozen=True)
+class ExecutorStats:
+    """Point-in-time snapshot of a :class:`BoundedExecutor`'s counters.
+
+    ``pending`` is the current queue depth: tasks submitted to the pool that
+    have not finished yet, whether waiting for a worker or running.
+    Latencies are in seconds. ``queue_wait`` is the time a task spent
+    waiting for a free worker; ``run_time`` is the time spent executing it.
+    """
+
+    kind: str
+    max_workers: int
+    max_pending: int
+    pending: int
+    completed: int
+    failed: int
+    rejected: int
+    queue_wait_total: float
+    queue_wait_max: float
+    run_time_total: float
+    run_time_max: float
+
+
+def _timed_call[R](
+    fn: Callable[..., R],
+    *args: Any,
+) -> tuple[float, float, R]:
+    """Run ``fn`` and report when it started and finished.
+
+    Module-level so that it can be pickled into process and interpreter
+    pools. ``time.monotonic`` is system-wide, so timestamps taken in a worker
+    process are comparable with the ones taken on the event loop.
+    """
+    started_at = time.monotonic()
+    result = fn(*args)
+    return started_at, time.monotonic(), result
+
+
+class BoundedExecutor:
+    """Run blocking callables off the event loop with admission control.
+
+    Wraps a thread, process or interpreter pool. At most ``max_pending``
+    tasks may be queued or running at once; further submissions fail fast
+    with :class:`ExecutorSaturatedError` instead of growing an unbounded
+    backlog behind the pool.
+
+    The underlying pool is created lazily on first use, so importing this
+    module has no side effects, and is recreated after :meth:`shutdown`.
+    """
+
+    def __init__(
+        self,
+        kind: ExecutorKind,
+        max_workers: int | None = None,
+        max_pending: int = 64,
+    ):
+        """Initialize the executor.
+
+        Args:
+            kind: The type of pool backing the executor.
+            max_workers: Pool size. Defaults to ``min(4, os.cpu_count())``.
+            max_pending: Maximum number of queued plus running tasks.
+        """
+        self.kind = kind
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.max_pending = max(max_pending, self.max_workers)
+        self._executor: concurrent.futures.Executor | None = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._queue_wait_total = 0.0
+        self._queue_wait_max = 0.0
+        self._run_time_total = 0.0
+        self._run_time_max = 0.0
+
+    def _create_executor(self) -> concurrent.futures.Executor:
+        match self.kind:
+            case ExecutorKind.PROCESS:
+                return concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                )
+            case ExecutorKind.INTERPRETER:
+                # Python 3.14+. Every extension module used by the submitted
+                # callables must support subinterpreters.
+                return concurrent.futures.InterpreterPoolExecutor(
+                    max_workers=self.max_workers,
+                )
+            case _:
+                return concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="bounded-executor",
+                )
+
+    def _get_executor(self) -> concurrent.futures.Executor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = self._create_executor()
+            return self._executor
+
+    async def run[R](self, fn: Callable[..., R], *args: Any) -> R:
+        """Run ``fn(*args)`` in the pool and await its result.
+
+        Raises:
+            ExecutorSaturatedError: When ``max_pending`` tasks are already
+                pending.
+        """
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                raise ExecutorSaturatedError(
+                    f"{self.max_pending} tasks already pending"
+                )
+            self._pending += 1
+
+        submitted_at = time.monotonic()
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(
+            self._get_executor(),
+            _timed_call,
+            fn,
+            *args,
+        )
+
+        try:
+            started_at, finished_at, result = await future
+        except BaseException:
+            with self._lock:
+                self._pending -= 1
+                self._failed += 1
+            raise
+
+        queue_wait = max(started_at - submitted_at, 0.0)
+        run_time = finished_at - started_at
+
+        with self._lock:
+            self._pending -= 1
+            self._completed += 1
+            self._queue_wait_total += queue_wait
+            self._queue_wait_max = max(self._queue_wait_max, queue_wait)
+            self._run_time_total += run_time
+            self._run_time_max = max(self._run_time_max, run_time)
+
+        return result
+
+    def shutdown(self) -> None:
+        """Shut down the underlying pool, waiting for running tasks."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def stats(self) -> ExecutorStats:
+        with self._lock:
+            return ExecutorStats(
+                kind=self.kind,
+                max_workers=self.max_workers,
+                max_pending=self.max_pending,
+                pending=self._pending,
+                completed=self._completed,
+                failed=self._failed,
+                rejected=self._rejected,
+                queue_wait_total=self._queue_wait_total,
+                queue_wait_max=self._queue_wait_max,
+                run_time_total=self._run_time_total,
+                run_time_max=self._run_time_max,
+            )
@@ -0,0 +1,112 @@
+import csv
+import io
+import json
+from collections.abc import AsyncIterable, AsyncIterator, Sequence
+from datetime import datetime
+from typing import Any
+
+from fastapi.responses import StreamingResponse
+
+from app.core.consts import DataFormat
+
+EXPORT_MEDIA_TYPES = {
+    DataFormat.NDJSON: "application/x-ndjson",
+    DataFormat.CSV: "text/csv",
+}
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _encode_ndjson(
+    columns: Sequence[str],
+    rows: Sequence[Sequence[Any]],
+) -> bytes:
+    return "".join(
+        json.dumps(
+            dict(zip(columns, row, strict=True)),
+            default=_json_default,
+            separators=(",", ":"),
+        )
+        + "\n"
+        for row in rows
+    ).encode()
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _encode_csv(rows: Sequence[Sequence[Any]]) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(
+        [_csv_value(value) for value in row] for row in rows
+    )
+    return buffer.getvalue().encode()
+
+
+async def encode_rows(
+    rows: AsyncIterable[Sequence[Any]],
+    columns: Sequence[str],
+    data_format: DataFormat,
+    batch_size: int,
+) -> AsyncIterator[bytes]:
+    """Encode a stream of rows as NDJSON objects or CSV records.
+
+    Rows are encoded by batches of ``batch_size``, each yielded as one
+    chunk, so that memory stays bounded whatever the number of rows. CSV
+    output starts with a header line of the column names.
+
+    Args:
+        rows: Column values, in the order of ``columns``.
+        columns: Names of the columns, used as NDJSON keys and CSV header.
+        data_format: Output format.
+        batch_size: Number of rows per chunk.
+    """
+    if data_format == DataFormat.CSV:
+        yield _encode_csv([columns])
+
+    batch: list[Sequence[Any]] = []
+
+    async for row in rows:
+        batch.append(row)
+
+        if len(batch) >= batch_size:
+            yield _encode_batch(columns, batch, data_format)
+            batch.clear()
+
+    if batch:
+        yield _encode_batch(columns, batch, data_format)
+
+
+def _encode_batch(
+    columns: Sequence[str],
+    rows: Sequence[Sequence[Any]],
+    data_format: DataFormat,
+) -> bytes:
+    if data_format == DataFormat.CSV:
+        return _encode_csv(rows)
+    return _encode_ndjson(columns, rows)
+
+
+def export_response(
+    chunks: AsyncIterable[bytes],
+    data_format: DataFormat,
+    filename: str,
+) -> StreamingResponse:
+    """Stream an export as a file download named ``filename``, with the
+    extension of ``data_format``."""
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_MEDIA_TYPES[data_format],
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="{filename}.{data_format}"'
+            ),
+        },
+    )
@@ -0,0 +1,48 @@
+from collections.abc import Collection, Sequence
+
+from fastapi import Response
+from pydantic_core import to_json
+from sqlalchemy import Row
+
+
+class UnknownFieldsError(ValueError):
+    """Raised when a sparse fieldset names fields that do not exist."""
+
+
+def parse_fields(
+    value: str,
+    allowed: Collection[str],
+    required: Sequence[str] = ("id",),
+) -> list[str]:
+    """Parse a comma-separated sparse fieldset, e.g. ``title,description``.
+
+    Args:
+        value: The requested fields.
+        allowed: Names of the fields that can be requested.
+        required: Fields always included, first, whether requested or not.
+
+    Returns:
+        The fields to select, without duplicates.
+
+    Raises:
+        UnknownFieldsError: If a requested field is not in ``allowed``.
+    """
+    requested = [field.strip() for field in value.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in allowed]
+
+    if unknown:
+        raise UnknownFieldsError(", ".join(unknown))
+
+    return list(dict.fromkeys([*required, *requested]))
+
+
+def rows_response(rows: Sequence[Row]) -> Response:
+    """Serialize projected rows straight to a JSON array of objects.
+
+    Returning the response skips response model validation, which would
+    reject partial objects anyway.
+    """
+    return Response(
+        to_json([row._asdict() for row in rows]),
+        media_type="application/json",
+    )
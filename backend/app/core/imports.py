@@ -0,0 +1,129 @@
+import csv
+from collections.abc import AsyncIterable, AsyncIterator
+from dataclasses import dataclass
+from typing import Any
+
+from pydantic import BaseModel, ValidationError
+
+from app.core.consts import DataFormat
+
+
+class ImportLineError(ValueError):
+    """Raised when a line of an import cannot be parsed."""
+
+
+@dataclass(frozen=True)
+class ImportRow[T: BaseModel]:
+    """A line of an import, and either its validated row or its errors."""
+
+    line: int
+    row: T | None = None
+    errors: tuple[str, ...] = ()
+
+
+async def iter_lines(
+    chunks: AsyncIterable[bytes],
+    max_line_bytes: int,
+) -> AsyncIterator[tuple[int, bytes | None]]:
+    """Split a stream of byte chunks into lines.
+
+    Only the current line is buffered, so memory stays bounded by
+    ``max_line_bytes`` plus the chunk size whatever the stream length.
+
+    Yields:
+        ``(line_number, line)`` pairs, 1-based, for non-blank lines. Lines
+        longer than ``max_line_bytes`` are yielded as ``None`` and skipped.
+    """
+    buffer = b""
+    line_number = 0
+    too_long = False
+
+    async for chunk in chunks:
+        lines = (buffer + chunk).split(b"\n")
+        buffer = lines.pop()
+
+        for line in lines:
+            line_number += 1
+
+            if too_long or len(line) > max_line_bytes:
+                too_long = False
+                yield line_number, None
+            elif line.strip():
+                yield line_number, line
+
+        if len(buffer) > max_line_bytes:
+            # Drop the rest of the line as it arrives.
+            too_long = True
+            buffer = b""
+
+    if too_long or buffer.strip():
+        yield line_number + 1, None if too_long else buffer
+
+
+def format_errors(err: ValidationError) -> tuple[str, ...]:
+    return tuple(
+        ".".join(str(part) for part in error["loc"]) + f": {error['msg']}"
+        if error["loc"]
+        else error["msg"]
+        for error in err.errors(include_url=False)
+    )
+
+
+async def parse_rows[T: BaseModel](
+    chunks: AsyncIterable[bytes],
+    import_format: DataFormat,
+    schema: type[T],
+    max_line_bytes: int,
+) -> AsyncIterator[ImportRow[T]]:
+    """Parse and validate a stream of NDJSON or CSV rows with ``schema``.
+
+    NDJSON lines hold one JSON object each. CSV input starts with a header
+    line naming the columns, and holds one record per line: quoted values
+    cannot contain line breaks.
+
+    Yields:
+        An :class:`ImportRow` for every non-blank line, header excluded.
+    """
+    header: list[str] | None = None
+
+    async for line_number, line in iter_lines(chunks, max_line_bytes):
+        if line is None:
+            yield ImportRow(
+                line_number,
+                errors=(f"Line longer than {max_line_bytes} bytes",),
+            )
+            continue
+
+        try:
+            if import_format == DataFormat.NDJSON:
+                row = schema.model_validate_json(line)
+            else:
+                values = parse_csv_line(line)
+
+                if header is None:
+                    header = values
+                    continue
+
+                row = schema.model_validate(csv_record(header, values))
+        except ValidationError as err:
+            yield ImportRow(line_number, errors=format_errors(err))
+        except ImportLineError as err:
+            yield ImportRow(line_number, errors=(str(err),))
+        else:
+            yield ImportRow(line_number, row=row)
+
+
+def parse_csv_line(line: bytes) -> list[str]:
+    try:
+        return next(csv.reader([line.decode().rstrip("\r")], strict=True))
+    except (UnicodeDecodeError, csv.Error) as err:
+        raise ImportLineError(f"Malformed CSV line: {err}") from None
+
+
+def csv_record(header: list[str], values: list[str]) -> dict[str, Any]:
+    if len(values) != len(header):
+        raise ImportLineError(
+            f"Expected {len(header)} values, found {len(values)}"
+        )
+
+    return dict(zip(header, values, strict=True))
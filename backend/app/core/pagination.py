@@ -0,0 +1,111 @@
+import asyncio
+import base64
+import binascii
+import json
+from collections.abc import Awaitable, Sequence
+from typing import Any
+
+from fastapi import Request, Response
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(sort: str, values: Sequence[Any]) -> str:
+    """Encode a keyset pagination position as an opaque, URL-safe token.
+
+    Args:
+        sort: Identifier of the ordering the position belongs to, so that a
+            cursor is never applied to a different ordering.
+        values: Sort key of the last row returned.
+    """
+    payload = json.dumps({"s": sort, "v": list(values)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).rstrip(b"=").decode()
+
+
+def decode_cursor(
+    cursor: str,
+    sort: str,
+    types: Sequence[type] = (int,),
+) -> list[Any]:
+    """Decode a token created by :func:`encode_cursor`.
+
+    Args:
+        cursor: The token.
+        sort: Identifier of the ordering being paginated.
+        types: Expected type of each sort key value.
+
+    Returns:
+        The sort key of the last row of the previous page.
+
+    Raises:
+        InvalidCursorError: If the token is malformed or was issued for
+            another ordering.
+    """
+    try:
+        payload = json.loads(
+            base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        )
+    except (binascii.Error, UnicodeDecodeError, ValueError) as err:
+        raise InvalidCursorError("Malformed cursor") from err
+
+    if (
+        not isinstance(payload, dict)
+        or payload.get("s") != sort
+        or not isinstance(payload.get("v"), list)
+    ):
+        raise InvalidCursorError("Cursor does not match this listing")
+
+    values = payload["v"]
+
+    if len(values) != len(types) or not all(
+        isinstance(value, type_) and not isinstance(value, bool)
+        for value, type_ in zip(values, types, strict=False)
+    ):
+        raise InvalidCursorError("Malformed cursor position")
+
+    return values
+
+
+def set_next_page_headers(
+    request: Request,
+    response: Response,
+    cursor: str,
+) -> None:
+    """Advertise the next page with ``Link: <...>; rel="next"`` (RFC 8288)
+    and ``X-Next-Cursor`` headers."""
+    url = request.url.remove_query_params("page").include_query_params(
+        cursor=cursor
+    )
+    response.headers["Link"] = f'<{url}>; rel="next"'
+    response.headers["X-Next-Cursor"] = cursor
+
+
+def set_total_count_headers(response: Response, count: int, exact: bool) -> None:
+    """Report the total number of results with ``X-Total-Count``, and
+    whether it is exact or estimated with ``X-Total-Count-Exact``."""
+    response.headers["X-Total-Count"] = str(count)
+    response.headers["X-Total-Count-Exact"] = "true" if exact else "false"
+
+
+async def fetch_page[T, C](
+    page: Awaitable[T],
+    count: Awaitable[C] | None,
+    concurrently: bool,
+) -> tuple[T, C | None]:
+    """Await the page of a listing and, when requested, its total count.
+
+    Args:
+        page: Fetches the page.
+        count: Counts the results, or ``None``.
+        concurrently: Run both at once, which requires them to use distinct
+            sessions, so that the count adds no latency.
+    """
+    if count is None:
+        return await page, None
+
+    if concurrently:
+        return await asyncio.gather(page, count)
+
+    return await page, await count
@@ -0,0 +1,274 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from sqlalchemy import delete, func, literal, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.core.consts import RateLimitBackend
+from app.core.database import engine
+from app.models.rate_limits import RateLimitBucket
+
+
+@dataclass(frozen=True)
+class RateLimiterStats:
+    """Point-in-time snapshot of a :class:`RateLimiter`'s counters.
+
+    ``keys`` is the number of buckets held in memory, or ``None`` when the
+    buckets live in a shared backend.
+    """
+
+    backend: str
+    rate: float
+    burst: int
+    keys: int | None
+    allowed: int
+    rejected: int
+
+
+class RateLimiter(ABC):
+    """Token-bucket rate limiter.
+
+    Every key owns a bucket holding up to ``burst`` tokens, refilled at
+    ``rate`` tokens per second. Each request takes one token; requests
+    finding the bucket empty are rejected until it refills.
+    """
+
+    backend: RateLimitBackend
+
+    def __init__(self, name: str, rate: float, burst: int):
+        """Initialize the limiter.
+
+        Args:
+            name: Namespace of the keys, so that several limiters can share
+                a backend.
+            rate: Refill rate, in tokens per second. A non-positive value
+                disables the limiter.
+            burst: Bucket capacity, i.e. the number of requests allowed in
+                a row after a quiet period.
+        """
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self._counter_lock = threading.Lock()
+        self._allowed = 0
+        self._rejected = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0 and self.burst > 0
+
+    async def acquire(self, key: str) -> float:
+        """Take a token from ``key``'s bucket.
+
+        Returns:
+            ``0`` when the request is allowed, otherwise the number of
+            seconds until a token becomes available.
+        """
+        if not self.enabled:
+            return 0.0
+
+        retry_after = await self._acquire(f"{self.name}:{key}")
+
+        with self._counter_lock:
+            if retry_after > 0:
+                self._rejected += 1
+            else:
+                self._allowed += 1
+
+        return retry_after
+
+    @abstractmethod
+    async def _acquire(self, key: str) -> float: ...
+
+    @abstractmethod
+    async def reset(self) -> None:
+        """Refill every bucket of this limiter."""
+
+    def _keys(self) -> int | None:
+        return None
+
+    def stats(self) -> RateLimiterStats:
+        with self._counter_lock:
+            return RateLimiterStats(
+                backend=self.backend,
+                rate=self.rate,
+                burst=self.burst,
+                keys=self._keys(),
+                allowed=self._allowed,
+                rejected=self._rejected,
+            )
+
+
+class MemoryRateLimiter(RateLimiter):
+    """Rate limiter keeping its buckets in process memory.
+
+    Buckets are spread over ``shards`` independently locked maps, so that
+    concurrent requests for different keys rarely contend. Each shard keeps
+    at most ``max_keys / shards`` buckets and drops the least recently used
+    one when full; a dropped bucket simply starts over full.
+
+    Limits are per process: with ``N`` workers a key may be granted up to
+    ``N`` times its limit. Use :class:`DatabaseRateLimiter` for limits
+    shared by every worker.
+    """
+
+    backend = RateLimitBackend.MEMORY
+
+    def __init__(
+        self,
+        name: str,
+        rate: float,
+        burst: int,
+        shards: int = 16,
+        max_keys: int = 65536,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        super().__init__(name, rate, burst)
+        self._clock = clock
+        self._max_keys_per_shard = max(max_keys // shards, 1)
+        self._shards: list[tuple[threading.Lock, OrderedDict]] = [
+            (threading.Lock(), OrderedDict()) for _ in range(shards)
+        ]
+
+    async def _acquire(self, key: str) -> float:
+        lock, buckets = self._shards[hash(key) % len(self._shards)]
+        now = self._clock()
+
+        with lock:
+            tokens, updated_at = buckets.get(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated_at) * self.rate)
+
+            if tokens >= 1:
+                buckets[key] = (tokens - 1, now)
+                retry_after = 0.0
+            else:
+                buckets[key] = (tokens, now)
+                retry_after = (1 - tokens) / self.rate
+
+            buckets.move_to_end(key)
+
+            while len(buckets) > self._max_keys_per_shard:
+                buckets.popitem(last=False)
+
+        return retry_after
+
+    def _keys(self) -> int:
+        return sum(len(buckets) for _, buckets in self._shards)
+
+    async def reset(self) -> None:
+        for lock, buckets in self._shards:
+            with lock:
+                buckets.clear()
+
+
+class DatabaseRateLimiter(RateLimiter):
+    """Rate limiter keeping its buckets in the ``rate_limit_buckets`` table,
+    so that limits are enforced across every worker and replica.
+
+    A request costs a single upsert on its own short-lived connection,
+    independent of the request's transaction. Rejections cost a second read
+    to compute the retry delay. Every ``prune_interval`` seconds, a request
+    also deletes the buckets that have refilled completely.
+    """
+
+    backend = RateLimitBackend.DATABASE
+
+    def __init__(
+        self,
+        name: str,
+        rate: float,
+        burst: int,
+        engine: AsyncEngine,
+        prune_interval: float = 300.0,
+    ):
+        super().__init__(name, rate, burst)
+        self._engine = engine
+        self._prune_interval = prune_interval
+        self._pruned_at = time.monotonic()
+
+    def _refilled_tokens(self):
+        """SQL expression of the bucket's tokens, refilled up to now."""
+        elapsed = func.extract(
+            "epoch",
+            func.now() - RateLimitBucket.updated_at,
+        )
+        return func.least(
+            literal(float(self.burst)),
+            RateLimitBucket.tokens + elapsed * self.rate,
+        )
+
+    async def _acquire(self, key: str) -> float:
+        refilled = self._refilled_tokens()
+        # The conditional upsert only touches the row, and returns it, when
+        # a token is available.
+        stmt = (
+            insert(RateLimitBucket)
+            .values(key=key, tokens=self.burst - 1, updated_at=func.now())
+            .on_conflict_do_update(
+                index_elements=[RateLimitBucket.key],
+                set_={"tokens": refilled - 1, "updated_at": func.now()},
+                where=refilled >= 1,
+            )
+            .returning(RateLimitBucket.tokens)
+        )
+
+        async with self._engine.connect() as conn:
+            if (await conn.execute(stmt)).first() is not None:
+                retry_after = 0.0
+            else:
+                tokens = await conn.scalar(
+                    select(refilled).where(RateLimitBucket.key == key)
+                )
+                retry_after = (1 - (tokens or 0.0)) / self.rate
+
+            if time.monotonic() - self._pruned_at >= self._prune_interval:
+                self._pruned_at = time.monotonic()
+                await conn.execute(self._prune_statement())
+
+            await conn.commit()
+
+        return retry_after
+
+    async def reset(self) -> None:
+        """Delete every bucket of this limiter: missing buckets are full."""
+        async with self._engine.begin() as conn:
+            await conn.execute(
+                delete(RateLimitBucket).where(
+                    RateLimitBucket.key.startswith(f"{self.name}:")
+                )
+            )
+
+    def _prune_statement(self):
+        """Delete this limiter's buckets that have refilled completely,
+        which behave exactly like missing ones."""
+        return delete(RateLimitBucket).where(
+            RateLimitBucket.key.startswith(f"{self.name}:"),
+            self._refilled_tokens() >= self.burst,
+        )
+
+
+def create_rate_limiter(name: str, rate: float, burst: int) -> RateLimiter:
+    """Create a rate limiter on the configured ``RATE_LIMIT_BACKEND``.
+
+    Args:
+        name: Namespace of the limiter's keys.
+        rate: Refill rate, in tokens per second.
+        burst: Bucket capacity.
+    """
+    match settings.RATE_LIMIT_BACKEND:
+        case RateLimitBackend.DATABASE:
+            return DatabaseRateLimiter(name, rate, burst, engine=engine)
+        case _:
+            return MemoryRateLimiter(
+                name,
+                rate,
+                burst,
+                shards=settings.RATE_LIMIT_MEMORY_SHARDS,
+                max_keys=settings.RATE_LIMIT_MEMORY_MAX_KEYS,
+            )
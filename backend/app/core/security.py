@@ -1,17 +1,28 @@
+import hashlib
+import hmac
+import json
 import secrets
+import time
+from collections.abc import Callable
 from copy import deepcopy
 from datetime import timedelta
+from typing import Any
 
 import jwt
-from fastapi import Form, HTTPException, Request
+from argon2 import extract_parameters
+from fastapi import Form, HTTPException, Request, status
 from fastapi.openapi.models import OAuthFlowClientCredentials, OAuthFlows
 from fastapi.security import OAuth2
 from fastapi.security.utils import get_authorization_scheme_param
 from pwdlib import PasswordHash
+from pwdlib.hashers.argon2 import Argon2Hasher
 from starlette.status import HTTP_401_UNAUTHORIZED
 
 from app.core import utils
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.core.executors import BoundedExecutor, ExecutorSaturatedError
+from app.schemas.token import TokenData
 
 
 class Oauth2ClientCredentials(OAuth2):
@@ -67,29 +78,299 @@ class OAuth2ClientCredentialsRequestForm:
         self.client_secret = client_secret
 
 
+class Principal:
+    """Authenticated caller, built from verified JWT claims alone.
+
+    Lighter than a :class:`~app.models.clients.Client` row: dependencies that
+    only need the caller's identity or admin flag can use it without loading
+    the client from the database.
+    """
+
+    __slots__ = ("credentials_version", "id", "is_admin", "oauth_id")
+
+    def __init__(
+        self,
+        id: int,
+        oauth_id: str,
+        is_admin: bool,
+        credentials_version: int,
+    ):
+        self.id = id
+        self.oauth_id = oauth_id
+        self.is_admin = is_admin
+        self.credentials_version = credentials_version
+
+    def __repr__(self) -> str:
+        return (
+            f"Principal(id={self.id!r}, oauth_id={self.oauth_id!r}, "
+            f"is_admin={self.is_admin!r})"
+        )
+
+
 oauth2_scheme = Oauth2ClientCredentials(tokenUrl="/api/auth/token")
 
-password_hash = PasswordHash.recommended()
+
+def build_password_hash(parameters: dict[str, int]) -> PasswordHash:
+    return PasswordHash((Argon2Hasher(**parameters),))
+
+
+# One hasher per profile. Hashes record their own parameters, so any of them
+# verifies any Argon2 hash; the profile only decides how hashes are created.
+password_hashes = {
+    profile: build_password_hash(parameters)
+    for profile, parameters in settings.PASSWORD_HASH_PROFILES.items()
+}
+password_hash = password_hashes[settings.PASSWORD_HASH_DEFAULT_PROFILE]
+
+# One dummy hash per profile, to verify against when the submitted client_id
+# does not exist. The cheapest one is used: rejecting an unknown id takes as
+# long as rejecting a known id on that profile, and is never the slowest
+# case, which would single out unknown ids.
+dummy_password_hashes = {
+    profile: hasher.hash(secrets.token_urlsafe(32))
+    for profile, hasher in password_hashes.items()
+}
+
+
+def password_hash_cost(hashed_password: str) -> int:
+    """Return the relative work of verifying an Argon2 hash, its time cost
+    times its memory cost."""
+    parameters = extract_parameters(hashed_password)
+    return parameters.time_cost * parameters.memory_cost
+
+
+DUMMY_PASSWORD_HASH_PROFILE = min(
+    dummy_password_hashes,
+    key=lambda profile: password_hash_cost(dummy_password_hashes[profile]),
+)
+dummy_password_hash = dummy_password_hashes[DUMMY_PASSWORD_HASH_PROFILE]
+
+
+password_hash_executor = BoundedExecutor(
+    kind=settings.PASSWORD_HASH_EXECUTOR,
+    max_workers=settings.PASSWORD_HASH_MAX_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return password_hash.verify(plain_password, hashed_password)
 
 
-def get_password_hash(password: str) -> str:
-    return password_hash.hash(password)
+def get_password_hash(
+    password: str,
+    profile: str = settings.PASSWORD_HASH_DEFAULT_PROFILE,
+) -> str:
+    return password_hashes[profile].hash(password)
+
+
+def verify_and_update_password(
+    plain_password: str,
+    hashed_password: str,
+    profile: str = settings.PASSWORD_HASH_DEFAULT_PROFILE,
+) -> tuple[bool, str | None]:
+    """Verify a password and rehash it when its hash does not match the
+    parameters of ``profile``. Unknown profiles, e.g. ones removed from the
+    settings, fall back to the default profile.
+
+    Returns:
+        Whether the password matches, and the new hash to store, if any.
+    """
+    return password_hashes.get(profile, password_hash).verify_and_update(
+        plain_password,
+        hashed_password,
+    )
+
+
+async def run_password_hash_task[R](fn: Callable[..., R], *args: Any) -> R:
+    """Run a blocking Argon2 operation on ``password_hash_executor``.
+
+    Raises:
+        HTTPException: ``503 Service Unavailable`` when the executor already
+            has ``PASSWORD_HASH_MAX_PENDING`` operations in flight.
+    """
+    try:
+        return await password_hash_executor.run(fn, *args)
+    except ExecutorSaturatedError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many concurrent authentication requests",
+            headers={"Retry-After": "1"},
+        ) from None
+
+
+async def verify_password_async(
+    plain_password: str,
+    hashed_password: str,
+) -> bool:
+    return await run_password_hash_task(
+        verify_password,
+        plain_password,
+        hashed_password,
+    )
+
+
+async def verify_and_update_password_async(
+    plain_password: str,
+    hashed_password: str,
+    profile: str = settings.PASSWORD_HASH_DEFAULT_PROFILE,
+) -> tuple[bool, str | None]:
+    return await run_password_hash_task(
+        verify_and_update_password,
+        plain_password,
+        hashed_password,
+        profile,
+    )
+
+
+async def get_password_hash_async(
+    password: str,
+    profile: str = settings.PASSWORD_HASH_DEFAULT_PROFILE,
+) -> str:
+    return await run_password_hash_task(get_password_hash, password, profile)
+
+
+# Process-local key: digests are only ever compared within this worker.
+_verified_secret_key = secrets.token_bytes(32)
+
+
+def verified_secret_digest(client_id: str, client_secret: str) -> bytes:
+    """Return a keyed digest identifying a ``client_id``/``client_secret``
+    pair, suitable as a cache key for credentials that already passed hash
+    verification. Plaintext secrets are never used as keys themselves."""
+    message = f"{client_id}\0{client_secret}".encode()
+    return hmac.digest(_verified_secret_key, message, hashlib.sha256)
 
 
 def generate_oauth_client_credentials() -> tuple[str, str]:
     return (secrets.token_urlsafe(16), secrets.token_urlsafe(32))
 
 
-def new_client_credentials() -> tuple[str, str, str]:
+async def new_client_credentials(
+    profile: str = settings.PASSWORD_HASH_DEFAULT_PROFILE,
+) -> tuple[str, str, str]:
     client_id, client_secret = generate_oauth_client_credentials()
-    client_secret_hash = get_password_hash(client_secret)
+    client_secret_hash = await get_password_hash_async(client_secret, profile)
     return client_id, client_secret, client_secret_hash
 
 
+class JWTKeySet:
+    """Keys used to sign and verify access tokens.
+
+    With an ``HS*`` algorithm tokens are signed with the shared
+    ``JWT_SECRET``. With an asymmetric algorithm (``RS*``, ``PS*``, ``ES*``
+    or ``EdDSA``) tokens are signed with one of ``JWT_PRIVATE_KEYS`` and
+    carry its key id in the ``kid`` header. The public halves of all keys
+    are published as a JWKS so that other services can verify tokens
+    locally.
+
+    Rotating keys:
+        1. Add the new key to ``JWT_PRIVATE_KEYS``; it is published but not
+           used yet.
+        2. Once verifiers have refreshed their JWKS, point
+           ``JWT_SIGNING_KEY_ID`` at it.
+        3. After ``ACCESS_TOKEN_EXPIRE_MINUTES``, remove the old key.
+    """
+
+    def __init__(
+        self,
+        algorithm: str,
+        secret: str | None,
+        private_keys: dict[str, str],
+        signing_key_id: str | None = None,
+    ):
+        self.algorithm = algorithm
+        self.is_asymmetric = not algorithm.startswith("HS")
+        self._secret = secret
+        self._private_keys: dict[str, Any] = {}
+        self._public_keys: dict[str, Any] = {}
+        self.signing_key_id: str | None = None
+
+        if not self.is_asymmetric:
+            if not secret:
+                raise ValueError(f"JWT_SECRET is required for {algorithm}")
+            self._set_jwks([])
+            return
+
+        if not private_keys:
+            raise ValueError(f"JWT_PRIVATE_KEYS is required for {algorithm}")
+
+        jwk_algorithm = jwt.get_algorithm_by_name(algorithm)
+
+        for kid, pem in private_keys.items():
+            private_key = jwk_algorithm.prepare_key(pem)
+            self._private_keys[kid] = private_key
+            self._public_keys[kid] = private_key.public_key()
+
+        self.signing_key_id = signing_key_id or next(reversed(private_keys))
+
+        if self.signing_key_id not in self._private_keys:
+            raise ValueError(
+                f"JWT_SIGNING_KEY_ID {self.signing_key_id!r} is not one of "
+                "JWT_PRIVATE_KEYS"
+            )
+
+        self._set_jwks(
+            [
+                {
+                    **jwk_algorithm.to_jwk(public_key, as_dict=True),
+                    "kid": kid,
+                    "use": "sig",
+                    "alg": algorithm,
+                }
+                for kid, public_key in self._public_keys.items()
+            ]
+        )
+
+    def _set_jwks(self, keys: list[dict[str, Any]]) -> None:
+        # Serialised once: the JWKS only changes with the configuration.
+        self.jwks = {"keys": keys}
+        self.jwks_body = json.dumps(self.jwks, separators=(",", ":")).encode()
+        self.jwks_etag = f'"{hashlib.sha256(self.jwks_body).hexdigest()[:32]}"'
+
+    def sign(self, payload: dict[str, Any]) -> str:
+        if not self.is_asymmetric:
+            return jwt.encode(payload, self._secret, algorithm=self.algorithm)
+
+        return jwt.encode(
+            payload,
+            self._private_keys[self.signing_key_id],
+            algorithm=self.algorithm,
+            headers={"kid": self.signing_key_id},
+        )
+
+    def decode(self, token: str) -> dict[str, Any]:
+        """Verify ``token`` and return its claims.
+
+        Raises:
+            jwt.exceptions.PyJWTError: When the token is malformed, expired,
+                signed with an unknown key or its signature does not match.
+        """
+        key = self._secret
+
+        if self.is_asymmetric:
+            kid = jwt.get_unverified_header(token).get("kid")
+
+            # The header is not verified yet: ``kid`` may be any JSON value.
+            if not isinstance(kid, str):
+                raise jwt.InvalidTokenError("Missing or invalid key id")
+
+            key = self._public_keys.get(kid)
+
+            if key is None:
+                raise jwt.InvalidKeyError(f"Unknown signing key: {kid!r}")
+
+        return jwt.decode(jwt=token, key=key, algorithms=[self.algorithm])
+
+
+jwt_keys = JWTKeySet(
+    algorithm=settings.JWT_ALGORITHM,
+    secret=settings.JWT_SECRET,
+    private_keys=settings.JWT_PRIVATE_KEYS,
+    signing_key_id=settings.JWT_SIGNING_KEY_ID,
+)
+
+
 def create_access_token(
     data: dict,
     expire_delta: timedelta | None = None,
@@ -103,10 +384,52 @@ def create_access_token(
 
     to_encode.update({"exp": expire})
 
-    encoded_jwt = jwt.encode(
-        to_encode,
-        settings.JWT_SECRET,
-        algorithm=settings.JWT_ALGORITHM,
-    )
+    encoded_jwt = jwt_keys.sign(to_encode)
 
     return encoded_jwt
+
+
+def decode_access_token(token: str) -> dict[str, Any]:
+    return jwt_keys.decode(token)
+
+
+# Maps raw bearer tokens to their verified, decoded claims.
+token_cache: TTLCache[str, TokenData] = TTLCache(
+    max_size=settings.TOKEN_CACHE_MAX_SIZE,
+    ttl_seconds=settings.TOKEN_CACHE_TTL_SECONDS,
+)
+
+
+def decode_token_data(token: str) -> TokenData:
+    """Verify an access token and return its claims as
+    :class:`~app.schemas.token.TokenData`, served from ``token_cache`` when
+    the same token was verified before.
+
+    Raises:
+        jwt.exceptions.PyJWTError: When the token is invalid or expired.
+        pydantic.ValidationError: When its claims have unexpected types.
+    """
+    token_data = token_cache.get(token)
+
+    if token_data is not None:
+        return token_data
+
+    payload = decode_access_token(token)
+    token_data = TokenData(
+        client_id=payload.get("sub"),
+        id=payload.get("cid"),
+        is_admin=payload.get("adm", False),
+        credentials_version=payload.get("ver"),
+        expires_at=payload.get("exp"),
+    )
+
+    # The signature was verified, so the same token string can be trusted
+    # again until it expires. Tokens without "exp" are never cached.
+    if token_data.expires_at is not None:
+        token_cache.set(
+            token,
+            token_data,
+            ttl_seconds=token_data.expires_at - time.time(),
+        )
+
+    return token_data
@@ -1,26 +1,62 @@
+import asyncio
 import logging
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI
 
 from app.api import router
 from app.api.home import router as home_router
+from app.core.config import settings
+from app.core.database import SessionManager, replica_router
 from app.core.logging_config import setup_logging
 from app.core.middleware import RequestLoggingMiddleware
+from app.core.security import password_hash_executor
+from app.services.clients import service_client
 
 setup_logging()
 logger = logging.getLogger(__name__)
 
 
+async def refresh_oauth_id_filter() -> None:
+    """Rebuild the client id filter every
+    ``CLIENT_ID_FILTER_REFRESH_SECONDS``, so that ids created or rotated by
+    other workers are eventually accepted."""
+    while True:
+        try:
+            async with SessionManager() as db_session:
+                await service_client.load_oauth_id_filter(db_session)
+        except Exception:
+            logger.exception("Failed to load the client id filter.")
+
+        await asyncio.sleep(settings.CLIENT_ID_FILTER_REFRESH_SECONDS)
+
+
 @asynccontextmanager
 async def lifespan(_: FastAPI):
     """Context manager that handles startup and shutdown of the app."""
     logger.info("Starting up the application.")
     # TODO: initialize resources
+    tasks = []
+
+    if settings.CLIENT_ID_FILTER_ENABLED:
+        tasks.append(asyncio.create_task(refresh_oauth_id_filter()))
+
+    if replica_router.enabled:
+        tasks.append(
+            asyncio.create_task(
+                replica_router.monitor(settings.DB_REPLICA_HEALTH_CHECK_SECONDS)
+            )
+        )
 
     yield
 
     logger.info("Shutting down the application.")
+    for task in tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    password_hash_executor.shutdown()
+    await replica_router.dispose()
     # TODO: clean up resources
 
 
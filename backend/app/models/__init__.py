@@ -1,2 +1,3 @@
 from app.models.clients import Client
 from app.models.items import Item
+from app.models.rate_limits import RateLimitBucket
@@ -1,11 +1,14 @@
 from datetime import datetime
 
-from sqlalchemy import BigInteger, DateTime
+from sqlalchemy import BigInteger, CheckConstraint, DateTime, Index
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.utils import now_utc
 from app.models.base import Base
 
+# Name of the check constraint enforcing ``Client.item_quota``.
+ITEM_QUOTA_CONSTRAINT = "ck_clients_item_quota"
+
 
 class Client(Base):
     __tablename__ = "clients"
@@ -20,6 +23,40 @@ class Client(Base):
     is_admin: Mapped[bool] = mapped_column(default=False)
     oauth_id: Mapped[str] = mapped_column(unique=True)
     oauth_secret_hash: Mapped[str]
+    # Bumped whenever previously issued tokens must stop being accepted.
+    credentials_version: Mapped[int] = mapped_column(
+        default=1,
+        server_default="1",
+    )
+    # Name of the PASSWORD_HASH_PROFILES entry used to hash the secret.
+    hash_profile: Mapped[str] = mapped_column(
+        default="default",
+        server_default="default",
+    )
+
+    # Number of items owned by the client, maintained by triggers on the
+    # ``items`` table: never written by the application.
+    item_count: Mapped[int] = mapped_column(
+        BigInteger,
+        default=0,
+        server_default="0",
+    )
+    # Maximum ``item_count``, or None for no limit. Enforced by the check
+    # constraint below, when the triggers update ``item_count``.
+    item_quota: Mapped[int | None] = mapped_column(BigInteger)
+
+    __table_args__ = (
+        # Serves the active clients listing, sorted by id.
+        Index(
+            "ix_clients_active_id",
+            "id",
+            postgresql_where=deleted_at.is_(None),
+        ),
+        CheckConstraint(
+            "item_quota IS NULL OR item_count <= item_quota",
+            name="item_quota",
+        ),
+    )
 
     @property
     def is_active(self) -> bool:
@@ -1,13 +1,47 @@
-from sqlalchemy import BigInteger, ForeignKey
+from sqlalchemy import BigInteger, Computed, ForeignKey, Index, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models.base import Base
 
+# Text search configuration of ``Item.search_vector``, and of the queries
+# matched against it.
+SEARCH_CONFIG = "english"
+
 
 class Item(Base):
     __tablename__ = "items"
-
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     title: Mapped[str]
     description: Mapped[str]
     owner_id: Mapped[int] = mapped_column(ForeignKey("clients.id"))
+    # Maintained by the database; matches in the title rank higher. Deferred,
+    # so that it is only loaded when explicitly selected.
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', title), 'A') || "
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', description), 'B')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
+
+    __table_args__ = (
+        # Every item query is scoped to its owner, and listings sort by id.
+        Index("ix_items_owner_id_id", "owner_id", "id"),
+        # Serves title filters and sorting, in byte order. Alembic does not
+        # reflect index collations, hence no autogenerate.
+        Index(
+            "ix_items_owner_id_title_id",
+            "owner_id",
+            text('title COLLATE "C"'),
+            "id",
+            info={"skip_autogenerate": True},
+        ),
+        Index(
+            "ix_items_search_vector",
+            "search_vector",
+            postgresql_using="gin",
+        ),
+    )
@@ -0,0 +1,19 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class RateLimitBucket(Base):
+    """Token bucket shared by every worker when rate limiting is backed by
+    the database. The table is unlogged: losing it on a crash only resets
+    the limits."""
+
+    __tablename__ = "rate_limit_buckets"
+    __table_args__ = ({"prefixes": ["UNLOGGED"]},)
+
+    key: Mapped[str] = mapped_column(primary_key=True)
+    tokens: Mapped[float]
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
@@ -1,10 +1,22 @@
 from datetime import datetime
 
-from pydantic import ConfigDict, Field
+from pydantic import ConfigDict, Field, field_validator
 
+from app.core.config import settings
 from app.schemas.base import BaseModel
 
 
+def check_hash_profile(hash_profile: str | None) -> str | None:
+    if (
+        hash_profile is not None
+        and hash_profile not in settings.PASSWORD_HASH_PROFILES
+    ):
+        profiles = ", ".join(settings.PASSWORD_HASH_PROFILES)
+        raise ValueError(f"Unknown hash profile, expected one of: {profiles}")
+
+    return hash_profile
+
+
 class ClientBase(BaseModel):
     id: int = Field(
         description="Unique identifier of the client.",
@@ -29,6 +41,10 @@ class ClientBase(BaseModel):
         description="Whether the client has admin privileges.",
         examples=[False],
     )
+    hash_profile: str = Field(
+        description="Password hashing profile of the client's secret.",
+        examples=["default"],
+    )
 
 
 class ClientCreate(BaseModel):
@@ -42,9 +58,26 @@ class ClientCreate(BaseModel):
         description="Whether the client should have admin privileges.",
         examples=[False],
     )
+    hash_profile: str = Field(
+        settings.PASSWORD_HASH_DEFAULT_PROFILE,
+        description=(
+            "Password hashing profile used for the client's secret. Cheaper "
+            "profiles reduce authentication latency; generated secrets are "
+            "random enough for any of them."
+        ),
+        examples=["machine"],
+    )
+    item_quota: int | None = Field(
+        None,
+        ge=0,
+        description="Maximum number of items of the client, null for none.",
+        examples=[1000],
+    )
 
     model_config = ConfigDict(extra="forbid")
 
+    _check_hash_profile = field_validator("hash_profile")(check_hash_profile)
+
 
 class ClientCreatePrivate(ClientCreate):
     oauth_id: str = Field(
@@ -71,6 +104,16 @@ class ClientCreateResponse(ClientBase):
 
 
 class ClientRead(ClientBase):
+    item_count: int = Field(
+        description="Number of items owned by the client.",
+        examples=[42],
+    )
+    item_quota: int | None = Field(
+        None,
+        description="Maximum number of items of the client, null if none.",
+        examples=[1000],
+    )
+
     model_config = ConfigDict(from_attributes=True)
 
 
@@ -91,9 +134,29 @@ class ClientUpdate(BaseModel):
         description="Whether to regenerate client credentials.",
         examples=[False],
     )
+    hash_profile: str | None = Field(
+        None,
+        description=(
+            "Updated password hashing profile. The stored hash is upgraded "
+            "on the client's next successful authentication."
+        ),
+        examples=["machine"],
+    )
+    item_quota: int | None = Field(
+        None,
+        ge=0,
+        description=(
+            "Updated maximum number of items of the client. Set to null to "
+            "lift the quota. It cannot be lower than the current number of "
+            "items."
+        ),
+        examples=[1000],
+    )
 
     model_config = ConfigDict(extra="forbid")
 
+    _check_hash_profile = field_validator("hash_profile")(check_hash_profile)
+
 
 class ClientUpdatePrivate(BaseModel):
     name: str | None = Field(
@@ -117,6 +180,21 @@ class ClientUpdatePrivate(BaseModel):
         description="Updated hashed OAuth client secret.",
         examples=["new_hashed_secret"],
     )
+    credentials_version: int | None = Field(
+        None,
+        description="Updated credentials version, revoking older tokens.",
+        examples=[2],
+    )
+    hash_profile: str | None = Field(
+        None,
+        description="Updated password hashing profile.",
+        examples=["machine"],
+    )
+    item_quota: int | None = Field(
+        None,
+        description="Updated maximum number of items.",
+        examples=[1000],
+    )
 
     model_config = ConfigDict(extra="forbid")
 
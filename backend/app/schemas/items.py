@@ -1,5 +1,15 @@
-from pydantic import ConfigDict, Field
+from typing import Annotated
 
+from pydantic import (
+    AfterValidator,
+    ConfigDict,
+    Field,
+    TypeAdapter,
+    model_validator,
+)
+
+from app.core.config import settings
+from app.core.consts import BulkOutcome
 from app.schemas.base import BaseModel, NonEmptyModel
 
 
@@ -20,6 +30,13 @@ class ItemCreate(ItemBase):
     model_config = ConfigDict(extra="forbid")
 
 
+# Bounds of the number of items of a bulk request.
+BulkSize = Field(min_length=1, max_length=settings.ITEMS_BULK_MAX_SIZE)
+
+# Validates a whole bulk creation payload, straight from the JSON bytes.
+ItemCreateBatch = TypeAdapter(Annotated[list[ItemCreate], BulkSize])
+
+
 class ItemCreatePrivate(ItemBase):
     owner_id: int = Field(
         description="ID of the owner of the item.",
@@ -35,6 +52,13 @@ class ItemRead(ItemBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class ItemSearchResult(ItemRead):
+    rank: float = Field(
+        description="Relevance of the item to the search; higher is better.",
+        examples=[0.2],
+    )
+
+
 class ItemUpdate(NonEmptyModel):
     title: str | None = Field(
         default=None,
@@ -50,3 +74,73 @@ class ItemUpdate(NonEmptyModel):
     )
 
     model_config = ConfigDict(extra="forbid")
+
+
+class ItemBulkUpdate(ItemUpdate):
+    id: int = Field(description="ID of the item to update.", examples=[1])
+
+    @model_validator(mode="after")
+    def at_least_one_field(self):
+        """Validate that at least one field besides ``id`` is supplied."""
+        if self.title is None and self.description is None:
+            raise ValueError("At least one field must be provided")
+        return self
+
+
+def check_unique_ids(ids: list[int]) -> list[int]:
+    if len(set(ids)) != len(ids):
+        raise ValueError("Item IDs must be unique")
+    return ids
+
+
+def check_unique_item_ids(
+    items: list[ItemBulkUpdate],
+) -> list[ItemBulkUpdate]:
+    check_unique_ids([item.id for item in items])
+    return items
+
+
+# Validates a whole bulk update payload, straight from the JSON bytes.
+ItemBulkUpdateBatch = TypeAdapter(
+    Annotated[
+        list[ItemBulkUpdate],
+        BulkSize,
+        AfterValidator(check_unique_item_ids),
+    ]
+)
+
+
+class ItemBulkDelete(BaseModel):
+    ids: Annotated[
+        list[int],
+        BulkSize,
+        AfterValidator(check_unique_ids),
+    ] = Field(description="IDs of the items to delete.", examples=[[1, 2]])
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class ItemBulkResult(BaseModel):
+    id: int = Field(description="ID of the item.", examples=[1])
+    outcome: BulkOutcome = Field(
+        description="What happened to the item. Items that do not exist, "
+        "or belong to another client, are ``not_found``.",
+        examples=[BulkOutcome.UPDATED],
+    )
+
+
+class ItemImportError(BaseModel):
+    line: int = Field(description="1-based line number.", examples=[3])
+    errors: list[str] = Field(
+        description="Reasons why the line was rejected.",
+        examples=[["title: String should have at least 1 character"]],
+    )
+
+
+class ItemImportReport(BaseModel):
+    imported: int = Field(description="Number of items created.")
+    rejected: int = Field(description="Number of lines rejected.")
+    errors: list[ItemImportError] = Field(
+        description="Errors of the first ``ITEMS_IMPORT_MAX_ERRORS`` "
+        "rejected lines.",
+    )
@@ -0,0 +1,111 @@
+from pydantic import ConfigDict, Field
+
+from app.schemas.base import BaseModel
+
+
+class CacheMetrics(BaseModel):
+    size: int = Field(description="Number of entries currently cached.")
+    max_size: int = Field(description="Maximum number of cached entries.")
+    hits: int = Field(description="Lookups served from the cache.")
+    misses: int = Field(description="Lookups not found or expired.")
+    evictions: int = Field(
+        description="Entries dropped to make room for new ones."
+    )
+    expirations: int = Field(description="Entries dropped after their TTL.")
+    invalidations: int = Field(description="Entries explicitly invalidated.")
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ExecutorMetrics(BaseModel):
+    kind: str = Field(description="Type of pool backing the executor.")
+    max_workers: int = Field(description="Number of pool workers.")
+    max_pending: int = Field(
+        description="Maximum number of pending tasks before rejecting work."
+    )
+    pending: int = Field(
+        description="Current queue depth: tasks submitted but not finished."
+    )
+    completed: int = Field(description="Tasks that finished successfully.")
+    failed: int = Field(description="Tasks that raised or were cancelled.")
+    rejected: int = Field(description="Tasks rejected due to saturation.")
+    queue_wait_total: float = Field(
+        description="Total seconds tasks spent waiting for a worker."
+    )
+    queue_wait_max: float = Field(
+        description="Longest time, in seconds, a task waited for a worker."
+    )
+    run_time_total: float = Field(
+        description="Total seconds spent running tasks."
+    )
+    run_time_max: float = Field(
+        description="Longest time, in seconds, spent running a single task."
+    )
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class RateLimiterMetrics(BaseModel):
+    backend: str = Field(description="Where the token buckets are kept.")
+    rate: float = Field(description="Refill rate, in requests per second.")
+    burst: int = Field(description="Capacity of each bucket.")
+    keys: int | None = Field(
+        description="Buckets held in memory; null for shared backends."
+    )
+    allowed: int = Field(description="Requests allowed by this worker.")
+    rejected: int = Field(description="Requests rejected by this worker.")
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class PoolMetrics(BaseModel):
+    size: int = Field(description="Connections kept open by the pool.")
+    max_overflow: int = Field(
+        description="Extra connections allowed beyond the pool size."
+    )
+    checked_in: int = Field(description="Idle connections in the pool.")
+    checked_out: int = Field(description="Connections currently in use.")
+    overflow: int = Field(description="Overflow connections currently open.")
+    checkouts: int = Field(description="Connections handed out so far.")
+    timeouts: int = Field(
+        description="Checkouts that gave up after the pool timeout."
+    )
+    wait_total: float = Field(
+        description="Total seconds spent obtaining connections."
+    )
+    wait_max: float = Field(
+        description="Longest time, in seconds, spent obtaining a connection."
+    )
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ReplicaMetrics(BaseModel):
+    host: str = Field(description="Host of the read replica.")
+    healthy: bool = Field(description="Whether reads are routed to it.")
+    lag_seconds: float | None = Field(
+        description="Replication lag at the last check; null if unreachable."
+    )
+    checked_at: float | None = Field(
+        description="Unix time of the last health check."
+    )
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class Metrics(BaseModel):
+    caches: dict[str, CacheMetrics] = Field(
+        description="Counters of the in-process caches, keyed by cache name.",
+    )
+    executors: dict[str, ExecutorMetrics] = Field(
+        description="Counters of the blocking-work executors, keyed by name.",
+    )
+    pools: dict[str, PoolMetrics] = Field(
+        description="Counters of the database connection pools, keyed by name.",
+    )
+    replicas: list[ReplicaMetrics] = Field(
+        description="Health of the configured read replicas.",
+    )
+    rate_limiters: dict[str, RateLimiterMetrics] = Field(
+        description="Counters of the rate limiters, keyed by name.",
+    )
@@ -1,4 +1,6 @@
-from pydantic import Field
+from typing import Any
+
+from pydantic import ConfigDict, Field
 
 from app.schemas.base import BaseModel
 
@@ -20,3 +22,98 @@ class TokenData(BaseModel):
         description="Client ID extracted from the token.",
         examples=["client_123"],
     )
+    id: int | None = Field(
+        None,
+        description="Internal identifier of the client.",
+        examples=[1],
+    )
+    is_admin: bool = Field(
+        False,
+        description="Whether the client had admin privileges when the token "
+        "was issued.",
+        examples=[False],
+    )
+    credentials_version: int | None = Field(
+        None,
+        description="Credentials version of the client when the token was "
+        "issued.",
+        examples=[1],
+    )
+    expires_at: int | None = Field(
+        None,
+        description="Expiration time of the token, as a Unix timestamp.",
+        examples=[1767225600],
+    )
+
+
+class JWKSet(BaseModel):
+    keys: list[dict[str, Any]] = Field(
+        description="Public keys that may have signed access tokens, as JSON "
+        "Web Keys (RFC 7517). Empty when tokens are signed with a shared "
+        "secret.",
+        examples=[
+            [
+                {
+                    "kty": "OKP",
+                    "crv": "Ed25519",
+                    "x": "11qYAYKxCrfVS_7TyWQHOg7hcvPapiMlrwIaaPcHURo",
+                    "kid": "2026-10",
+                    "use": "sig",
+                    "alg": "EdDSA",
+                }
+            ]
+        ],
+    )
+
+
+class TokenIntrospection(BaseModel):
+    """Token introspection response (RFC 7662 §2.2). Every field but
+    ``active`` is omitted for inactive tokens."""
+
+    active: bool = Field(
+        description="Whether the token is currently valid: correctly signed, "
+        "unexpired, not revoked and owned by an active client.",
+        examples=[True],
+    )
+    client_id: str | None = Field(
+        None,
+        description="Client ID the token was issued to.",
+        examples=["client_123"],
+    )
+    sub: str | None = Field(
+        None,
+        description="Subject of the token (the client ID).",
+        examples=["client_123"],
+    )
+    token_type: str | None = Field(
+        None,
+        description="Type of the token.",
+        examples=["bearer"],
+    )
+    exp: int | None = Field(
+        None,
+        description="Expiration time of the token, as a Unix timestamp.",
+        examples=[1767225600],
+    )
+    is_admin: bool | None = Field(
+        None,
+        description="Whether the client has admin privileges.",
+        examples=[False],
+    )
+
+
+class TokenIntrospectionBatchRequest(BaseModel):
+    tokens: list[str] = Field(
+        min_length=1,
+        max_length=100,
+        description="Tokens to introspect.",
+        examples=[["eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9..."]],
+    )
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class TokenIntrospectionBatch(BaseModel):
+    results: list[TokenIntrospection] = Field(
+        description="Introspection results, in the order of the request.",
+    )
@@ -1,20 +1,35 @@
 import logging
-from collections.abc import Sequence
-from typing import Never
+from collections.abc import AsyncIterator, Sequence
+from typing import Any, Never
 
 from fastapi import HTTPException, status
+from jwt.exceptions import PyJWTError
+from pydantic import ValidationError
+from sqlalchemy import Row, UnaryExpression, asc, desc, func, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.bloom import BloomFilter
+from app.core.cache import TTLCache
 from app.core.config import settings
-from app.core.consts import ENTITY_CREATION_ERROR
+from app.core.consts import (
+    ENTITY_CREATION_ERROR,
+    DataFormat,
+    FilterOperator,
+)
+from app.core.exports import encode_rows
+from app.core.filters import RANGE_OPERATORS, FilterField, ListSpec, SortOption
 from app.core.security import (
+    DUMMY_PASSWORD_HASH_PROFILE,
     create_access_token,
+    decode_token_data,
+    dummy_password_hash,
     new_client_credentials,
-    verify_password,
+    verified_secret_digest,
+    verify_and_update_password_async,
 )
 from app.core.utils import now_utc
-from app.models.clients import Client
+from app.models.clients import ITEM_QUOTA_CONSTRAINT, Client
 from app.schemas.clients import (
     ClientCreate,
     ClientCreatePrivate,
@@ -23,11 +38,55 @@ from app.schemas.clients import (
     ClientUpdatePrivate,
     ClientUpdateResponse,
 )
-from app.schemas.token import Token
-from app.services.crud import CRUDBase
+from app.schemas.token import Token, TokenData, TokenIntrospection
+from app.services.crud import CRUDBase, TotalCount, violated_constraint
 
 logger = logging.getLogger(__name__)
 
+# Filters and orderings of the client listing, served by the primary key,
+# the ``oauth_id`` unique index and ``ix_clients_active_id``.
+CLIENT_LIST_SPEC = ListSpec(
+    filters={
+        "id": FilterField(
+            Client.id,
+            int,
+            frozenset({FilterOperator.EQ, FilterOperator.IN, *RANGE_OPERATORS}),
+        ),
+        "oauth_id": FilterField(
+            Client.oauth_id,
+            str,
+            frozenset({FilterOperator.EQ, FilterOperator.IN}),
+        ),
+    },
+    sorts={
+        "id": SortOption((asc(Client.id),), (("id", int),)),
+        "-id": SortOption((desc(Client.id),), (("id", int),)),
+    },
+)
+
+client_cache: TTLCache[str, Client] = TTLCache(
+    max_size=settings.CLIENT_CACHE_MAX_SIZE,
+    ttl_seconds=settings.CLIENT_CACHE_TTL_SECONDS,
+)
+
+# Maps verified_secret_digest(client_id, client_secret) to the client_id.
+verified_secret_cache: TTLCache[bytes, str] = TTLCache(
+    max_size=(
+        settings.VERIFIED_SECRET_CACHE_MAX_SIZE
+        if settings.VERIFIED_SECRET_CACHE_ENABLED
+        else 0
+    ),
+    ttl_seconds=settings.VERIFIED_SECRET_CACHE_TTL_SECONDS,
+)
+
+
+def invalidate_cached_client(oauth_id: str) -> None:
+    """Drop every cached entry derived from the client ``oauth_id``."""
+    client_cache.invalidate(oauth_id)
+    verified_secret_cache.invalidate_where(
+        lambda _, cached_oauth_id: cached_oauth_id == oauth_id
+    )
+
 
 class ServiceClient(CRUDBase[Client, ClientCreatePrivate, ClientUpdatePrivate]):
     """Service layer for ``Client`` management.
@@ -37,6 +96,58 @@ class ServiceClient(CRUDBase[Client, ClientCreatePrivate, ClientUpdatePrivate]):
     deletion, and admin-level CRUD operations.
     """
 
+    def __init__(self, model: type[Client]):
+        super().__init__(model)
+        self.oauth_id_filter: BloomFilter | None = None
+        self._oauth_ids_added_during_load: set[str] | None = None
+
+    def might_exist(self, oauth_id: str) -> bool:
+        """Return ``False`` only if no client has ever had ``oauth_id``.
+
+        Always ``True`` until :meth:`load_oauth_id_filter` has run.
+        """
+        return (
+            self.oauth_id_filter is None
+            or self.oauth_id_filter.might_contain(oauth_id)
+        )
+
+    def _remember_oauth_id(self, oauth_id: str) -> None:
+        if self.oauth_id_filter is not None:
+            self.oauth_id_filter.add(oauth_id)
+
+        if self._oauth_ids_added_during_load is not None:
+            self._oauth_ids_added_during_load.add(oauth_id)
+
+    async def load_oauth_id_filter(self, db_session: AsyncSession) -> None:
+        """(Re)build the Bloom filter of existing ``oauth_id`` values.
+
+        The filter is sized with room for twice the current number of
+        clients and replaces the previous one at once. Ids registered by this
+        worker while the filter is being loaded are carried over.
+
+        Args:
+            db_session: The active async database session.
+        """
+        self._oauth_ids_added_during_load = set()
+
+        try:
+            count = await db_session.scalar(select(func.count(Client.id)))
+            oauth_id_filter = BloomFilter(
+                capacity=max(
+                    2 * (count or 0),
+                    settings.CLIENT_ID_FILTER_MIN_CAPACITY,
+                ),
+                error_rate=settings.CLIENT_ID_FILTER_ERROR_RATE,
+                items=await db_session.scalars(select(Client.oauth_id)),
+            )
+
+            for oauth_id in self._oauth_ids_added_during_load:
+                oauth_id_filter.add(oauth_id)
+
+            self.oauth_id_filter = oauth_id_filter
+        finally:
+            self._oauth_ids_added_during_load = None
+
     def raise_unauthorized(
         self,
         detail: str = "Incorrect client_id or client_secret",
@@ -58,6 +169,140 @@ class ServiceClient(CRUDBase[Client, ClientCreatePrivate, ClientUpdatePrivate]):
             detail=detail,
         )
 
+    async def get_by_oauth_id(
+        self,
+        db_session: AsyncSession,
+        oauth_id: str,
+    ) -> Client | None:
+        """Return the client identified by ``oauth_id``, served from cache.
+
+        Cache hits skip the database entirely. On a miss the client is
+        loaded and a detached snapshot of it is cached, so the returned
+        instance is never bound to a session and must be treated as
+        read-only. Unknown clients are not cached.
+
+        Args:
+            db_session: The active async database session, used on a miss.
+            oauth_id: The OAuth2 ``client_id`` to look up.
+
+        Returns:
+            The matching :class:`~app.models.clients.Client`, or ``None`` if
+            no client with that ``oauth_id`` exists.
+        """
+        client = client_cache.get(oauth_id)
+
+        if client is None:
+            client = await self.get(db_session, oauth_id=oauth_id)
+
+            if client is None:
+                return None
+
+            client = Client(
+                id=client.id,
+                name=client.name,
+                created_at=client.created_at,
+                deleted_at=client.deleted_at,
+                is_admin=client.is_admin,
+                oauth_id=client.oauth_id,
+                credentials_version=client.credentials_version,
+                hash_profile=client.hash_profile,
+            )
+            client_cache.set(oauth_id, client)
+
+        return client
+
+    def is_token_current(self, client: Client, token_data: TokenData) -> bool:
+        """Return whether a token was issued for ``client``'s current
+        credentials, i.e. it has not been revoked since."""
+        return (
+            client.id == token_data.id
+            and client.credentials_version == token_data.credentials_version
+        )
+
+    async def introspect(
+        self,
+        db_session: AsyncSession,
+        token: str,
+    ) -> TokenIntrospection:
+        """Report whether an access token is currently active.
+
+        Both the token verification and the client lookup are served from
+        in-memory caches, so repeated introspection of live tokens does not
+        reach the database.
+
+        Args:
+            db_session: The active async database session, used on a client
+                cache miss.
+            token: The raw access token to inspect.
+
+        Returns:
+            A :class:`~app.schemas.token.TokenIntrospection`; only ``active``
+            is set when the token is invalid, expired, revoked or belongs to
+            an inactive client.
+        """
+        try:
+            token_data = decode_token_data(token)
+        except PyJWTError, ValidationError:
+            return TokenIntrospection(active=False)
+
+        if token_data.client_id is None:
+            return TokenIntrospection(active=False)
+
+        client = await self.get_by_oauth_id(db_session, token_data.client_id)
+
+        if (
+            client is None
+            or not client.is_active
+            or not self.is_token_current(client, token_data)
+        ):
+            return TokenIntrospection(active=False)
+
+        return TokenIntrospection(
+            active=True,
+            client_id=client.oauth_id,
+            sub=client.oauth_id,
+            token_type=settings.JWT_TOKEN_TYPE,
+            exp=token_data.expires_at,
+            is_admin=token_data.is_admin,
+        )
+
+    async def rehash_secret(
+        self,
+        db_session: AsyncSession,
+        client: Client,
+        secret_hash: str,
+    ) -> None:
+        """Store a new hash of the client's unchanged secret.
+
+        Failures are logged and swallowed: the old hash is still valid, and
+        the upgrade is retried on the next authentication.
+
+        Args:
+            db_session: The active async database session.
+            client: The client whose secret was just verified.
+            secret_hash: The new hash of the same secret.
+        """
+        try:
+            await self.update(
+                db_session,
+                db_object=client,
+                update_schema=ClientUpdatePrivate(
+                    oauth_secret_hash=secret_hash,
+                ),
+            )
+        except Exception as err:  # noqa: BLE001
+            await db_session.rollback()
+            await db_session.refresh(client)
+            logger.warning(
+                f"Failed to rehash secret of client {client.id}: {err}"
+            )
+            return
+
+        logger.info(
+            f"Rehashed secret of client {client.id} with profile "
+            f"{client.hash_profile}"
+        )
+
     async def authenticate(
         self,
         db_session: AsyncSession,
@@ -68,7 +313,29 @@ class ServiceClient(CRUDBase[Client, ClientCreatePrivate, ClientUpdatePrivate]):
 
         Looks up the client by ``client_id``, verifies the provided
         ``client_secret`` against the stored hash, and issues a signed JWT on
-        success.
+        success. Besides the ``client_id`` in ``sub``, the token carries the
+        internal client id (``cid``), admin flag (``adm``) and credentials
+        version (``ver``), so that requests can be authorised from the token
+        alone. Hash verification runs on the password-hashing executor so
+        that it never blocks the event loop.
+
+        When ``CLIENT_ID_FILTER_ENABLED`` is set, unknown ids are screened
+        out by the in-memory ``oauth_id_filter`` without querying the
+        database; ids created through other workers are only accepted once
+        this worker's filter has been refreshed.
+
+        Whether the client is unknown or the secret is wrong, a hash is
+        always verified (against a dummy hash for unknown clients), so the
+        response time does not reveal which ``client_id`` values exist.
+
+        Hashes created with other parameters than the client's
+        ``hash_profile`` (e.g. after the profile or its parameters changed)
+        are transparently replaced once the secret has been verified.
+
+        When ``VERIFIED_SECRET_CACHE_ENABLED`` is set, credentials of active
+        clients that were verified recently are remembered under a keyed
+        digest, and repeated exchanges skip both the database and Argon2
+        until the entry expires or the client is updated or deactivated.
 
         Args:
             db_session: The active async database session.
@@ -83,20 +350,53 @@ class ServiceClient(CRUDBase[Client, ClientCreatePrivate, ClientUpdatePrivate]):
         Raises:
             HTTPException: ``401 Unauthorized`` when either credential is
                 ``None``, the client does not exist, or the secret does not
-                match the stored hash.
+                match the stored hash. ``503 Service Unavailable`` when the
+                password-hashing executor is saturated.
         """
         if client_id is None or client_secret is None:
             self.raise_unauthorized()
 
-        client = await self.get(db_session, oauth_id=client_id)
+        digest = verified_secret_digest(client_id, client_secret)
 
-        if client is None:
-            self.raise_unauthorized()
+        if verified_secret_cache.get(digest) == client_id:
+            client = await self.get_by_oauth_id(db_session, client_id)
+        else:
+            client = (
+                await self.get(db_session, oauth_id=client_id)
+                if self.might_exist(client_id)
+                else None
+            )
+
+            verified, updated_hash = await verify_and_update_password_async(
+                client_secret,
+                client.oauth_secret_hash
+                if client is not None
+                else dummy_password_hash,
+                client.hash_profile
+                if client is not None
+                else DUMMY_PASSWORD_HASH_PROFILE,
+            )
+
+            if client is None or not verified:
+                self.raise_unauthorized()
+
+            if updated_hash is not None:
+                await self.rehash_secret(db_session, client, updated_hash)
+
+            if client.is_active:
+                verified_secret_cache.set(digest, client_id)
 
-        if not verify_password(client_secret, client.oauth_secret_hash):
+        if client is None:
             self.raise_unauthorized()
 
-        access_token = create_access_token(data={"sub": client.oauth_id})
+        access_token = create_access_token(
+            data={
+                "sub": client.oauth_id,
+                "cid": client.id,
+                "adm": client.is_admin,
+                "ver": client.credentials_version,
+            }
+        )
 
         return Token(
             access_token=access_token,
@@ -129,7 +429,11 @@ class ServiceClient(CRUDBase[Client, ClientCreatePrivate, ClientUpdatePrivate]):
                 ``oauth_id`` already exists (rare collision). ``500 Internal
                 Server Error`` for any other persistence failure.
         """
-        client_id, client_secret, client_secret_hash = new_client_credentials()
+        (
+            client_id,
+            client_secret,
+            client_secret_hash,
+        ) = await new_client_credentials(create_schema.hash_profile)
 
         try:
             client = await self.create(
@@ -137,6 +441,8 @@ class ServiceClient(CRUDBase[Client, ClientCreatePrivate, ClientUpdatePrivate]):
                 create_schema=ClientCreatePrivate(
                     name=create_schema.name,
                     is_admin=create_schema.is_admin,
+                    hash_profile=create_schema.hash_profile,
+                    item_quota=create_schema.item_quota,
                     oauth_id=client_id,
                     oauth_secret_hash=client_secret_hash,
                 ),
@@ -160,12 +466,15 @@ class ServiceClient(CRUDBase[Client, ClientCreatePrivate, ClientUpdatePrivate]):
                 detail="Failed to register client.",
             ) from None
 
+        self._remember_oauth_id(client.oauth_id)
+
         return ClientCreateResponse(
             id=client.id,
             name=client.name,
             created_at=client.created_at,
             deleted_at=client.deleted_at,
             is_admin=client.is_admin,
+            hash_profile=client.hash_profile,
             client_id=client.oauth_id,
             client_secret=client_secret,
         )
@@ -176,7 +485,11 @@ class ServiceClient(CRUDBase[Client, ClientCreatePrivate, ClientUpdatePrivate]):
         page: int,
         per_page: int,
         active_only: bool,
-    ) -> Sequence[Client]:
+        after: Sequence[Any] | None = None,
+        columns: Sequence[str] | None = None,
+        filters: Sequence[Any] = (),
+        order_by: list[UnaryExpression] | None = None,
+    ) -> Sequence[Client] | Sequence[Row]:
         """Return a paginated list of clients.
 
         Args:
@@ -185,18 +498,102 @@ class ServiceClient(CRUDBase[Client, ClientCreatePrivate, ClientUpdatePrivate]):
             per_page: Maximum number of clients to return per page.
             active_only: When ``True``, only clients whose ``deleted_at`` is
                 ``NULL`` (i.e. not soft-deleted) are included.
+            after: Keyset position, the ``order_by`` values of the last
+                client of the previous page. Takes precedence over ``page``.
+            columns: When given, only these columns are selected, and plain
+                rows are returned instead of ORM instances.
+            filters: Additional SQLAlchemy filter expressions.
+            order_by: Sort order (default: ascending ``id``).
 
         Returns:
-            A sequence of :class:`~app.models.clients.Client` ORM instances
-            for the requested page.
+            A sequence of :class:`~app.models.clients.Client` ORM instances,
+            or of rows of ``columns``, for the requested page.
         """
-        filters = [Client.deleted_at.is_(None)] if active_only else []
+        if active_only:
+            filters = [Client.deleted_at.is_(None), *filters]
+
+        if columns is not None:
+            return await self.get_multi_rows(
+                db_session,
+                columns,
+                *filters,
+                page=page,
+                per_page=per_page,
+                order_by=order_by,
+                after=after,
+            )
 
         return await self.get_multi(
             db_session,
             *filters,
             page=page,
             per_page=per_page,
+            order_by=order_by,
+            after=after,
+        )
+
+    async def count_many(
+        self,
+        db_session: AsyncSession,
+        active_only: bool,
+        filters: Sequence[Any] = (),
+    ) -> TotalCount:
+        """Count the clients :meth:`get_many` lists, exactly up to
+        ``COUNT_EXACT_THRESHOLD`` of them, and estimated beyond.
+
+        Args:
+            db_session: The active async database session.
+            active_only: When ``True``, soft-deleted clients are excluded.
+            filters: Additional SQLAlchemy filter expressions.
+        """
+        if active_only:
+            filters = [Client.deleted_at.is_(None), *filters]
+
+        return await self.count(
+            db_session,
+            *filters,
+            exact_threshold=settings.COUNT_EXACT_THRESHOLD,
+        )
+
+    def export(
+        self,
+        db_session: AsyncSession,
+        active_only: bool,
+        data_format: DataFormat,
+    ) -> AsyncIterator[bytes]:
+        """Stream every client, ordered by ``id``.
+
+        Args:
+            db_session: The active async database session, which must stay
+                open until the stream is consumed.
+            active_only: When ``True``, soft-deleted clients are excluded.
+            data_format: Output format.
+
+        Returns:
+            The encoded export, by chunks of ``EXPORT_BATCH_SIZE`` clients.
+        """
+        columns = (
+            "id",
+            "name",
+            "created_at",
+            "deleted_at",
+            "is_admin",
+            "hash_profile",
+            "item_count",
+            "item_quota",
+        )
+        filters = [Client.deleted_at.is_(None)] if active_only else []
+
+        return encode_rows(
+            self.stream_rows(
+                db_session,
+                columns,
+                *filters,
+                batch_size=settings.EXPORT_BATCH_SIZE,
+            ),
+            columns,
+            data_format,
+            settings.EXPORT_BATCH_SIZE,
         )
 
     async def admin_update(
@@ -210,6 +607,10 @@ class ServiceClient(CRUDBase[Client, ClientCreatePrivate, ClientUpdatePrivate]):
         When ``update_schema.regenerate_credentials`` is ``True``, a fresh
         ``client_id`` / ``client_secret`` pair is generated and the new
         plaintext secret is returned in the response (it is not stored).
+        Rotating credentials or changing ``is_admin`` bumps the client's
+        ``credentials_version``, revoking every token issued before. The
+        client's cached entries are invalidated so the change takes effect
+        on its next request.
 
         Args:
             db_session: The active async database session.
@@ -224,26 +625,63 @@ class ServiceClient(CRUDBase[Client, ClientCreatePrivate, ClientUpdatePrivate]):
             ``None`` when credentials were not regenerated.
 
         Raises:
-            HTTPException: ``500 Internal Server Error`` if the underlying
-                update operation returns ``None``.
+            HTTPException: ``409 Conflict`` if ``item_quota`` is lower than
+                the client's item count; ``500 Internal Server Error`` if the
+                underlying update operation returns ``None``.
         """
+        oauth_id = client.oauth_id
+
         new_client_id, new_client_secret, new_client_secret_hash = (
-            new_client_credentials()
+            await new_client_credentials(
+                update_schema.hash_profile or client.hash_profile
+            )
             if update_schema.regenerate_credentials
             else (None, None, None)
         )
 
-        updated_client = await self.update(
-            db_session,
-            db_object=client,
-            update_schema=ClientUpdatePrivate(
-                name=update_schema.name,
-                is_admin=update_schema.is_admin,
-                oauth_id=new_client_id,
-                oauth_secret_hash=new_client_secret_hash,
-            ),
+        revoke_tokens = update_schema.regenerate_credentials or (
+            update_schema.is_admin is not None
+            and update_schema.is_admin != client.is_admin
         )
 
+        update_data = ClientUpdatePrivate(
+            name=update_schema.name,
+            is_admin=update_schema.is_admin,
+            oauth_id=new_client_id,
+            oauth_secret_hash=new_client_secret_hash,
+            hash_profile=update_schema.hash_profile,
+            credentials_version=(
+                client.credentials_version + 1 if revoke_tokens else None
+            ),
+            item_quota=update_schema.item_quota,
+        ).model_dump(exclude_none=True)
+
+        # An explicit null lifts the quota.
+        if "item_quota" in update_schema.model_fields_set:
+            update_data["item_quota"] = update_schema.item_quota
+
+        try:
+            updated_client = await self.update(
+                db_session,
+                db_object=client,
+                update_schema=update_data,
+                exclude_none=False,
+            )
+        except IntegrityError as err:
+            if violated_constraint(err) != ITEM_QUOTA_CONSTRAINT:
+                raise
+
+            await db_session.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="The item quota is lower than the client's item count.",
+            ) from None
+
+        invalidate_cached_client(oauth_id)
+
+        if new_client_id is not None:
+            self._remember_oauth_id(new_client_id)
+
         if updated_client is None:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -256,6 +694,7 @@ class ServiceClient(CRUDBase[Client, ClientCreatePrivate, ClientUpdatePrivate]):
             created_at=updated_client.created_at,
             deleted_at=updated_client.deleted_at,
             is_admin=updated_client.is_admin,
+            hash_profile=updated_client.hash_profile,
             client_id=new_client_id,
             client_secret=new_client_secret,
         )
@@ -270,6 +709,8 @@ class ServiceClient(CRUDBase[Client, ClientCreatePrivate, ClientUpdatePrivate]):
         The client record is retained in the database but is excluded from
         active-only queries. This operation is irreversible through the
         standard API surface.
+        The client's cached entries are invalidated so that its outstanding
+        tokens and cached credentials are rejected immediately.
 
         Args:
             db_session: The active async database session.
@@ -280,5 +721,7 @@ class ServiceClient(CRUDBase[Client, ClientCreatePrivate, ClientUpdatePrivate]):
         await db_session.commit()
         await db_session.refresh(client)
 
+        invalidate_cached_client(client.oauth_id)
+
 
 service_client = ServiceClient(Client)
@@ -1,11 +1,118 @@
-from collections.abc import Sequence
+import json
+from collections.abc import AsyncIterator, Iterable, Sequence
+from dataclasses import dataclass
 from typing import Any
 
 from pydantic import BaseModel
-from sqlalchemy import UnaryExpression, asc, select
+from sqlalchemy import (
+    ARRAY,
+    ColumnElement,
+    Row,
+    Select,
+    UnaryExpression,
+    and_,
+    any_,
+    asc,
+    bindparam,
+    delete,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    tuple_,
+)
 from sqlalchemy import update as sqlalchemy_update
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+
+def keyset_filter(
+    order_by: Sequence[UnaryExpression],
+    after: Sequence[Any],
+) -> ColumnElement[bool]:
+    """Build the condition selecting the rows that sort after ``after``.
+
+    Uses a row-value comparison, e.g. ``(a, b) > (:a, :b)``, which an index
+    on the sort columns can serve, when all columns sort in the same
+    direction; falls back to its expanded form otherwise.
+
+    Raises:
+        ValueError: If ``after`` does not have one value per sort column.
+    """
+    if not order_by or len(after) != len(order_by):
+        raise ValueError("after must have one value per order_by column")
+
+    columns = [expression.element for expression in order_by]
+    descending = [
+        expression.modifier is operators.desc_op for expression in order_by
+    ]
+
+    if all(descending):
+        return tuple_(*columns) < tuple_(*after)
+
+    if not any(descending):
+        return tuple_(*columns) > tuple_(*after)
+
+    return or_(
+        *(
+            and_(
+                *(columns[j] == after[j] for j in range(i)),
+                (
+                    columns[i] < after[i]
+                    if descending[i]
+                    else columns[i] > after[i]
+                ),
+            )
+            for i in range(len(columns))
+        )
+    )
+
+
+def equals_any(column: Any, values: Sequence[Any]) -> ColumnElement[bool]:
+    """Build ``column = ANY(:values)``, with the values bound as a single
+    array parameter rather than one parameter each, as ``IN`` would."""
+    return column == any_(
+        bindparam(None, list(values), type_=ARRAY(column.type))
+    )
+
+
+def violated_constraint(err: Exception) -> str | None:
+    """Return the name of the constraint whose violation raised ``err``, a
+    SQLAlchemy error or an asyncpg one, or ``None``."""
+    if isinstance(err, DBAPIError):
+        err = err.orig.__cause__ or err.orig
+    return getattr(err, "constraint_name", None)
+
+
+class Explain(Executable, ClauseElement):
+    """``EXPLAIN (FORMAT JSON)`` of a statement, whose parameters are bound
+    as usual."""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+
+@compiles(Explain)
+def _compile_explain(element: Explain, compiler: Any, **kwargs: Any) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(
+        element.statement,
+        **kwargs,
+    )
+
+
+@dataclass(frozen=True)
+class TotalCount:
+    """Number of records matching a query, counted or estimated."""
+
+    value: int
+    exact: bool
 
 
 class CRUDBase[
@@ -55,7 +162,7 @@ class CRUDBase[
                 Pydantic model (``exclude_unset=True`` applied) or a raw dict.
 
         Returns:
-            The newly created and refreshed ORM instance.
+            The newly created ORM instance, populated from ``RETURNING``.
         """
         data = (
             create_schema
@@ -63,12 +170,14 @@ class CRUDBase[
             else create_schema.model_dump(exclude_unset=True)
         )
 
-        db_object = self._model(**data)
-        db_session.add(db_object)
+        # A single INSERT ... RETURNING, instead of an INSERT followed by a
+        # SELECT to load server-generated values.
+        db_object = await db_session.scalar(
+            insert(self._model).values(**data).returning(self._model)
+        )
         await db_session.commit()
-        await db_session.refresh(db_object)
 
-        return db_object
+        return db_object  # type: ignore[return-value]
 
     async def get(
         self,
@@ -108,6 +217,7 @@ class CRUDBase[
         page: int = 1,
         per_page: int = 100,
         order_by: list[UnaryExpression] | None = None,
+        after: Sequence[Any] | None = None,
         **kwargs,
     ) -> Sequence[ModelType]:
         """Retrieve a paginated list of model instances.
@@ -116,6 +226,12 @@ class CRUDBase[
         filters (``**kwargs``). Results default to ascending ``id`` order when
         the model exposes that column and no explicit ordering is provided.
 
+        Pages are selected either by offset (``page``) or, when ``after`` is
+        given, by keyset: only rows sorting after the row whose sort key is
+        ``after`` are returned. Keyset pages cost the same at any depth, as
+        long as an index covers the filters and ``order_by``, which must
+        then end with a unique column.
+
         Args:
             db_session: The active async database session.
             *args: Optional SQLAlchemy column expressions for filtering.
@@ -124,17 +240,177 @@ class CRUDBase[
             order_by: List of SQLAlchemy unary expressions defining sort order.
                 Defaults to ``[asc(model.id)]`` when the model has an ``id``
                 column.
+            after: Values of the ``order_by`` columns of the last row of the
+                previous page. Takes precedence over ``page``.
             **kwargs: Optional keyword filters applied via ``filter_by``.
 
         Returns:
             A sequence of ORM instances for the requested page.
         """
+        query = self._page_query(
+            select(self._model),
+            *args,
+            page=page,
+            per_page=per_page,
+            order_by=order_by,
+            after=after,
+            **kwargs,
+        )
+
+        result = await db_session.execute(query)
+        return result.scalars().all()
+
+    async def get_multi_rows(
+        self,
+        db_session: AsyncSession,
+        columns: Sequence[str],
+        *args,
+        page: int = 1,
+        per_page: int = 100,
+        order_by: list[UnaryExpression] | None = None,
+        after: Sequence[Any] | None = None,
+        **kwargs,
+    ) -> Sequence[Row]:
+        """Retrieve a page of records, like :meth:`get_multi`, but only the
+        given columns.
+
+        Only ``columns`` are selected, and rows are returned as is, without
+        building ORM instances nor adding them to the session.
+
+        Args:
+            db_session: The active async database session.
+            columns: Names of the model attributes to select.
+            *args: Optional SQLAlchemy column expressions for filtering.
+            page: 1-based page number (default: ``1``).
+            per_page: Maximum records per page (default: ``100``).
+            order_by: List of SQLAlchemy unary expressions defining sort order.
+                Defaults to ``[asc(model.id)]`` when the model has an ``id``
+                column.
+            after: Values of the ``order_by`` columns of the last row of the
+                previous page. Takes precedence over ``page``.
+            **kwargs: Optional keyword filters applied via ``filter_by``.
+
+        Returns:
+            A sequence of rows holding the values of ``columns``.
+        """
+        query = self._page_query(
+            select(*(getattr(self._model, column) for column in columns)),
+            *args,
+            page=page,
+            per_page=per_page,
+            order_by=order_by,
+            after=after,
+            **kwargs,
+        )
+
+        result = await db_session.execute(query)
+        return result.all()
+
+    def _page_query(
+        self,
+        query: Select,
+        *args,
+        page: int,
+        per_page: int,
+        order_by: list[UnaryExpression] | None,
+        after: Sequence[Any] | None,
+        **kwargs,
+    ) -> Select:
+        query = query.filter(*args).filter_by(**kwargs)
+
+        if order_by is None and hasattr(self._model, "id"):
+            order_by = [asc(self._model.id)]  # type: ignore[attr-defined]
+
+        if after is not None:
+            query = query.filter(keyset_filter(order_by or [], after))
+        else:
+            query = query.offset((page - 1) * per_page)
+
+        query = query.limit(per_page)
+
+        if order_by is not None:
+            query = query.order_by(*order_by)
+
+        return query
+
+    async def count(
+        self,
+        db_session: AsyncSession,
+        *args,
+        exact_threshold: int,
+        **kwargs,
+    ) -> TotalCount:
+        """Count the records matching the filters, exactly only when there
+        are few of them.
+
+        An exact ``COUNT(*)`` visits every matching row. The planner's
+        estimate of the number of matching rows, derived from the table
+        statistics, is computed first, without reading the table, and
+        returned instead when it exceeds ``exact_threshold``.
+
+        Args:
+            db_session: The active async database session.
+            *args: Optional SQLAlchemy column expressions for filtering.
+            exact_threshold: Largest estimate counted exactly.
+            **kwargs: Optional keyword filters applied via ``filter_by``.
+
+        Returns:
+            The count, and whether it is exact.
+        """
+        query = (
+            select(literal(1))
+            .select_from(self._model)
+            .filter(*args)
+            .filter_by(**kwargs)
+        )
+
+        plan = (await db_session.execute(Explain(query))).scalar_one()
+
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+
+        estimate = int(plan[0]["Plan"]["Plan Rows"])
+
+        if estimate > exact_threshold:
+            return TotalCount(value=estimate, exact=False)
+
+        count = await db_session.scalar(query.with_only_columns(func.count()))
+        return TotalCount(value=count or 0, exact=True)
+
+    async def stream_rows(
+        self,
+        db_session: AsyncSession,
+        columns: Sequence[str],
+        *args,
+        order_by: list[UnaryExpression] | None = None,
+        batch_size: int = 1000,
+        **kwargs,
+    ) -> AsyncIterator[Row]:
+        """Stream the given columns of every matching record.
+
+        Rows are read through a server-side cursor, ``batch_size`` at a time,
+        and no ORM instance is built: memory stays bounded whatever the
+        number of records. The cursor only advances as the caller consumes
+        rows, so a slow consumer slows the query down rather than buffering.
+
+        Args:
+            db_session: The active async database session.
+            columns: Names of the model attributes to select.
+            *args: Optional SQLAlchemy column expressions for filtering.
+            order_by: List of SQLAlchemy unary expressions defining sort order.
+                Defaults to ``[asc(model.id)]`` when the model has an ``id``
+                column.
+            batch_size: Number of rows fetched per round-trip.
+            **kwargs: Optional keyword filters applied via ``filter_by``.
+
+        Yields:
+            One row per record, with the values of ``columns``.
+        """
         query = (
-            select(self._model)
+            select(*(getattr(self._model, column) for column in columns))
             .filter(*args)
             .filter_by(**kwargs)
-            .offset((page - 1) * per_page)
-            .limit(per_page)
+            .execution_options(yield_per=batch_size)
         )
 
         if order_by is None and hasattr(self._model, "id"):
@@ -143,8 +419,13 @@ class CRUDBase[
         if order_by is not None:
             query = query.order_by(*order_by)
 
-        result = await db_session.execute(query)
-        return result.scalars().all()
+        result = await db_session.stream(query)
+
+        try:
+            async for row in result:
+                yield row
+        finally:
+            await result.close()
 
     async def update(
         self,
@@ -157,8 +438,8 @@ class CRUDBase[
     ) -> ModelType | None:
         """Update an existing model instance with the provided data.
 
-        If ``db_object`` is ``None``, the method attempts to fetch the record
-        using ``**kwargs`` before applying updates. Fields explicitly set to
+        If ``db_object`` is ``None``, the record matching ``**kwargs`` is
+        updated through :meth:`update_where` instead. Fields explicitly set to
         ``None`` in the update schema are skipped when ``exclude_none=True``
         (the default).
 
@@ -172,32 +453,90 @@ class CRUDBase[
             exclude_none: When ``True`` (default), ``None`` values in the
                 update payload are ignored and the existing column value is
                 preserved.
-            **kwargs: Filters forwarded to :meth:`get` when ``db_object`` is
-                ``None``.
+            **kwargs: Filters forwarded to :meth:`update_where` when
+                ``db_object`` is ``None``.
 
         Returns:
-            The updated and refreshed ORM instance, or ``None`` if the record
-            could not be found.
+            The updated ORM instance, or ``None`` if the record could not be
+            found.
         """
-        db_object = db_object or await self.get(db_session, **kwargs)
-
-        if db_object is not None:
-            data = (
-                update_schema
-                if isinstance(update_schema, dict)
-                else update_schema.model_dump(exclude_unset=True)
+        if db_object is None:
+            return await self.update_where(
+                db_session,
+                update_schema,
+                exclude_none=exclude_none,
+                **kwargs,
             )
 
-            if not data:
-                return db_object
+        data = (
+            update_schema
+            if isinstance(update_schema, dict)
+            else update_schema.model_dump(exclude_unset=True)
+        )
+
+        if not data:
+            return db_object
 
-            for attribute, value in data.items():
-                if exclude_none and value is None:
-                    continue
-                setattr(db_object, attribute, value)
+        for attribute, value in data.items():
+            if exclude_none and value is None:
+                continue
+            setattr(db_object, attribute, value)
+
+        await db_session.commit()
 
+        return db_object
+
+    async def update_where(
+        self,
+        db_session: AsyncSession,
+        update_schema: UpdateSchemaType | dict[str, Any],
+        *args,
+        exclude_none: bool = True,
+        **kwargs,
+    ) -> ModelType | None:
+        """Update the record matching the given filters in one statement.
+
+        Runs a single ``UPDATE ... WHERE ... RETURNING``, without loading the
+        record first. The filters must match at most one record, e.g. by
+        including its primary key.
+
+        Args:
+            db_session: The active async database session.
+            update_schema: New field values as a Pydantic model or dict.
+                Only fields present in ``model_dump(exclude_unset=True)`` are
+                applied.
+            *args: Optional SQLAlchemy column expressions for filtering.
+            exclude_none: When ``True`` (default), ``None`` values in the
+                update payload are ignored.
+            **kwargs: Optional keyword filters applied via ``filter_by``.
+
+        Returns:
+            The updated ORM instance, or ``None`` if no record matched.
+        """
+        data = (
+            update_schema
+            if isinstance(update_schema, dict)
+            else update_schema.model_dump(exclude_unset=True)
+        )
+
+        if exclude_none:
+            data = {
+                key: value for key, value in data.items() if value is not None
+            }
+
+        if not data:
+            return await self.get(db_session, *args, **kwargs)
+
+        db_object = await db_session.scalar(
+            sqlalchemy_update(self._model)
+            .filter(*args)
+            .filter_by(**kwargs)
+            .values(**data)
+            .returning(self._model)
+        )
+
+        if db_object is not None:
             await db_session.commit()
-            await db_session.refresh(db_object)
 
         return db_object
 
@@ -209,25 +548,57 @@ class CRUDBase[
     ) -> ModelType | None:
         """Permanently delete a model instance from the database.
 
-        If ``db_object`` is ``None``, the method looks up the record via
-        ``**kwargs`` before deleting. No error is raised when the record does
-        not exist.
+        If ``db_object`` is ``None``, the record matching ``**kwargs`` is
+        deleted through :meth:`delete_where`. No error is raised when the
+        record does not exist.
 
         Args:
             db_session: The active async database session.
             db_object: The ORM instance to delete, or ``None`` to trigger a
                 lookup via ``**kwargs``.
-            **kwargs: Filters forwarded to :meth:`get` when ``db_object`` is
-                ``None``.
+            **kwargs: Filters forwarded to :meth:`delete_where` when
+                ``db_object`` is ``None``.
 
         Returns:
             The deleted ORM instance, or ``None`` if no matching record was
             found.
         """
-        db_object = db_object or await self.get(db_session, **kwargs)
+        if db_object is None:
+            return await self.delete_where(db_session, **kwargs)
+
+        await db_session.delete(db_object)
+        await db_session.commit()
+
+        return db_object
+
+    async def delete_where(
+        self,
+        db_session: AsyncSession,
+        *args,
+        **kwargs,
+    ) -> ModelType | None:
+        """Delete the record matching the given filters in one statement.
 
-        if db_object:
-            await db_session.delete(db_object)
+        Runs a single ``DELETE ... WHERE ... RETURNING``, without loading the
+        record first. The filters must match at most one record, e.g. by
+        including its primary key.
+
+        Args:
+            db_session: The active async database session.
+            *args: Optional SQLAlchemy column expressions for filtering.
+            **kwargs: Optional keyword filters applied via ``filter_by``.
+
+        Returns:
+            The deleted ORM instance, or ``None`` if no record matched.
+        """
+        db_object = await db_session.scalar(
+            delete(self._model)
+            .filter(*args)
+            .filter_by(**kwargs)
+            .returning(self._model)
+        )
+
+        if db_object is not None:
             await db_session.commit()
 
         return db_object
@@ -236,81 +607,178 @@ class CRUDBase[
         self,
         db_session: AsyncSession,
         create_schemas: Sequence[CreateSchemaType | dict[str, Any]],
-        refresh: bool = False,
     ) -> Sequence[ModelType]:
         """Create multiple model instances in a single transaction.
 
-        All objects are added and committed together. Optionally refreshes
-        each instance from the database after the commit.
+        All rows are sent by one multi-row ``INSERT ... RETURNING``, which
+        SQLAlchemy splits into batches of ``insertmanyvalues_page_size``
+        rows on large inputs. Rows with the same set of keys are inserted
+        together, so schemas should set the same fields.
 
         Args:
             db_session: The active async database session.
             create_schemas: An iterable of Pydantic models or dicts describing
                 the records to create.
-            refresh: When ``True``, each created instance is refreshed from
-                the database after the commit. Defaults to ``False``.
 
         Returns:
-            A sequence of the newly created ORM instances.
+            A sequence of the newly created ORM instances, in the order of
+            ``create_schemas``.
         """
-        db_objects = []
-
-        for create_schema in create_schemas:
-            data = (
-                create_schema
-                if isinstance(create_schema, dict)
-                else create_schema.model_dump(exclude_unset=True)
-            )
-            db_objects.append(self._model(**data))
+        if not create_schemas:
+            return []
 
-        db_session.add_all(db_objects)
+        data_list = [
+            create_schema
+            if isinstance(create_schema, dict)
+            else create_schema.model_dump(exclude_unset=True)
+            for create_schema in create_schemas
+        ]
+
+        result = await db_session.scalars(
+            insert(self._model).returning(
+                self._model,
+                sort_by_parameter_order=True,
+            ),
+            data_list,
+        )
+        db_objects = result.all()
         await db_session.commit()
 
-        if refresh:
-            for db_object in db_objects:
-                await db_session.refresh(db_object)
-
         return db_objects
 
-    async def bulk_update(
+    async def copy_records(
         self,
         db_session: AsyncSession,
-        updates: Sequence[tuple[ModelType, UpdateSchemaType | dict[str, Any]]],
-        refresh: bool = False,
+        columns: Sequence[str],
+        records: Iterable[Sequence[Any]],
+        table_name: str | None = None,
     ) -> None:
-        """Update multiple model instances in a single bulk statement.
+        """Load records into the model's table with PostgreSQL ``COPY``.
+
+        The records are streamed by the asyncpg driver in the binary
+        ``COPY`` format, on the session's connection and transaction: no
+        ORM instance is built, and nothing is committed.
+
+        Args:
+            db_session: The active async database session.
+            columns: Names of the columns, in the order of the record values.
+            records: Rows of column values.
+            table_name: Name of the table to load instead of the model's,
+                e.g. a temporary staging table.
+        """
+        connection = await db_session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            table_name or self._model.__tablename__,
+            records=records,
+            columns=list(columns),
+        )
+
+    async def bulk_update(
+        self,
+        db_session: AsyncSession,
+        updates: Sequence[tuple[Any, UpdateSchemaType | dict[str, Any]]],
+        *args,
+        exclude_none: bool = True,
+        **kwargs,
+    ) -> list[Any]:
+        """Update multiple records, keyed by primary key, in one transaction.
 
-        Builds a list of update payloads keyed by each object's ``uid``
-        attribute and executes a single SQLAlchemy bulk UPDATE. Optionally
-        refreshes each instance after the commit.
+        The records matching both an ``id`` of ``updates`` and the filters
+        are locked and their ids collected by a single ``SELECT ... FOR
+        UPDATE``. They are then updated by an executemany ``UPDATE ... WHERE
+        id = :id``, which repeats the filters, so that records outside of
+        them are never touched.
 
         Args:
             db_session: The active async database session.
-            updates: A sequence of ``(db_object, update_schema)`` tuples.
-                Each update schema or dict must resolve to a non-empty payload
-                to be included in the bulk statement.
-            refresh: When ``True``, each instance is refreshed from the
-                database after the commit. Defaults to ``False``.
-
-        Note:
-            Each model instance **must** expose a ``uid`` attribute, which is
-            used as the WHERE key in the bulk UPDATE statement.
+            updates: A sequence of ``(id, update_schema)`` tuples. The ids
+                must be unique.
+            *args: Optional SQLAlchemy column expressions for filtering.
+            exclude_none: When ``True`` (default), ``None`` values in the
+                update payloads are ignored.
+            **kwargs: Optional keyword filters applied via ``filter_by``.
+
+        Returns:
+            The ids of ``updates`` matching the filters, in their original
+            order. Other ids were not found, and left untouched.
         """
+        ids = [id for id, _ in updates]
+        found = set(
+            await db_session.scalars(
+                select(self._model.id)  # type: ignore[attr-defined]
+                .filter(equals_any(self._model.id, ids))  # type: ignore[attr-defined]
+                .filter(*args)
+                .filter_by(**kwargs)
+                .with_for_update()
+            )
+        )
+
         data_list = []
 
-        for db_object, update_schema in updates:
+        for id, update_schema in updates:
             data = (
                 update_schema
                 if isinstance(update_schema, dict)
                 else update_schema.model_dump(exclude_unset=True)
             )
-            if data:
-                data["uid"] = db_object.uid  # type: ignore[attr-defined]
-                data_list.append(data)
 
-        await db_session.execute(sqlalchemy_update(self._model), data_list)
+            if exclude_none:
+                data = {
+                    key: value
+                    for key, value in data.items()
+                    if value is not None
+                }
+
+            if id in found and data:
+                data_list.append({**data, "id": id})
+
+        if data_list:
+            # ORM bulk UPDATE by primary key: rows are grouped by the set of
+            # columns they change, and each group runs as one executemany.
+            await db_session.execute(
+                sqlalchemy_update(self._model)
+                .filter(*args)
+                .filter_by(**kwargs)
+                .execution_options(synchronize_session=None),
+                data_list,
+            )
+
+        await db_session.commit()
+
+        return [id for id in ids if id in found]
+
+    async def bulk_delete(
+        self,
+        db_session: AsyncSession,
+        ids: Sequence[Any],
+        *args,
+        **kwargs,
+    ) -> list[Any]:
+        """Delete multiple records by primary key in a single statement.
+
+        Runs ``DELETE ... WHERE id = ANY(:ids) ... RETURNING id``, binding the
+        ids as one array parameter whatever their number.
+
+        Args:
+            db_session: The active async database session.
+            ids: Primary keys of the records to delete.
+            *args: Optional SQLAlchemy column expressions for filtering.
+            **kwargs: Optional keyword filters applied via ``filter_by``.
+
+        Returns:
+            The ids of the deleted records, in the order of ``ids``. Other
+            ids were not found.
+        """
+        deleted = set(
+            await db_session.scalars(
+                delete(self._model)
+                .filter(equals_any(self._model.id, ids))  # type: ignore[attr-defined]
+                .filter(*args)
+                .filter_by(**kwargs)
+                .returning(self._model.id)  # type: ignore[attr-defined]
+            )
+        )
         await db_session.commit()
 
-        if refresh:
-            for db_object, _ in updates:
-                await db_session.refresh(db_object)
+        return [id for id in ids if id in deleted]
@@ -1,10 +1,89 @@
+from collections.abc import AsyncIterable, AsyncIterator, Sequence
+from contextlib import asynccontextmanager
+from typing import Any, Never
+
 from fastapi import HTTPException, status
+from sqlalchemy import (
+    Column,
+    MetaData,
+    Row,
+    String,
+    Table,
+    asc,
+    desc,
+    func,
+    insert,
+    literal,
+    select,
+)
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.clients import Client
-from app.models.items import Item
-from app.schemas.items import ItemCreate, ItemCreatePrivate, ItemUpdate
-from app.services.crud import CRUDBase
+from app.core.config import settings
+from app.core.consts import BulkOutcome, DataFormat, FilterOperator
+from app.core.exports import encode_rows
+from app.core.filters import RANGE_OPERATORS, FilterField, ListSpec, SortOption
+from app.core.imports import parse_rows
+from app.models.clients import ITEM_QUOTA_CONSTRAINT, Client
+from app.models.items import SEARCH_CONFIG, Item
+from app.schemas.items import (
+    ItemBulkResult,
+    ItemBulkUpdate,
+    ItemCreate,
+    ItemCreatePrivate,
+    ItemImportError,
+    ItemImportReport,
+    ItemUpdate,
+)
+from app.services.crud import CRUDBase, TotalCount, violated_constraint
+
+# Titles are filtered and sorted in byte order, as indexed by
+# ``ix_items_owner_id_title_id``.
+_title = Item.title.collate("C")
+
+# Imported rows are copied to this temporary table as they arrive, and only
+# moved to ``items`` at the end of the import: the triggers counting items
+# then lock the owner's ``clients`` row until the commit that follows,
+# rather than for the whole upload. Not part of the models' metadata, so
+# that migrations ignore it.
+_items_import = Table(
+    "items_import",
+    MetaData(),
+    Column("title", String, nullable=False),
+    Column("description", String, nullable=False),
+    prefixes=["TEMPORARY"],
+)
+
+# Filters and orderings of the item listing, which is always scoped to an
+# owner: all of them are served by an index starting with ``owner_id``.
+ITEM_LIST_SPEC = ListSpec(
+    filters={
+        "id": FilterField(
+            Item.id,
+            int,
+            frozenset({FilterOperator.EQ, FilterOperator.IN, *RANGE_OPERATORS}),
+        ),
+        "title": FilterField(
+            _title,
+            str,
+            frozenset(
+                {FilterOperator.EQ, FilterOperator.IN, FilterOperator.PREFIX}
+            ),
+        ),
+    },
+    sorts={
+        "id": SortOption((asc(Item.id),), (("id", int),)),
+        "-id": SortOption((desc(Item.id),), (("id", int),)),
+        "title": SortOption(
+            (asc(_title), asc(Item.id)),
+            (("title", str), ("id", int)),
+        ),
+        "-title": SortOption(
+            (desc(_title), desc(Item.id)),
+            (("title", str), ("id", int)),
+        ),
+    },
+)
 
 
 class ItemService(CRUDBase[Item, ItemCreatePrivate, ItemUpdate]):
@@ -15,10 +94,45 @@ class ItemService(CRUDBase[Item, ItemCreatePrivate, ItemUpdate]):
     semantics.
     """
 
+    def raise_not_found(self) -> Never:
+        """Raise an HTTP 404 Not Found exception for a missing item.
+
+        Items owned by other clients are reported as missing too, so that
+        their existence is not disclosed.
+        """
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Item not found",
+        )
+
+    @asynccontextmanager
+    async def enforce_quota(
+        self,
+        db_session: AsyncSession,
+    ) -> AsyncIterator[None]:
+        """Report item creations exceeding the owner's ``item_quota``.
+
+        The quota is checked by the database, atomically, when the triggers
+        counting items update the owner's ``item_count``: a check
+        constraint violation in the block is rolled back and turned into a
+        ``409 Conflict``.
+        """
+        try:
+            yield
+        except IntegrityError as err:
+            if violated_constraint(err) != ITEM_QUOTA_CONSTRAINT:
+                raise
+
+            await db_session.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Item quota exceeded",
+            ) from None
+
     async def new(
         self,
         db_session: AsyncSession,
-        client: Client,
+        owner_id: int,
         create_schema: ItemCreate,
     ) -> Item:
         """Create a new item owned by the authenticated client.
@@ -28,37 +142,71 @@ class ItemService(CRUDBase[Item, ItemCreatePrivate, ItemUpdate]):
 
         Args:
             db_session: The active async database session.
-            client: The authenticated :class:`~app.models.clients.Client`
-                whose ``id`` will be set as the item's ``owner_id``.
+            owner_id: The ``id`` of the authenticated client, set as the
+                item's ``owner_id``.
             create_schema: Public-facing creation payload containing the item
                 ``title`` and ``description``.
 
         Returns:
             The newly created :class:`~app.models.items.Item` ORM instance.
+
+        Raises:
+            HTTPException: ``409 Conflict`` if the owner's item quota is
+                reached.
         """
-        return await self.create(
-            db_session,
-            ItemCreatePrivate(
-                **create_schema.model_dump(),
-                owner_id=client.id,
-            ),
-        )
+        async with self.enforce_quota(db_session):
+            return await self.create(
+                db_session,
+                ItemCreatePrivate(
+                    **create_schema.model_dump(),
+                    owner_id=owner_id,
+                ),
+            )
+
+    async def new_many(
+        self,
+        db_session: AsyncSession,
+        owner_id: int,
+        create_schemas: Sequence[ItemCreate],
+    ) -> Sequence[Item]:
+        """Create several items owned by the authenticated client at once.
+
+        Args:
+            db_session: The active async database session.
+            owner_id: The ``id`` of the authenticated client, set as the
+                items' ``owner_id``.
+            create_schemas: Public-facing creation payloads.
+
+        Returns:
+            The newly created :class:`~app.models.items.Item` ORM instances,
+            in the order of ``create_schemas``.
+
+        Raises:
+            HTTPException: ``409 Conflict`` if the items would exceed the
+                owner's item quota, in which case none is created.
+        """
+        async with self.enforce_quota(db_session):
+            return await self.bulk_create(
+                db_session,
+                [
+                    {**create_schema.model_dump(), "owner_id": owner_id}
+                    for create_schema in create_schemas
+                ],
+            )
 
-    async def update_check(
+    async def update_owned(
         self,
         db_session: AsyncSession,
-        item: Item,
+        id: int,
+        owner_id: int,
         update_schema: ItemUpdate,
     ) -> Item:
-        """Update an item and raise an error if the operation fails.
-
-        Wraps :meth:`~app.services.crud.CRUDBase.update` with an explicit
-        ``None``-check so that callers always receive a valid instance or a
-        clear HTTP error rather than having to handle ``None`` themselves.
+        """Update an item of the given owner in a single statement.
 
         Args:
             db_session: The active async database session.
-            item: The :class:`~app.models.items.Item` ORM instance to update.
+            id: The ``id`` of the item to update.
+            owner_id: The ``id`` of the authenticated client.
             update_schema: Update payload; at least one field must be set
                 (enforced by :class:`~app.schemas.base.NonEmptyModel`).
 
@@ -66,22 +214,325 @@ class ItemService(CRUDBase[Item, ItemCreatePrivate, ItemUpdate]):
             The updated :class:`~app.models.items.Item` ORM instance.
 
         Raises:
-            HTTPException: ``500 Internal Server Error`` if the underlying
-                update returns ``None``.
+            HTTPException: ``404 Not Found`` if the client owns no item with
+                this ``id``.
         """
-        updated_item = await self.update(
+        item = await self.update_where(
             db_session,
-            db_object=item,
-            update_schema=update_schema,
+            update_schema,
+            id=id,
+            owner_id=owner_id,
         )
 
-        if updated_item is None:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to update item.",
+        if item is None:
+            self.raise_not_found()
+
+        return item
+
+    async def delete_owned(
+        self,
+        db_session: AsyncSession,
+        id: int,
+        owner_id: int,
+    ) -> None:
+        """Delete an item of the given owner in a single statement.
+
+        Args:
+            db_session: The active async database session.
+            id: The ``id`` of the item to delete.
+            owner_id: The ``id`` of the authenticated client.
+
+        Raises:
+            HTTPException: ``404 Not Found`` if the client owns no item with
+                this ``id``.
+        """
+        if await self.delete_where(db_session, id=id, owner_id=owner_id) is None:
+            self.raise_not_found()
+
+    async def update_many(
+        self,
+        db_session: AsyncSession,
+        owner_id: int,
+        update_schemas: Sequence[ItemBulkUpdate],
+    ) -> list[ItemBulkResult]:
+        """Update several items of the given owner in one transaction.
+
+        Args:
+            db_session: The active async database session.
+            owner_id: The ``id`` of the authenticated client.
+            update_schemas: Update payloads, each identifying its item by
+                ``id``.
+
+        Returns:
+            The outcome of every item, in the order of ``update_schemas``.
+        """
+        updated = set(
+            await self.bulk_update(
+                db_session,
+                [
+                    (update_schema.id, update_schema.model_dump(exclude={"id"}))
+                    for update_schema in update_schemas
+                ],
+                owner_id=owner_id,
+            )
+        )
+
+        return [
+            ItemBulkResult(
+                id=update_schema.id,
+                outcome=(
+                    BulkOutcome.UPDATED
+                    if update_schema.id in updated
+                    else BulkOutcome.NOT_FOUND
+                ),
             )
+            for update_schema in update_schemas
+        ]
+
+    async def delete_many(
+        self,
+        db_session: AsyncSession,
+        owner_id: int,
+        ids: Sequence[int],
+    ) -> list[ItemBulkResult]:
+        """Delete several items of the given owner in a single statement.
+
+        Args:
+            db_session: The active async database session.
+            owner_id: The ``id`` of the authenticated client.
+            ids: The ``id`` of the items to delete.
 
-        return updated_item
+        Returns:
+            The outcome of every item, in the order of ``ids``.
+        """
+        deleted = set(await self.bulk_delete(db_session, ids, owner_id=owner_id))
+
+        return [
+            ItemBulkResult(
+                id=id,
+                outcome=(
+                    BulkOutcome.DELETED
+                    if id in deleted
+                    else BulkOutcome.NOT_FOUND
+                ),
+            )
+            for id in ids
+        ]
+
+    async def import_stream(
+        self,
+        db_session: AsyncSession,
+        owner_id: int,
+        chunks: AsyncIterable[bytes],
+        import_format: DataFormat,
+    ) -> ItemImportReport:
+        """Import items owned by the given client from an NDJSON or CSV
+        stream.
+
+        Rows are validated with :class:`~app.schemas.items.ItemCreate` as
+        they arrive, and valid ones are loaded with ``COPY`` by batches of
+        at most ``ITEMS_IMPORT_BATCH_SIZE`` rows or
+        ``ITEMS_IMPORT_BATCH_BYTES`` of text, so memory stays bounded by
+        about ``ITEMS_IMPORT_BATCH_BYTES`` plus ``ITEMS_IMPORT_MAX_LINE_BYTES``
+        whatever the stream length. Invalid lines are skipped and reported.
+
+        Valid rows are staged in a temporary table, and inserted into
+        ``items`` and committed together at the end of the stream: the
+        import is atomic, and the owner's ``clients`` row, locked by the
+        insertion, is only held for that final statement. The transaction
+        itself stays open for the whole upload.
+
+        Args:
+            db_session: The active async database session.
+            owner_id: The ``id`` of the client owning the imported items.
+            chunks: The raw stream.
+            import_format: Format of the stream.
+
+        Returns:
+            The :class:`~app.schemas.items.ItemImportReport` of the import.
+
+        Raises:
+            HTTPException: ``409 Conflict`` if the valid rows would exceed
+                the owner's item quota, in which case none is imported.
+        """
+        columns = ("title", "description")
+        batch: list[tuple[str, str]] = []
+        batch_bytes = imported = rejected = 0
+        errors: list[ItemImportError] = []
+
+        connection = await db_session.connection()
+        await connection.run_sync(_items_import.create)
+
+        async with self.enforce_quota(db_session):
+            async for result in parse_rows(
+                chunks,
+                import_format,
+                ItemCreate,
+                settings.ITEMS_IMPORT_MAX_LINE_BYTES,
+            ):
+                if result.row is None:
+                    rejected += 1
+
+                    if len(errors) < settings.ITEMS_IMPORT_MAX_ERRORS:
+                        errors.append(
+                            ItemImportError(
+                                line=result.line,
+                                errors=list(result.errors),
+                            )
+                        )
+                    continue
+
+                title, description = result.row.title, result.row.description
+                batch.append((title, description))
+                # The text length, in characters, approximates the batch size.
+                batch_bytes += len(title) + len(description)
+
+                if (
+                    len(batch) >= settings.ITEMS_IMPORT_BATCH_SIZE
+                    or batch_bytes >= settings.ITEMS_IMPORT_BATCH_BYTES
+                ):
+                    await self.copy_records(
+                        db_session,
+                        columns,
+                        batch,
+                        table_name=_items_import.name,
+                    )
+                    imported += len(batch)
+                    batch.clear()
+                    batch_bytes = 0
+
+            if batch:
+                await self.copy_records(
+                    db_session,
+                    columns,
+                    batch,
+                    table_name=_items_import.name,
+                )
+                imported += len(batch)
+
+            # A sequential scan of the freshly loaded table returns the rows
+            # in the order they were copied, so ids follow the lines.
+            await db_session.execute(
+                insert(Item).from_select(
+                    [*columns, "owner_id"],
+                    select(*_items_import.c, literal(owner_id)),
+                )
+            )
+            await connection.run_sync(_items_import.drop)
+            await db_session.commit()
+
+        return ItemImportReport(
+            imported=imported,
+            rejected=rejected,
+            errors=errors,
+        )
+
+    def export(
+        self,
+        db_session: AsyncSession,
+        owner_id: int,
+        data_format: DataFormat,
+    ) -> AsyncIterator[bytes]:
+        """Stream every item of the given owner, ordered by ``id``.
+
+        Args:
+            db_session: The active async database session, which must stay
+                open until the stream is consumed.
+            owner_id: The ``id`` of the authenticated client.
+            data_format: Output format.
+
+        Returns:
+            The encoded export, by chunks of ``EXPORT_BATCH_SIZE`` items.
+        """
+        columns = ("id", "title", "description")
+
+        return encode_rows(
+            self.stream_rows(
+                db_session,
+                columns,
+                batch_size=settings.EXPORT_BATCH_SIZE,
+                owner_id=owner_id,
+            ),
+            columns,
+            data_format,
+            settings.EXPORT_BATCH_SIZE,
+        )
+
+    async def count_owned(
+        self,
+        db_session: AsyncSession,
+        owner_id: int,
+        filters: Sequence[Any] = (),
+    ) -> TotalCount:
+        """Count the items of the given owner matching ``filters``.
+
+        Without filters, the owner's ``item_count`` counter is read, which
+        costs the same whatever the number of items. Otherwise, see
+        :meth:`~app.services.crud.CRUDBase.count`.
+
+        Args:
+            db_session: The active async database session.
+            owner_id: The ``id`` of the authenticated client.
+            filters: SQLAlchemy filter expressions.
+        """
+        if not filters:
+            count = await db_session.scalar(
+                select(Client.item_count).filter_by(id=owner_id)
+            )
+            return TotalCount(value=count or 0, exact=True)
+
+        return await self.count(
+            db_session,
+            *filters,
+            exact_threshold=settings.COUNT_EXACT_THRESHOLD,
+            owner_id=owner_id,
+        )
+
+    async def search(
+        self,
+        db_session: AsyncSession,
+        owner_id: int,
+        text: str,
+        page: int = 1,
+        per_page: int = 100,
+        after: Sequence[Any] | None = None,
+    ) -> Sequence[Row]:
+        """Full-text search among the items of the given owner.
+
+        ``text`` follows the web search syntax of PostgreSQL's
+        ``websearch_to_tsquery``: quoted phrases, ``or`` and ``-`` exclusion
+        are supported. Matching is served by the GIN index on
+        ``Item.search_vector``, and results are ranked by relevance, title
+        matches first, then by descending ``id``.
+
+        Args:
+            db_session: The active async database session.
+            owner_id: The ``id`` of the authenticated client.
+            text: The search terms.
+            page: 1-based page number (default: ``1``).
+            per_page: Maximum results per page (default: ``100``).
+            after: ``(rank, id)`` of the last result of the previous page.
+                Takes precedence over ``page``.
+
+        Returns:
+            Rows holding the ``id``, ``title``, ``description`` and ``rank``
+            of the matching items.
+        """
+        query = func.websearch_to_tsquery(SEARCH_CONFIG, text)
+        rank = func.ts_rank_cd(Item.search_vector, query).label("rank")
+
+        result = await db_session.execute(
+            self._page_query(
+                select(Item.id, Item.title, Item.description, rank),
+                Item.search_vector.bool_op("@@")(query),
+                page=page,
+                per_page=per_page,
+                order_by=[desc(rank), desc(Item.id)],
+                after=after,
+                owner_id=owner_id,
+            )
+        )
+        return result.all()
 
 
 service_item = ItemService(Item)
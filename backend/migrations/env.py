@@ -32,6 +32,17 @@ url = get_database_url(drivername=DatabaseDriver.PSYCOPG).render_as_string(
 )
 
 
+def include_object(object_, _name, type_, reflected, compare_to) -> bool:
+    """Leave out of autogenerate the indexes flagged with
+    ``info={"skip_autogenerate": True}``, which Alembic cannot compare, e.g.
+    because their collation is not reflected."""
+    if type_ != "index":
+        return True
+
+    index = compare_to if reflected else object_
+    return index is None or not index.info.get("skip_autogenerate", False)
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -49,6 +60,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -68,6 +80,7 @@ def run_migrations_online() -> None:
         context.configure(
             connection=connection,
             target_metadata=target_metadata,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,36 @@
+"""Add clients credentials_version
+
+Revision ID: 2955cc694d24
+Revises: cc3d71af4681
+Create Date: 2026-10-18 12:40:11.402817
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "2955cc694d24"
+down_revision: str | Sequence[str] | None = "cc3d71af4681"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "clients",
+        sa.Column(
+            "credentials_version",
+            sa.Integer(),
+            server_default="1",
+            nullable=False,
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("clients", "credentials_version")
@@ -0,0 +1,36 @@
+"""Add clients hash_profile
+
+Revision ID: d41c8a7e2b69
+Revises: 7b1e4f0c9a52
+Create Date: 2026-10-18 13:55:27.904113
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d41c8a7e2b69"
+down_revision: str | Sequence[str] | None = "7b1e4f0c9a52"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "clients",
+        sa.Column(
+            "hash_profile",
+            sa.String(),
+            server_default="default",
+            nullable=False,
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("clients", "hash_profile")
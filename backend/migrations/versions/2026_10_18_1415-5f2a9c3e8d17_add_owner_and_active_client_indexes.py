@@ -0,0 +1,54 @@
+"""Add owner and active client indexes
+
+Revision ID: 5f2a9c3e8d17
+Revises: d41c8a7e2b69
+Create Date: 2026-10-18 14:15:08.412637
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5f2a9c3e8d17"
+down_revision: str | Sequence[str] | None = "d41c8a7e2b69"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY does not block writes, but cannot run in a
+    # transaction. A failed build leaves an invalid index behind, which
+    # must be dropped before running the migration again.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_items_owner_id_id",
+            "items",
+            ["owner_id", "id"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_clients_active_id",
+            "clients",
+            ["id"],
+            postgresql_where=sa.text("deleted_at IS NULL"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_clients_active_id",
+            table_name="clients",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_items_owner_id_id",
+            table_name="items",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,59 @@
+"""Add items search_vector
+
+Revision ID: 8c3e5b1d7a40
+Revises: 5f2a9c3e8d17
+Create Date: 2026-10-18 15:20:41.227093
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "8c3e5b1d7a40"
+down_revision: str | Sequence[str] | None = "5f2a9c3e8d17"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Adding a stored generated column rewrites the table, under an
+    # exclusive lock: schedule this migration accordingly on large tables.
+    op.add_column(
+        "items",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('english', title), 'A') || "
+                "setweight(to_tsvector('english', description), 'B')",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_items_search_vector",
+            "items",
+            ["search_vector"],
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_items_search_vector",
+            table_name="items",
+            postgresql_concurrently=True,
+        )
+
+    op.drop_column("items", "search_vector")
@@ -0,0 +1,39 @@
+"""Add items title index
+
+Revision ID: e4a7d2c9b815
+Revises: 8c3e5b1d7a40
+Create Date: 2026-10-18 16:10:12.504318
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e4a7d2c9b815"
+down_revision: str | Sequence[str] | None = "8c3e5b1d7a40"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_items_owner_id_title_id",
+            "items",
+            ["owner_id", sa.text('title COLLATE "C"'), "id"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_items_owner_id_title_id",
+            table_name="items",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,129 @@
+"""Add clients item_count and item_quota
+
+Revision ID: a9f3c6e1d284
+Revises: e4a7d2c9b815
+Create Date: 2026-10-18 17:05:36.918204
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a9f3c6e1d284"
+down_revision: str | Sequence[str] | None = "e4a7d2c9b815"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Statement-level triggers, with transition tables, apply one UPDATE per
+# owner for a whole multi-row INSERT, COPY or DELETE. Owners never change,
+# and items are never truncated, so UPDATE and TRUNCATE are not tracked.
+CREATE_COUNT_TRIGGERS = [
+    """
+    CREATE FUNCTION items_count_insert() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        UPDATE clients
+        SET item_count = clients.item_count + delta.count
+        FROM (
+            SELECT owner_id, count(*) AS count
+            FROM new_items
+            GROUP BY owner_id
+        ) AS delta
+        WHERE clients.id = delta.owner_id;
+        RETURN NULL;
+    END
+    $$
+    """,
+    """
+    CREATE TRIGGER items_count_insert
+    AFTER INSERT ON items
+    REFERENCING NEW TABLE AS new_items
+    FOR EACH STATEMENT EXECUTE FUNCTION items_count_insert()
+    """,
+    """
+    CREATE FUNCTION items_count_delete() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        UPDATE clients
+        SET item_count = clients.item_count - delta.count
+        FROM (
+            SELECT owner_id, count(*) AS count
+            FROM old_items
+            GROUP BY owner_id
+        ) AS delta
+        WHERE clients.id = delta.owner_id;
+        RETURN NULL;
+    END
+    $$
+    """,
+    """
+    CREATE TRIGGER items_count_delete
+    AFTER DELETE ON items
+    REFERENCING OLD TABLE AS old_items
+    FOR EACH STATEMENT EXECUTE FUNCTION items_count_delete()
+    """,
+]
+
+DROP_COUNT_TRIGGERS = [
+    "DROP TRIGGER items_count_delete ON items",
+    "DROP FUNCTION items_count_delete()",
+    "DROP TRIGGER items_count_insert ON items",
+    "DROP FUNCTION items_count_insert()",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "clients",
+        sa.Column(
+            "item_count",
+            sa.BigInteger(),
+            server_default="0",
+            nullable=False,
+        ),
+    )
+    op.add_column(
+        "clients",
+        sa.Column("item_quota", sa.BigInteger(), nullable=True),
+    )
+
+    for statement in CREATE_COUNT_TRIGGERS:
+        op.execute(statement)
+
+    # Items written from now on are counted by the triggers, and the lock
+    # taken by the triggers' creation blocks writes until the commit.
+    op.execute(
+        """
+        UPDATE clients
+        SET item_count = counts.count
+        FROM (
+            SELECT owner_id, count(*) AS count FROM items GROUP BY owner_id
+        ) AS counts
+        WHERE clients.id = counts.owner_id
+        """
+    )
+
+    op.create_check_constraint(
+        op.f("ck_clients_item_quota"),
+        "clients",
+        "item_quota IS NULL OR item_count <= item_quota",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint(
+        op.f("ck_clients_item_quota"),
+        "clients",
+        type_="check",
+    )
+
+    for statement in DROP_COUNT_TRIGGERS:
+        op.execute(statement)
+
+    op.drop_column("clients", "item_quota")
+    op.drop_column("clients", "item_count")
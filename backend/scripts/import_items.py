@@ -0,0 +1,101 @@
+"""Import items from an NDJSON or CSV file, with the same validation and
+``COPY`` loading as ``POST /api/v1/items/import``.
+
+Run inside the API container (or any environment with the app settings):
+
+    python3 /src/scripts/import_items.py --client-id <client_id> items.ndjson
+    python3 /src/scripts/import_items.py --client-id <client_id> items.csv
+    cat items.csv | python3 /src/scripts/import_items.py \\
+        --client-id <client_id> --format csv -
+
+Prints the import report as JSON, and exits with status 1 when lines were
+rejected.
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import BinaryIO
+
+from app.core.consts import DataFormat
+from app.core.database import SessionManager
+from app.core.logging_config import setup_logging
+from app.services.clients import service_client
+from app.services.items import service_item
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+
+
+async def read_chunks(file: BinaryIO) -> AsyncIterator[bytes]:
+    """Read ``file`` by chunks, off the event loop."""
+    while chunk := await asyncio.to_thread(file.read, CHUNK_SIZE):
+        yield chunk
+
+
+async def import_items(
+    client_id: str,
+    file: BinaryIO,
+    import_format: DataFormat,
+) -> int:
+    async with SessionManager() as db_session:
+        client = await service_client.get(db_session, oauth_id=client_id)
+
+        if client is None or not client.is_active:
+            logger.error(f"No active client with client_id {client_id!r}")
+            return 2
+
+        report = await service_item.import_stream(
+            db_session,
+            client.id,
+            read_chunks(file),
+            import_format,
+        )
+
+    print(report.model_dump_json(indent=2))
+    logger.info(
+        f"Imported {report.imported} items, rejected {report.rejected} lines"
+    )
+    return 1 if report.rejected else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--client-id",
+        required=True,
+        help="client_id of the client owning the imported items",
+    )
+    parser.add_argument(
+        "--format",
+        choices=list(DataFormat),
+        help="format of the file (default: from its extension)",
+    )
+    parser.add_argument("file", help="path of the file, or - for stdin")
+    args = parser.parse_args()
+
+    if args.format is not None:
+        import_format = DataFormat(args.format)
+    elif args.file.endswith(".csv"):
+        import_format = DataFormat.CSV
+    elif args.file.endswith((".ndjson", ".jsonl")):
+        import_format = DataFormat.NDJSON
+    else:
+        parser.error("cannot infer the format from the file name: use --format")
+
+    if args.file == "-":
+        return asyncio.run(
+            import_items(args.client_id, sys.stdin.buffer, import_format)
+        )
+
+    with Path(args.file).open("rb") as file:
+        return asyncio.run(import_items(args.client_id, file, import_format))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,44 @@
+import asyncio
+import base64
+import json
+from datetime import timedelta
+from unittest.mock import patch
+
 import jwt
 import pytest
 from app.core.config import settings
+from app.core.database import engine
+from app.core.deps import token_address_rate_limiter, token_client_rate_limiter
+from app.core.rate_limit import DatabaseRateLimiter
+from app.core.security import (
+    JWTKeySet,
+    create_access_token,
+    dummy_password_hash,
+    get_password_hash,
+    password_hash_executor,
+    token_cache,
+)
+from app.models.rate_limits import RateLimitBucket
+from app.schemas.clients import ClientCreate, ClientUpdate
+from app.services.clients import service_client, verified_secret_cache
+from argon2 import extract_parameters
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
 from fastapi import status
 from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from tests.utils import get_auth_request_data
+from tests.utils import (
+    get_auth_header,
+    get_auth_header_expired_token,
+    get_auth_request_data,
+    get_client_token,
+)
 
 API_AUTH_ENDPOINT = "/api/auth/token"
+API_JWKS_ENDPOINT = "/api/auth/.well-known/jwks.json"
+API_INTROSPECT_ENDPOINT = "/api/auth/introspect"
 
 
 @pytest.mark.anyio
@@ -33,6 +65,7 @@ async def test_invalid_credentials(http_client: AsyncClient) -> None:
     ],
 )
 async def test_valid_credentials(
+    db_session: AsyncSession,
     http_client: AsyncClient,
     client_id: str,
     client_secret: str,
@@ -58,3 +91,480 @@ async def test_valid_credentials(
     )
     assert payload.get("sub") == client_id
     assert isinstance(payload.get("exp"), int)
+
+    client = await service_client.get(db_session, oauth_id=client_id)
+    assert payload.get("cid") == client.id
+    assert payload.get("adm") == client.is_admin
+    assert payload.get("ver") == client.credentials_version
+
+
+@pytest.mark.anyio
+async def test_password_hash_executor_saturated(
+    http_client: AsyncClient,
+) -> None:
+    with patch.object(password_hash_executor, "max_pending", 0):
+        response = await http_client.post(
+            API_AUTH_ENDPOINT,
+            data=get_auth_request_data(
+                settings.EXTERNAL_CLIENT_ID,
+                settings.EXTERNAL_CLIENT_SECRET,
+            ),
+        )
+
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert response.headers.get("Retry-After") == "1"
+
+
+@pytest.mark.anyio
+async def test_rate_limit_per_client(http_client: AsyncClient) -> None:
+    auth_data = get_auth_request_data(settings.EXTERNAL_CLIENT_ID, "invalid")
+
+    with patch.object(token_client_rate_limiter, "burst", 2):
+        for _ in range(2):
+            response = await http_client.post(API_AUTH_ENDPOINT, data=auth_data)
+            assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+        verifications = password_hash_executor.stats().completed
+
+        response = await http_client.post(
+            API_AUTH_ENDPOINT,
+            data=get_auth_request_data(
+                settings.EXTERNAL_CLIENT_ID,
+                settings.EXTERNAL_CLIENT_SECRET,
+            ),
+        )
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert int(response.headers["Retry-After"]) >= 1
+        assert password_hash_executor.stats().completed == verifications
+
+        response = await http_client.post(
+            API_AUTH_ENDPOINT,
+            data=get_auth_request_data(
+                settings.ADMIN_CLIENT_ID,
+                settings.ADMIN_CLIENT_SECRET,
+            ),
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.anyio
+async def test_rate_limit_per_address(http_client: AsyncClient) -> None:
+    with (
+        patch.object(token_address_rate_limiter, "rate", 1.0),
+        patch.object(token_address_rate_limiter, "burst", 3),
+    ):
+        for i in range(3):
+            response = await http_client.post(
+                API_AUTH_ENDPOINT,
+                data=get_auth_request_data(f"unknown-{i}", "invalid"),
+            )
+            assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+        response = await http_client.post(
+            API_AUTH_ENDPOINT,
+            data=get_auth_request_data(
+                settings.EXTERNAL_CLIENT_ID,
+                settings.EXTERNAL_CLIENT_SECRET,
+            ),
+        )
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert "Retry-After" in response.headers
+
+
+@pytest.mark.anyio
+async def test_database_rate_limiter() -> None:
+    rate_limiter = DatabaseRateLimiter(
+        "test-database",
+        rate=0.5,
+        burst=2,
+        engine=engine,
+    )
+
+    try:
+        assert await rate_limiter.acquire("key") == 0
+        assert await rate_limiter.acquire("key") == 0
+        assert 0 < await rate_limiter.acquire("key") <= 2
+        assert await rate_limiter.acquire("other") == 0
+        assert rate_limiter.stats().rejected == 1
+
+        await rate_limiter.reset()
+        assert await rate_limiter.acquire("key") == 0
+    finally:
+        await rate_limiter.reset()
+
+    async with engine.connect() as conn:
+        assert not await conn.scalar(
+            select(RateLimitBucket.key).where(
+                RateLimitBucket.key.startswith("test-database:")
+            )
+        )
+
+
+@pytest.mark.anyio
+async def test_oauth_id_filter(
+    db_session: AsyncSession,
+    http_client: AsyncClient,
+) -> None:
+    await service_client.load_oauth_id_filter(db_session)
+    assert service_client.might_exist(settings.EXTERNAL_CLIENT_ID)
+    assert not service_client.might_exist("unknown")
+
+    verifications = password_hash_executor.stats().completed
+
+    with patch.object(service_client, "get") as get:
+        response = await http_client.post(
+            API_AUTH_ENDPOINT,
+            data=get_auth_request_data("unknown", "invalid"),
+        )
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    get.assert_not_called()
+    # The dummy hash is verified so that unknown ids are not rejected faster.
+    assert password_hash_executor.stats().completed == verifications + 1
+
+    client_schema = await service_client.new(
+        db_session,
+        create_schema=ClientCreate(name="New Service", is_admin=False),
+    )
+
+    response = await http_client.post(
+        API_AUTH_ENDPOINT,
+        data=get_auth_request_data(
+            client_schema.client_id,
+            client_schema.client_secret,
+        ),
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.anyio
+async def test_unknown_client_verifies_dummy_hash(
+    http_client: AsyncClient,
+) -> None:
+    verifications = password_hash_executor.stats().completed
+
+    response = await http_client.post(
+        API_AUTH_ENDPOINT,
+        data=get_auth_request_data("unknown", "invalid"),
+    )
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert password_hash_executor.stats().completed == verifications + 1
+
+    # The dummy hash has the parameters of the cheapest profile, so that
+    # unknown ids are not slower to reject than known ones on that profile.
+    assert extract_parameters(dummy_password_hash) == extract_parameters(
+        get_password_hash("secret", "machine")
+    )
+
+
+@pytest.mark.anyio
+async def test_verified_secret_cache(
+    db_session: AsyncSession,
+    http_client: AsyncClient,
+) -> None:
+    client_schema = await service_client.new(
+        db_session,
+        create_schema=ClientCreate(name="Frequent Service", is_admin=False),
+    )
+    auth_data = get_auth_request_data(
+        client_schema.client_id,
+        client_schema.client_secret,
+    )
+
+    with patch.object(verified_secret_cache, "max_size", 16):
+        response = await http_client.post(API_AUTH_ENDPOINT, data=auth_data)
+        assert response.status_code == status.HTTP_200_OK
+        verifications = password_hash_executor.stats().completed
+
+        response = await http_client.post(API_AUTH_ENDPOINT, data=auth_data)
+        assert response.status_code == status.HTTP_200_OK
+        assert password_hash_executor.stats().completed == verifications
+
+        response = await http_client.post(
+            API_AUTH_ENDPOINT,
+            data=get_auth_request_data(client_schema.client_id, "invalid"),
+        )
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+        client = await service_client.get(db_session, id=client_schema.id)
+        await service_client.admin_update(
+            db_session,
+            client,
+            ClientUpdate(regenerate_credentials=True),
+        )
+
+        response = await http_client.post(API_AUTH_ENDPOINT, data=auth_data)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.anyio
+async def test_token_without_client_claims(http_client: AsyncClient) -> None:
+    token = create_access_token(data={"sub": settings.EXTERNAL_CLIENT_ID})
+
+    response = await http_client.get(
+        "/api/v1/items",
+        headers=get_auth_header(token),
+    )
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "update_schema,revoked",
+    [
+        (ClientUpdate(name="Renamed Service"), False),
+        (ClientUpdate(is_admin=False), False),
+        (ClientUpdate(is_admin=True), True),
+    ],
+)
+async def test_token_revocation(
+    db_session: AsyncSession,
+    http_client: AsyncClient,
+    update_schema: ClientUpdate,
+    revoked: bool,
+) -> None:
+    token = await get_client_token(
+        http_client,
+        client_id=settings.EXTERNAL_CLIENT_ID,
+        client_secret=settings.EXTERNAL_CLIENT_SECRET,
+    )
+    headers = get_auth_header(token)
+
+    response = await http_client.get("/api/v1/items", headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+
+    client = await service_client.get(
+        db_session,
+        oauth_id=settings.EXTERNAL_CLIENT_ID,
+    )
+    await service_client.admin_update(db_session, client, update_schema)
+
+    response = await http_client.get("/api/v1/items", headers=headers)
+    assert response.status_code == (
+        status.HTTP_401_UNAUTHORIZED if revoked else status.HTTP_200_OK
+    )
+
+
+@pytest.mark.anyio
+async def test_token_cache_honors_expiry(
+    db_session: AsyncSession,
+    http_client: AsyncClient,
+) -> None:
+    client = await service_client.get(
+        db_session,
+        oauth_id=settings.EXTERNAL_CLIENT_ID,
+    )
+    token = create_access_token(
+        data={
+            "sub": client.oauth_id,
+            "cid": client.id,
+            "adm": client.is_admin,
+            "ver": client.credentials_version,
+        },
+        expire_delta=timedelta(seconds=1),
+    )
+    headers = get_auth_header(token)
+
+    for _ in range(2):
+        response = await http_client.get("/api/v1/items", headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+
+    assert token_cache.stats().size == 1
+
+    await asyncio.sleep(1.1)
+
+    response = await http_client.get("/api/v1/items", headers=headers)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert response.json()["detail"] == "Expired JWT"
+
+
+@pytest.mark.anyio
+async def test_introspect_requires_authentication(
+    http_client: AsyncClient,
+) -> None:
+    response = await http_client.post(
+        API_INTROSPECT_ENDPOINT,
+        data={"token": "invalid"},
+    )
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.anyio
+async def test_introspect_active_token(
+    http_client: AsyncClient,
+    http_client_admin: AsyncClient,
+) -> None:
+    token = await get_client_token(
+        http_client,
+        client_id=settings.EXTERNAL_CLIENT_ID,
+        client_secret=settings.EXTERNAL_CLIENT_SECRET,
+    )
+
+    response = await http_client_admin.post(
+        API_INTROSPECT_ENDPOINT,
+        data={"token": token},
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    result = response.json()
+    assert result["active"] is True
+    assert result["client_id"] == settings.EXTERNAL_CLIENT_ID
+    assert result["sub"] == settings.EXTERNAL_CLIENT_ID
+    assert result["is_admin"] is False
+
+    cache_control = response.headers["Cache-Control"]
+    assert cache_control.startswith("private, max-age=")
+    max_age = int(cache_control.removeprefix("private, max-age="))
+    assert 0 < max_age <= settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
+
+@pytest.mark.anyio
+async def test_introspect_revoked_token(
+    db_session: AsyncSession,
+    http_client: AsyncClient,
+    http_client_admin: AsyncClient,
+) -> None:
+    token = await get_client_token(
+        http_client,
+        client_id=settings.EXTERNAL_CLIENT_ID,
+        client_secret=settings.EXTERNAL_CLIENT_SECRET,
+    )
+
+    client = await service_client.get(
+        db_session,
+        oauth_id=settings.EXTERNAL_CLIENT_ID,
+    )
+    await service_client.admin_update(
+        db_session,
+        client,
+        ClientUpdate(regenerate_credentials=True),
+    )
+
+    response = await http_client_admin.post(
+        API_INTROSPECT_ENDPOINT,
+        data={"token": token},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"active": False}
+    assert response.headers["Cache-Control"] == "no-store"
+
+
+@pytest.mark.anyio
+async def test_introspect_batch(
+    http_client: AsyncClient,
+    http_client_admin: AsyncClient,
+) -> None:
+    token = await get_client_token(
+        http_client,
+        client_id=settings.EXTERNAL_CLIENT_ID,
+        client_secret=settings.EXTERNAL_CLIENT_SECRET,
+    )
+    expired_token = get_auth_header_expired_token(settings.EXTERNAL_CLIENT_ID)[
+        "Authorization"
+    ].removeprefix("Bearer ")
+
+    response = await http_client_admin.post(
+        f"{API_INTROSPECT_ENDPOINT}/batch",
+        json={"tokens": [token, "invalid", expired_token, token]},
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    results = response.json()["results"]
+    assert [result["active"] for result in results] == [
+        True,
+        False,
+        False,
+        True,
+    ]
+    assert response.headers["Cache-Control"].startswith("private, max-age=")
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("tokens", [[], ["token"] * 101])
+async def test_introspect_batch_size_limits(
+    http_client_admin: AsyncClient,
+    tokens: list[str],
+) -> None:
+    response = await http_client_admin.post(
+        f"{API_INTROSPECT_ENDPOINT}/batch",
+        json={"tokens": tokens},
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
+
+def generate_private_key_pem(algorithm: str) -> str:
+    private_key = (
+        ed25519.Ed25519PrivateKey.generate()
+        if algorithm == "EdDSA"
+        else rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    )
+    return private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode()
+
+
+@pytest.mark.anyio
+async def test_jwks_shared_secret(http_client: AsyncClient) -> None:
+    response = await http_client.get(API_JWKS_ENDPOINT)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"keys": []}
+    assert "max-age" in response.headers["Cache-Control"]
+
+    response = await http_client.get(
+        API_JWKS_ENDPOINT,
+        headers={"If-None-Match": response.headers["ETag"]},
+    )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("algorithm", ["RS256", "EdDSA"])
+async def test_asymmetric_signing_and_rotation(
+    http_client: AsyncClient,
+    algorithm: str,
+) -> None:
+    private_keys = {
+        "old": generate_private_key_pem(algorithm),
+        "new": generate_private_key_pem(algorithm),
+    }
+    old_keys = JWTKeySet(algorithm, None, private_keys, signing_key_id="old")
+    new_keys = JWTKeySet(algorithm, None, private_keys, signing_key_id="new")
+
+    old_token = old_keys.sign({"sub": "client"})
+    assert jwt.get_unverified_header(old_token)["kid"] == "old"
+    assert new_keys.decode(old_token)["sub"] == "client"
+
+    with patch("app.api.auth.jwt_keys", new_keys):
+        response = await http_client.get(API_JWKS_ENDPOINT)
+    assert response.status_code == status.HTTP_200_OK
+
+    # A sibling service verifies tokens locally from the published JWKS.
+    jwks = jwt.PyJWKSet.from_dict(response.json())
+    assert {key.key_id for key in jwks.keys} == {"old", "new"}
+
+    new_token = new_keys.sign({"sub": "client"})
+    signing_key = jwks[jwt.get_unverified_header(new_token)["kid"]]
+    payload = jwt.decode(new_token, signing_key.key, algorithms=[algorithm])
+    assert payload["sub"] == "client"
+
+    unknown_keys = JWTKeySet(
+        algorithm,
+        None,
+        {"other": generate_private_key_pem(algorithm)},
+    )
+    with pytest.raises(jwt.PyJWTError):
+        new_keys.decode(unknown_keys.sign({"sub": "client"}))
+
+    # Key ids that are not strings are rejected before the key lookup.
+    for kid in (["new"], {"new": 1}, None):
+        header = base64.urlsafe_b64encode(
+            json.dumps({"alg": algorithm, "kid": kid}).encode()
+        )
+        _, claims, signature = new_token.split(".")
+        forged_token = f"{header.rstrip(b'=').decode()}.{claims}.{signature}"
+
+        with pytest.raises(jwt.InvalidTokenError):
+            new_keys.decode(forged_token)
@@ -1,16 +1,25 @@
+import csv
+import io
+import json
+from datetime import datetime
+
 import pytest
 from app.core.config import settings
+from app.core.deps import get_count_db_session
+from app.main import app
 from app.models.clients import Client
-from app.schemas.clients import ClientCreate
+from app.schemas.clients import ClientCreate, ClientRead, ClientUpdate
 from app.services.clients import service_client
 from fastapi import status
 from httpx import AsyncClient
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from tests import utils
 
 API_CLIENTS_ENDPOINT = "/api/v1/clients"
 API_CLIENT_ID_ENDPOINT = "/api/v1/clients/{id}"
+API_CLIENTS_EXPORT_ENDPOINT = "/api/v1/clients/export"
 
 
 async def check_endpoints_access(
@@ -315,6 +324,73 @@ async def test_list_clients(
     )
 
 
+@pytest.mark.anyio
+async def test_list_clients_total_count(
+    db_session: AsyncSession,
+    http_client_admin: AsyncClient,
+) -> None:
+    await service_client.new(
+        db_session,
+        create_schema=ClientCreate(name="Service B", is_admin=False),
+    )
+
+    response = await http_client_admin.get(
+        API_CLIENTS_ENDPOINT,
+        params={"count": True, "per_page": 1},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.json()) == 1
+    assert response.headers["X-Total-Count"] == "3"
+    assert response.headers["X-Total-Count-Exact"] == "true"
+
+    # On its own session, the count runs concurrently with the page query,
+    # and only sees committed clients.
+    del app.dependency_overrides[get_count_db_session]
+
+    response = await http_client_admin.get(
+        API_CLIENTS_ENDPOINT,
+        params={"count": True, "per_page": 1},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.json()) == 1
+    assert response.headers["X-Total-Count"] == "2"
+
+
+@pytest.mark.anyio
+async def test_list_clients_filter_sort(
+    db_session: AsyncSession,
+    http_client_admin: AsyncClient,
+) -> None:
+    external_client = await service_client.get(
+        db_session,
+        oauth_id=settings.EXTERNAL_CLIENT_ID,
+    )
+    assert external_client is not None
+
+    response = await http_client_admin.get(
+        API_CLIENTS_ENDPOINT,
+        params={"filter": f"oauth_id:eq:{settings.EXTERNAL_CLIENT_ID}"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert [client["id"] for client in response.json()] == [external_client.id]
+
+    response = await http_client_admin.get(
+        API_CLIENTS_ENDPOINT,
+        params={"sort": "-id"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    ids = [client["id"] for client in response.json()]
+    assert ids == sorted(ids, reverse=True)
+
+    for params in ({"sort": "name"}, {"filter": "name:eq:Admin"}):
+        response = await http_client_admin.get(
+            API_CLIENTS_ENDPOINT,
+            params=params,
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
 @pytest.mark.anyio
 @pytest.mark.parametrize(
     "id,expected_name,expected_is_admin",
@@ -455,3 +531,234 @@ async def test_client_invalid_ids(
     )
 
     await delete_client(http_client_admin, id, expected_status)
+
+
+@pytest.mark.anyio
+async def test_update_client_item_quota(
+    db_session: AsyncSession,
+    http_client_admin: AsyncClient,
+) -> None:
+    client = await service_client.get(
+        db_session,
+        oauth_id=settings.EXTERNAL_CLIENT_ID,
+    )
+    client_id = client.id
+    await utils.create_items(
+        db_session,
+        client_oauth_id=settings.EXTERNAL_CLIENT_ID,
+        count=2,
+    )
+    client_url = API_CLIENT_ID_ENDPOINT.format(id=client_id)
+
+    # The quota cannot be lower than the number of items.
+    response = await http_client_admin.patch(client_url, json={"item_quota": 1})
+    assert response.status_code == status.HTTP_409_CONFLICT
+
+    response = await http_client_admin.patch(client_url, json={"item_quota": 2})
+    assert response.status_code == status.HTTP_200_OK
+
+    # The counter is maintained by the database.
+    await db_session.refresh(client)
+    response = await http_client_admin.get(client_url)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["item_count"] == 2
+    assert response.json()["item_quota"] == 2
+
+    # Other updates keep the quota, and an explicit null lifts it.
+    response = await http_client_admin.patch(client_url, json={"name": "B"})
+    assert response.status_code == status.HTTP_200_OK
+    assert client.item_quota == 2
+
+    response = await http_client_admin.patch(
+        client_url,
+        json={"item_quota": None},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert client.item_quota is None
+
+    response = await http_client_admin.patch(
+        client_url,
+        json={"item_quota": -1},
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
+
+@pytest.mark.anyio
+async def test_deactivated_client_rejected_immediately(
+    db_session: AsyncSession,
+    http_client: AsyncClient,
+    http_client_admin: AsyncClient,
+) -> None:
+    client_schema = await service_client.new(
+        db_session,
+        create_schema=ClientCreate(name="Cached Service", is_admin=False),
+    )
+    token = await utils.get_client_token(
+        http_client,
+        client_id=client_schema.client_id,
+        client_secret=client_schema.client_secret,
+    )
+    headers = utils.get_auth_header(token)
+
+    for _ in range(2):
+        response = await http_client.get("/api/v1/items", headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+
+    await delete_client(http_client_admin, id=client_schema.id)
+
+    response = await http_client.get("/api/v1/items", headers=headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "hash_profile,expected_status",
+    [
+        ("machine", status.HTTP_201_CREATED),
+        ("unknown", status.HTTP_422_UNPROCESSABLE_CONTENT),
+    ],
+)
+async def test_create_client_hash_profile(
+    db_session: AsyncSession,
+    http_client_admin: AsyncClient,
+    hash_profile: str,
+    expected_status: status,
+) -> None:
+    response = await http_client_admin.post(
+        API_CLIENTS_ENDPOINT,
+        json={"name": "Machine Service", "hash_profile": hash_profile},
+    )
+    assert response.status_code == expected_status
+
+    if expected_status == status.HTTP_201_CREATED:
+        client_data = response.json()
+        assert client_data["hash_profile"] == hash_profile
+
+        db_client = await service_client.get(db_session, id=client_data["id"])
+        assert db_client.hash_profile == hash_profile
+        assert "$m=19456,t=1,p=1$" in db_client.oauth_secret_hash
+
+
+@pytest.mark.anyio
+async def test_hash_profile_upgrade_on_authentication(
+    db_session: AsyncSession,
+    http_client: AsyncClient,
+) -> None:
+    client_schema = await service_client.new(
+        db_session,
+        create_schema=ClientCreate(
+            name="Machine Service",
+            hash_profile="machine",
+        ),
+    )
+    client = await service_client.get(db_session, id=client_schema.id)
+    machine_hash = client.oauth_secret_hash
+
+    await service_client.admin_update(
+        db_session,
+        client,
+        ClientUpdate(hash_profile="default"),
+    )
+    assert client.oauth_secret_hash == machine_hash
+
+    for _ in range(2):
+        await utils.get_client_token(
+            http_client,
+            client_id=client_schema.client_id,
+            client_secret=client_schema.client_secret,
+        )
+        await db_session.refresh(client)
+        assert client.hash_profile == "default"
+        assert "$m=65536,t=3,p=4$" in client.oauth_secret_hash
+
+    wrong_secret_data = utils.get_auth_request_data(
+        client_schema.client_id,
+        "invalid",
+    )
+    response = await http_client.post("/api/auth/token", data=wrong_secret_data)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.anyio
+async def test_active_clients_query_uses_partial_index(
+    db_session: AsyncSession,
+) -> None:
+    plan = await utils.explain(
+        db_session,
+        select(Client)
+        .filter(Client.deleted_at.is_(None))
+        .order_by(Client.id)
+        .limit(50),
+    )
+    assert "ix_clients_active_id" in plan
+
+
+@pytest.mark.anyio
+async def test_export_clients(
+    db_session: AsyncSession,
+    http_client_admin: AsyncClient,
+    http_client_external: AsyncClient,
+) -> None:
+    created = await create_new_client(http_client_admin, "Exported", False)
+    await http_client_admin.delete(
+        API_CLIENT_ID_ENDPOINT.format(id=created["id"])
+    )
+
+    response = await http_client_admin.get(API_CLIENTS_EXPORT_ENDPOINT)
+    assert response.status_code == status.HTTP_200_OK
+
+    clients = [json.loads(line) for line in response.text.splitlines()]
+    assert [client["id"] for client in clients] == [
+        client.id
+        for client in await service_client.get_many(
+            db_session,
+            page=1,
+            per_page=50,
+            active_only=True,
+        )
+    ]
+    assert set(clients[0]) == set(ClientRead.model_fields)
+
+    response = await http_client_admin.get(
+        API_CLIENTS_EXPORT_ENDPOINT,
+        params={"format": "csv", "active_only": False},
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert int(rows[-1]["id"]) == created["id"]
+    assert rows[-1]["deleted_at"]
+
+    response = await http_client_external.get(API_CLIENTS_EXPORT_ENDPOINT)
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.anyio
+async def test_list_clients_fields(
+    db_session: AsyncSession,
+    http_client_admin: AsyncClient,
+) -> None:
+    response = await http_client_admin.get(
+        API_CLIENTS_ENDPOINT,
+        params={"fields": "name,created_at"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    data = response.json()
+    assert [set(client) for client in data] == [
+        {"id", "name", "created_at"}
+    ] * len(data)
+
+    admin = await service_client.get(
+        db_session,
+        oauth_id=settings.ADMIN_CLIENT_ID,
+    )
+    admin_data = next(client for client in data if client["id"] == admin.id)
+    assert admin_data["name"] == admin.name
+    assert datetime.fromisoformat(admin_data["created_at"]) == admin.created_at
+
+    response = await http_client_admin.get(
+        API_CLIENTS_ENDPOINT,
+        params={"fields": "oauth_secret_hash"},
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
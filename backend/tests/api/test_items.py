@@ -1,14 +1,33 @@
+import csv
+import io
+import json
+from unittest.mock import patch
+
 import pytest
 from app.core.config import settings
-from app.services.items import service_item
-from fastapi import status
+from app.core.database import ReplicaRouter, SessionManager
+from app.core.deps import get_count_db_session
+from app.core.filters import parse_filters, parse_sort
+from app.core.pagination import fetch_page
+from app.main import app
+from app.models.clients import Client
+from app.models.items import SEARCH_CONFIG, Item
+from app.schemas.items import ItemCreate, ItemUpdate
+from app.services.clients import service_client
+from app.services.items import ITEM_LIST_SPEC, service_item
+from fastapi import HTTPException, status
 from httpx import AsyncClient
+from sqlalchemy import func, literal_column, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from tests import utils
 
 API_ITEMS_ENDPOINT = "/api/v1/items"
 API_ITEM_ID_ENDPOINT = "/api/v1/items/{id}"
+API_ITEMS_BULK_ENDPOINT = "/api/v1/items/bulk"
+API_ITEMS_IMPORT_ENDPOINT = "/api/v1/items/import"
+API_ITEMS_EXPORT_ENDPOINT = "/api/v1/items/export"
+API_ITEMS_SEARCH_ENDPOINT = "/api/v1/items/search"
 
 
 async def check_endpoints_access(
@@ -20,6 +39,16 @@ async def check_endpoints_access(
         response = await request_func(API_ITEMS_ENDPOINT, headers=headers)
         assert response.status_code == expected_status
 
+    # Callers are authenticated before their body is read.
+    for method in ["POST", "PATCH", "DELETE"]:
+        response = await http_client.request(
+            method,
+            API_ITEMS_BULK_ENDPOINT,
+            headers=headers,
+            content=b"[{}]",
+        )
+        assert response.status_code == expected_status
+
     items_id_url = API_ITEM_ID_ENDPOINT.format(id=1)
     for request_func in [
         http_client.get,
@@ -180,6 +209,439 @@ async def test_create_item(
         await check_item_data(db_session, item_data, title, description)
 
 
+@pytest.mark.anyio
+async def test_create_items_bulk(
+    db_session: AsyncSession,
+    http_client_external: AsyncClient,
+) -> None:
+    payload = [
+        {"title": f"Item {i}", "description": f"Description {i}"}
+        for i in range(10)
+    ]
+
+    response = await http_client_external.post(
+        API_ITEMS_BULK_ENDPOINT,
+        json=payload,
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+
+    data = response.json()
+    assert len(data) == len(payload)
+
+    for item_data, item_payload in zip(data, payload, strict=True):
+        await check_item_data(
+            db_session,
+            item_data,
+            item_payload["title"],
+            item_payload["description"],
+        )
+
+    assert [item["id"] for item in data] == sorted(item["id"] for item in data)
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "payload",
+    [
+        [],
+        {"title": "Item", "description": "Description"},
+        [{"title": "Item", "description": "Description"}, {"title": ""}],
+        [{"title": "Item", "description": "Description", "owner_id": 1}],
+        [{"title": "Item", "description": "Description"}]
+        * (settings.ITEMS_BULK_MAX_SIZE + 1),
+    ],
+)
+async def test_create_items_bulk_invalid(
+    db_session: AsyncSession,
+    http_client_external: AsyncClient,
+    payload: list | dict,
+) -> None:
+    response = await http_client_external.post(
+        API_ITEMS_BULK_ENDPOINT,
+        json=payload,
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+    assert all(error["loc"][0] == "body" for error in response.json()["detail"])
+
+    # Nothing is created when any item is invalid.
+    client = await service_client.get(
+        db_session,
+        oauth_id=settings.EXTERNAL_CLIENT_ID,
+    )
+    assert not await service_item.get_multi(db_session, owner_id=client.id)
+
+
+@pytest.mark.anyio
+async def test_update_items_bulk(
+    db_session: AsyncSession,
+    http_client_external: AsyncClient,
+) -> None:
+    db_items = await utils.create_items(
+        db_session,
+        client_oauth_id=settings.EXTERNAL_CLIENT_ID,
+        count=3,
+    )
+    foreign_item = await utils.create_item(
+        db_session,
+        client_oauth_id=settings.ADMIN_CLIENT_ID,
+    )
+
+    response = await http_client_external.patch(
+        API_ITEMS_BULK_ENDPOINT,
+        json=[
+            {"id": db_items[2].id, "title": "New Title"},
+            {"id": utils.NONEXISTENT_ID, "title": "New Title"},
+            {"id": db_items[0].id, "description": "New Description"},
+            {"id": foreign_item.id, "title": "New Title"},
+        ],
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == [
+        {"id": db_items[2].id, "outcome": "updated"},
+        {"id": utils.NONEXISTENT_ID, "outcome": "not_found"},
+        {"id": db_items[0].id, "outcome": "updated"},
+        {"id": foreign_item.id, "outcome": "not_found"},
+    ]
+
+    # Bulk updates do not synchronize the objects loaded in the session.
+    db_session.expire_all()
+    values = {
+        item.id: (item.title, item.description)
+        for item in await service_item.get_multi(db_session)
+    }
+    assert values[db_items[0].id] == ("Item 0", "New Description")
+    assert values[db_items[1].id] == ("Item 1", "Description 1")
+    assert values[db_items[2].id] == ("New Title", "Description 2")
+    assert values[foreign_item.id] == ("Item 1", "Description 1")
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "payload",
+    [
+        [],
+        [{"id": 1}],
+        [{"id": 1, "title": None, "description": None}],
+        [{"id": 1, "title": "a"}, {"id": 1, "title": "b"}],
+        [{"title": "a"}],
+    ],
+)
+async def test_update_items_bulk_invalid(
+    http_client_external: AsyncClient,
+    payload: list,
+) -> None:
+    response = await http_client_external.patch(
+        API_ITEMS_BULK_ENDPOINT,
+        json=payload,
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
+
+@pytest.mark.anyio
+async def test_delete_items_bulk(
+    db_session: AsyncSession,
+    http_client_external: AsyncClient,
+) -> None:
+    db_items = await utils.create_items(
+        db_session,
+        client_oauth_id=settings.EXTERNAL_CLIENT_ID,
+        count=3,
+    )
+    foreign_item = await utils.create_item(
+        db_session,
+        client_oauth_id=settings.ADMIN_CLIENT_ID,
+    )
+    ids = [db_items[1].id, foreign_item.id, db_items[0].id, utils.NONEXISTENT_ID]
+
+    with utils.capture_statements(db_session) as statements:
+        response = await http_client_external.request(
+            "DELETE",
+            API_ITEMS_BULK_ENDPOINT,
+            json={"ids": ids},
+        )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == [
+        {"id": db_items[1].id, "outcome": "deleted"},
+        {"id": foreign_item.id, "outcome": "not_found"},
+        {"id": db_items[0].id, "outcome": "deleted"},
+        {"id": utils.NONEXISTENT_ID, "outcome": "not_found"},
+    ]
+    assert sum(statement.startswith("DELETE") for statement in statements) == 1
+
+    assert await service_item.get(db_session, id=db_items[0].id) is None
+    assert await service_item.get(db_session, id=db_items[1].id) is None
+    assert await service_item.get(db_session, id=db_items[2].id) is not None
+    assert await service_item.get(db_session, id=foreign_item.id) is not None
+
+    response = await http_client_external.request(
+        "DELETE",
+        API_ITEMS_BULK_ENDPOINT,
+        json={"ids": [db_items[2].id, db_items[2].id]},
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
+
+async def stream(content: bytes, chunk_size: int = 7):
+    for start in range(0, len(content), chunk_size):
+        yield content[start : start + chunk_size]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "content_type,content,error_lines",
+    [
+        (
+            "application/x-ndjson",
+            b'{"title": "Item 0", "description": "Description 0"}\n'
+            b'{"title": "", "description": "Description"}\n'
+            b"\n"
+            b'{"title": "Item 1", "description": "Description 1"}\n'
+            b"not json\n"
+            b'{"title": "Item 2", "description": "Description 2"}',
+            [2, 5],
+        ),
+        (
+            "text/csv; charset=utf-8",
+            b"title,description\r\n"
+            b"Item 0,Description 0\r\n"
+            b",Description\r\n"
+            b"\r\n"
+            b'"Item 1","Description 1"\r\n'
+            b"too,many,values\r\n"
+            b'Item 2,"Description 2"\r\n',
+            [3, 6],
+        ),
+    ],
+)
+async def test_import_items(
+    db_session: AsyncSession,
+    http_client_external: AsyncClient,
+    content_type: str,
+    content: bytes,
+    error_lines: list[int],
+) -> None:
+    response = await http_client_external.post(
+        API_ITEMS_IMPORT_ENDPOINT,
+        content=stream(content),
+        headers={"Content-Type": content_type},
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    report = response.json()
+    assert report["imported"] == 3
+    assert report["rejected"] == 2
+    assert [error["line"] for error in report["errors"]] == error_lines
+    assert all(error["errors"] for error in report["errors"])
+
+    client = await service_client.get(
+        db_session,
+        oauth_id=settings.EXTERNAL_CLIENT_ID,
+    )
+    items = await service_item.get_multi(db_session, owner_id=client.id)
+    assert [(item.title, item.description) for item in items] == [
+        (f"Item {i}", f"Description {i}") for i in range(3)
+    ]
+
+
+@pytest.mark.anyio
+async def test_item_count(
+    db_session: AsyncSession,
+    http_client_external: AsyncClient,
+) -> None:
+    owner = await service_client.get(
+        db_session,
+        oauth_id=settings.EXTERNAL_CLIENT_ID,
+    )
+
+    async def check_item_count(expected: int) -> None:
+        item_count, actual = (
+            await db_session.execute(
+                select(
+                    Client.item_count,
+                    select(func.count())
+                    .select_from(Item)
+                    .filter_by(owner_id=owner.id)
+                    .scalar_subquery(),
+                ).filter_by(id=owner.id)
+            )
+        ).one()
+        assert item_count == actual == expected
+
+    await check_item_count(0)
+
+    response = await http_client_external.post(
+        API_ITEMS_ENDPOINT,
+        json={"title": "Item", "description": "Description"},
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    item_id = response.json()["id"]
+    await check_item_count(1)
+
+    response = await http_client_external.post(
+        API_ITEMS_BULK_ENDPOINT,
+        json=[{"title": "Item", "description": "Description"}] * 3,
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    bulk_ids = [item["id"] for item in response.json()]
+    await check_item_count(4)
+
+    response = await http_client_external.post(
+        API_ITEMS_IMPORT_ENDPOINT,
+        content=b'{"title": "Item", "description": "Description"}\n' * 2,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    await check_item_count(6)
+
+    response = await http_client_external.delete(
+        API_ITEM_ID_ENDPOINT.format(id=item_id)
+    )
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    await check_item_count(5)
+
+    response = await http_client_external.request(
+        "DELETE",
+        API_ITEMS_BULK_ENDPOINT,
+        json={"ids": [*bulk_ids, utils.NONEXISTENT_ID]},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    await check_item_count(2)
+
+
+@pytest.mark.anyio
+async def test_item_quota(
+    db_session: AsyncSession,
+    http_client_external: AsyncClient,
+) -> None:
+    owner = await service_client.get(
+        db_session,
+        oauth_id=settings.EXTERNAL_CLIENT_ID,
+    )
+    # Rejected creations roll the session back, expiring loaded objects.
+    owner_id = owner.id
+    await service_client.update(
+        db_session,
+        db_object=None,
+        update_schema={"item_quota": 3},
+        id=owner_id,
+    )
+    await utils.create_items(
+        db_session,
+        client_oauth_id=settings.EXTERNAL_CLIENT_ID,
+        count=2,
+    )
+    payload = {"title": "Item", "description": "Description"}
+
+    # Creations exceeding the quota are rejected as a whole.
+    response = await http_client_external.post(
+        API_ITEMS_BULK_ENDPOINT,
+        json=[payload] * 2,
+    )
+    assert response.status_code == status.HTTP_409_CONFLICT
+
+    response = await http_client_external.post(
+        API_ITEMS_IMPORT_ENDPOINT,
+        content=b'{"title": "Item", "description": "Description"}\n' * 2,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == status.HTTP_409_CONFLICT
+
+    response = await http_client_external.post(API_ITEMS_ENDPOINT, json=payload)
+    assert response.status_code == status.HTTP_201_CREATED
+
+    response = await http_client_external.post(API_ITEMS_ENDPOINT, json=payload)
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert response.json()["detail"] == "Item quota exceeded"
+
+    items = await service_item.get_multi(db_session, owner_id=owner_id)
+    assert len(items) == 3
+
+
+@pytest.mark.anyio
+async def test_import_items_limits(
+    http_client_external: AsyncClient,
+) -> None:
+    response = await http_client_external.post(
+        API_ITEMS_IMPORT_ENDPOINT,
+        content=b"{}",
+        headers={"Content-Type": "application/json"},
+    )
+    assert response.status_code == status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+
+    long_line = b'{"title": "%s", "description": "Description"}' % (
+        b"x" * settings.ITEMS_IMPORT_MAX_LINE_BYTES
+    )
+    content = (
+        long_line
+        + b"\n"
+        + b'{"title": "Item", "description": "Description"}\n' * 3
+        + b"{}\n" * (settings.ITEMS_IMPORT_MAX_ERRORS + 1)
+        + long_line
+    )
+    response = await http_client_external.post(
+        API_ITEMS_IMPORT_ENDPOINT,
+        content=stream(content, chunk_size=1000),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    report = response.json()
+    assert report["imported"] == 3
+    assert report["rejected"] == settings.ITEMS_IMPORT_MAX_ERRORS + 3
+    assert len(report["errors"]) == settings.ITEMS_IMPORT_MAX_ERRORS
+    assert report["errors"][0]["line"] == 1
+    assert report["errors"][1]["line"] == 5
+
+    # Rows holding more text than a batch are loaded by several batches.
+    description = "x" * (settings.ITEMS_IMPORT_MAX_LINE_BYTES // 2)
+    count = 2 * settings.ITEMS_IMPORT_BATCH_BYTES // len(description) + 1
+    assert count < settings.ITEMS_IMPORT_BATCH_SIZE
+    line = b'{"title": "Item", "description": "%s"}\n' % description.encode()
+    response = await http_client_external.post(
+        API_ITEMS_IMPORT_ENDPOINT,
+        content=stream(line * count),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["imported"] == count
+
+
+@pytest.mark.anyio
+async def test_import_items_owner_not_locked(
+    db_session: AsyncSession,
+    http_client_external: AsyncClient,
+) -> None:
+    owner = await service_client.get(
+        db_session,
+        oauth_id=settings.EXTERNAL_CLIENT_ID,
+    )
+    owner_id = owner.id
+    line = b'{"title": "Item", "description": "Description"}\n'
+
+    async def content():
+        # More than a batch, so that rows are copied before the check.
+        yield line * (settings.ITEMS_IMPORT_BATCH_SIZE + 1)
+
+        # The owner's row, updated by the triggers counting items, is not
+        # locked while the upload goes on.
+        async with SessionManager() as other_session:
+            await other_session.execute(
+                select(Client.id)
+                .filter_by(id=owner_id)
+                .with_for_update(nowait=True)
+            )
+
+        yield line
+
+    response = await http_client_external.post(
+        API_ITEMS_IMPORT_ENDPOINT,
+        content=content(),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["imported"] == settings.ITEMS_IMPORT_BATCH_SIZE + 2
+
+
 @pytest.mark.anyio
 async def test_list_items(
     db_session: AsyncSession,
@@ -216,6 +678,428 @@ async def test_list_items(
     assert len(data) == 0
 
 
+@pytest.mark.anyio
+async def test_list_items_cursor(
+    db_session: AsyncSession,
+    http_client_external: AsyncClient,
+) -> None:
+    db_items = await utils.create_items(
+        db_session,
+        client_oauth_id=settings.EXTERNAL_CLIENT_ID,
+        count=5,
+    )
+
+    ids = []
+    params = {"per_page": 2}
+
+    while True:
+        response = await http_client_external.get(
+            API_ITEMS_ENDPOINT,
+            params=params,
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        ids.extend(item["id"] for item in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+
+        if cursor is None:
+            break
+
+        assert f"cursor={cursor}" in response.headers["Link"]
+        assert response.headers["Link"].endswith('; rel="next"')
+        params = {"per_page": 2, "cursor": cursor}
+
+    assert ids == [db_item.id for db_item in db_items]
+
+    # Offset pages still work, and match the cursor pages.
+    response = await http_client_external.get(
+        API_ITEMS_ENDPOINT,
+        params={"per_page": 2, "page": 2},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert [item["id"] for item in response.json()] == ids[2:4]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "invalid",
+        "e30",
+        "eyJzIjoibmFtZSIsInYiOlsxXX0",
+        "eyJzIjoiaWQiLCJ2IjpbImEiXX0",
+    ],
+)
+async def test_list_items_invalid_cursor(
+    http_client_external: AsyncClient,
+    cursor: str,
+) -> None:
+    response = await http_client_external.get(
+        API_ITEMS_ENDPOINT,
+        params={"cursor": cursor},
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.anyio
+async def test_list_items_filter_sort(
+    db_session: AsyncSession,
+    http_client_external: AsyncClient,
+) -> None:
+    db_items = [
+        await utils.create_item(
+            db_session,
+            client_oauth_id=settings.EXTERNAL_CLIENT_ID,
+            title=title,
+            description="Description",
+        )
+        for title in ["Red", "Reed", "Rye", "Blue", "Red"]
+    ]
+    ids = [db_item.id for db_item in db_items]
+
+    async def list_ids(params: dict) -> list[int]:
+        response = await http_client_external.get(
+            API_ITEMS_ENDPOINT,
+            params=params,
+        )
+        assert response.status_code == status.HTTP_200_OK
+        return [item["id"] for item in response.json()]
+
+    assert await list_ids({"filter": "title:prefix:Re"}) == [
+        ids[0],
+        ids[1],
+        ids[4],
+    ]
+    assert await list_ids({"filter": "title:eq:Blue"}) == [ids[3]]
+    assert await list_ids({"filter": f"id:in:{ids[0]},{ids[2]}"}) == [
+        ids[0],
+        ids[2],
+    ]
+    assert (
+        await list_ids({"filter": [f"id:gt:{ids[0]}", f"id:lte:{ids[2]}"]})
+        == ids[1:3]
+    )
+    assert await list_ids({"sort": "-id"}) == ids[::-1]
+
+    # Keyset pages follow the requested order, and keep the filters.
+    titles = []
+    params = {"sort": "-title", "filter": "title:prefix:R", "per_page": 2}
+
+    while True:
+        response = await http_client_external.get(
+            API_ITEMS_ENDPOINT,
+            params=params,
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        titles.extend(item["title"] for item in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+
+        if cursor is None:
+            break
+
+        params = {**params, "cursor": cursor}
+
+    assert titles == ["Rye", "Reed", "Red", "Red"]
+
+    # Sort key fields are selected along with the requested ones.
+    response = await http_client_external.get(
+        API_ITEMS_ENDPOINT,
+        params={"sort": "title", "fields": "id", "per_page": 1},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == [{"id": ids[3], "title": "Blue"}]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"filter": "title"},
+        {"filter": "owner_id:eq:1"},
+        {"filter": "description:eq:Description"},
+        {"filter": "title:gt:A"},
+        {"filter": "title:eq:"},
+        {"filter": "id:eq:one"},
+        {"filter": f"id:eq:{2**63}"},
+        {"filter": "id:in:" + ",".join(["1"] * 101)},
+        {"sort": "description"},
+        # A cursor of another ordering.
+        {"sort": "title", "cursor": "eyJzIjoiaWQiLCJ2IjpbMV19"},
+    ],
+)
+async def test_list_items_invalid_filter_sort(
+    http_client_external: AsyncClient,
+    params: dict,
+) -> None:
+    response = await http_client_external.get(
+        API_ITEMS_ENDPOINT,
+        params=params,
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.anyio
+async def test_list_items_total_count(
+    db_session: AsyncSession,
+    http_client_external: AsyncClient,
+) -> None:
+    db_items = await utils.create_items(
+        db_session,
+        client_oauth_id=settings.EXTERNAL_CLIENT_ID,
+        count=5,
+    )
+
+    response = await http_client_external.get(API_ITEMS_ENDPOINT)
+    assert response.status_code == status.HTTP_200_OK
+    assert "X-Total-Count" not in response.headers
+
+    for params in (
+        {"count": True, "per_page": 2},
+        {"count": True, "per_page": 2, "fields": "title"},
+    ):
+        response = await http_client_external.get(
+            API_ITEMS_ENDPOINT,
+            params=params,
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()) == 2
+        assert response.headers["X-Total-Count"] == str(len(db_items))
+        assert response.headers["X-Total-Count-Exact"] == "true"
+        assert "X-Next-Cursor" in response.headers
+
+    response = await http_client_external.get(
+        API_ITEMS_ENDPOINT,
+        params={"count": True, "filter": f"id:gt:{db_items[2].id}"},
+    )
+    assert response.headers["X-Total-Count"] == "2"
+
+    # Above the threshold, filtered listings return the planner's estimate.
+    with patch.object(settings, "COUNT_EXACT_THRESHOLD", 0):
+        response = await http_client_external.get(
+            API_ITEMS_ENDPOINT,
+            params={"count": True, "filter": "id:gte:0"},
+        )
+    assert response.status_code == status.HTTP_200_OK
+    assert int(response.headers["X-Total-Count"]) >= 1
+    assert response.headers["X-Total-Count-Exact"] == "false"
+
+
+@pytest.mark.anyio
+async def test_list_items_total_count_concurrently(
+    db_session: AsyncSession,
+    http_client_external: AsyncClient,
+) -> None:
+    await utils.create_items(
+        db_session,
+        client_oauth_id=settings.EXTERNAL_CLIENT_ID,
+        count=3,
+    )
+
+    # On its own session, as outside of tests, the count runs concurrently
+    # with the page query, on another connection: it only sees committed
+    # items, while the page holds the test's uncommitted ones.
+    del app.dependency_overrides[get_count_db_session]
+
+    with patch("app.api.v1.items.fetch_page", wraps=fetch_page) as fetch:
+        response = await http_client_external.get(
+            API_ITEMS_ENDPOINT,
+            params={"count": True, "filter": "id:gte:0"},
+        )
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.json()) == 3
+    assert response.headers["X-Total-Count"] == "0"
+    assert fetch.call_args.kwargs["concurrently"] is True
+
+
+@pytest.mark.anyio
+async def test_export_items(
+    db_session: AsyncSession,
+    http_client_external: AsyncClient,
+    http_client_admin: AsyncClient,
+) -> None:
+    db_items = await utils.create_items(
+        db_session,
+        client_oauth_id=settings.EXTERNAL_CLIENT_ID,
+        count=5,
+    )
+
+    with patch.object(settings, "EXPORT_BATCH_SIZE", 2):
+        response = await http_client_external.get(API_ITEMS_EXPORT_ENDPOINT)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["Content-Type"] == "application/x-ndjson"
+    assert 'filename="items.ndjson"' in response.headers["Content-Disposition"]
+    assert [json.loads(line) for line in response.text.splitlines()] == [
+        {
+            "id": db_item.id,
+            "title": db_item.title,
+            "description": db_item.description,
+        }
+        for db_item in db_items
+    ]
+
+    response = await http_client_external.get(
+        API_ITEMS_EXPORT_ENDPOINT,
+        params={"format": "csv"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["Content-Type"].startswith("text/csv")
+    assert list(csv.reader(io.StringIO(response.text))) == [
+        ["id", "title", "description"],
+        *(
+            [str(db_item.id), db_item.title, db_item.description]
+            for db_item in db_items
+        ),
+    ]
+
+    # Check user with no items
+    response = await http_client_admin.get(API_ITEMS_EXPORT_ENDPOINT)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.text == ""
+
+    response = await http_client_external.get(
+        API_ITEMS_EXPORT_ENDPOINT,
+        params={"format": "xml"},
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
+
+@pytest.mark.anyio
+async def test_list_items_fields(
+    db_session: AsyncSession,
+    http_client_external: AsyncClient,
+) -> None:
+    db_items = await utils.create_items(
+        db_session,
+        client_oauth_id=settings.EXTERNAL_CLIENT_ID,
+        count=3,
+    )
+
+    response = await http_client_external.get(
+        API_ITEMS_ENDPOINT,
+        params={"fields": "title", "per_page": 2},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == [
+        {"id": db_item.id, "title": db_item.title} for db_item in db_items[:2]
+    ]
+
+    # Cursor pagination works on projected rows too.
+    response = await http_client_external.get(
+        API_ITEMS_ENDPOINT,
+        params={
+            "fields": "description,id",
+            "per_page": 2,
+            "cursor": response.headers["X-Next-Cursor"],
+        },
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == [
+        {"id": db_items[2].id, "description": db_items[2].description}
+    ]
+    assert "X-Next-Cursor" not in response.headers
+
+    response = await http_client_external.get(
+        API_ITEMS_ENDPOINT,
+        params={"fields": "title,owner_id"},
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.anyio
+async def test_search_items(
+    db_session: AsyncSession,
+    http_client_external: AsyncClient,
+) -> None:
+    items = {
+        title: await utils.create_item(
+            db_session,
+            client_oauth_id=settings.EXTERNAL_CLIENT_ID,
+            title=title,
+            description=description,
+        )
+        for title, description in [
+            ("Red apples", "Crunchy"),
+            ("Fruit basket", "A red apple and a pear"),
+            ("Green apple", "Sour"),
+            ("Pear", "Ripe"),
+        ]
+    }
+    # Items of other clients are never found.
+    await utils.create_item(
+        db_session,
+        client_oauth_id=settings.ADMIN_CLIENT_ID,
+        title="Red apple",
+        description="Crunchy",
+    )
+
+    response = await http_client_external.get(
+        API_ITEMS_SEARCH_ENDPOINT,
+        params={"q": "red apple"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    data = response.json()
+    # Title matches rank higher than description matches.
+    assert [item["id"] for item in data] == [
+        items["Red apples"].id,
+        items["Fruit basket"].id,
+    ]
+    assert data[0]["rank"] > data[1]["rank"] > 0
+    assert data[0]["description"] == "Crunchy"
+
+    response = await http_client_external.get(
+        API_ITEMS_SEARCH_ENDPOINT,
+        params={"q": "apple -red"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert [item["id"] for item in response.json()] == [items["Green apple"].id]
+
+    # Keyset pages, following the cursor, list every match once.
+    ids = []
+    params = {"q": "apple or pear", "per_page": 2}
+
+    while True:
+        response = await http_client_external.get(
+            API_ITEMS_SEARCH_ENDPOINT,
+            params=params,
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        ids.extend(item["id"] for item in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+
+        if cursor is None:
+            break
+
+        params = {**params, "cursor": cursor}
+
+    assert sorted(ids) == sorted(item.id for item in items.values())
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "params",
+    [
+        {},
+        {"q": ""},
+        {"q": "apple", "cursor": "eyJzIjoiaWQiLCJ2IjpbMV19"},
+    ],
+)
+async def test_search_items_invalid(
+    http_client_external: AsyncClient,
+    params: dict,
+) -> None:
+    response = await http_client_external.get(
+        API_ITEMS_SEARCH_ENDPOINT,
+        params=params,
+    )
+    assert response.status_code in {
+        status.HTTP_400_BAD_REQUEST,
+        status.HTTP_422_UNPROCESSABLE_CONTENT,
+    }
+
+
 @pytest.mark.anyio
 async def test_get_item(
     db_session: AsyncSession,
@@ -309,6 +1193,57 @@ async def test_update_item(
         )
 
 
+@pytest.mark.anyio
+async def test_item_writes_single_statement(db_session: AsyncSession) -> None:
+    client = await service_client.get(
+        db_session,
+        oauth_id=settings.EXTERNAL_CLIENT_ID,
+    )
+
+    with utils.capture_statements(db_session) as statements:
+        item = await service_item.new(
+            db_session,
+            client.id,
+            ItemCreate(title="Item", description="Description"),
+        )
+    assert len(statements) == 1
+    assert statements[0].startswith("INSERT") and "RETURNING" in statements[0]
+
+    with utils.capture_statements(db_session) as statements:
+        items = await service_item.new_many(
+            db_session,
+            client.id,
+            [
+                ItemCreate(title=f"Item {i}", description="Description")
+                for i in range(3)
+            ],
+        )
+    assert [item.title for item in items] == ["Item 0", "Item 1", "Item 2"]
+    assert len(statements) == 1
+    assert statements[0].startswith("INSERT") and "RETURNING" in statements[0]
+
+    with utils.capture_statements(db_session) as statements:
+        updated = await service_item.update_owned(
+            db_session,
+            item.id,
+            client.id,
+            ItemUpdate(title="Updated"),
+        )
+    assert updated.title == "Updated"
+    assert updated.description == "Description"
+    assert len(statements) == 1
+    assert statements[0].startswith("UPDATE") and "RETURNING" in statements[0]
+
+    with utils.capture_statements(db_session) as statements:
+        await service_item.delete_owned(db_session, item.id, client.id)
+    assert len(statements) == 1
+    assert statements[0].startswith("DELETE") and "RETURNING" in statements[0]
+
+    with pytest.raises(HTTPException) as exc_info:
+        await service_item.delete_owned(db_session, item.id, client.id)
+    assert exc_info.value.status_code == status.HTTP_404_NOT_FOUND
+
+
 @pytest.mark.anyio
 async def test_delete_item(
     db_session: AsyncSession,
@@ -388,3 +1323,150 @@ async def test_item_invalid_ids(
         item_id=item_id,
         expected_status=expected_status,
     )
+
+
+@pytest.fixture
+async def replica_router():
+    # The primary stands in for the replica: it only sees committed data,
+    # while the test's writes stay in the test transaction.
+    router = ReplicaRouter(
+        [f"{settings.DB_HOST}:{settings.DB_PORT}"],
+        max_lag_seconds=5,
+        sticky_seconds=60,
+    )
+    await router.check_health()
+
+    with (
+        patch("app.core.database.replica_router", router),
+        patch("app.core.deps.replica_router", router),
+    ):
+        yield router
+
+    await router.dispose()
+
+
+@pytest.mark.anyio
+async def test_reads_routed_to_replica(
+    db_session: AsyncSession,
+    http_client_external: AsyncClient,
+    replica_router: ReplicaRouter,
+) -> None:
+    assert [replica.healthy for replica in replica_router.stats()] == [True]
+
+    db_item = await utils.create_item(
+        db_session,
+        client_oauth_id=settings.EXTERNAL_CLIENT_ID,
+    )
+    item_url = API_ITEM_ID_ENDPOINT.format(id=db_item.id)
+
+    # Served by the replica, which cannot see the uncommitted item.
+    response = await http_client_external.get(item_url)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    # Writes always use the primary...
+    response = await http_client_external.patch(
+        item_url,
+        json={"title": "Updated"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    # ...and pin the client's reads to it, so that it reads its own writes.
+    response = await http_client_external.get(item_url)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["title"] == "Updated"
+
+
+@pytest.mark.anyio
+async def test_reads_fall_back_to_primary(
+    db_session: AsyncSession,
+    http_client_external: AsyncClient,
+    replica_router: ReplicaRouter,
+) -> None:
+    db_item = await utils.create_item(
+        db_session,
+        client_oauth_id=settings.EXTERNAL_CLIENT_ID,
+    )
+
+    with patch.object(replica_router, "max_lag_seconds", -1):
+        await replica_router.check_health()
+
+    assert [replica.healthy for replica in replica_router.stats()] == [False]
+
+    response = await http_client_external.get(
+        API_ITEM_ID_ENDPOINT.format(id=db_item.id)
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.anyio
+async def test_item_queries_use_owner_index(db_session: AsyncSession) -> None:
+    list_plan = await utils.explain(
+        db_session,
+        select(Item).filter_by(owner_id=1).order_by(Item.id).limit(50),
+    )
+    assert "ix_items_owner_id_id" in list_plan
+
+    cursor_plan = await utils.explain(
+        db_session,
+        select(Item)
+        .filter_by(owner_id=1)
+        .filter(Item.id > 100)
+        .order_by(Item.id)
+        .limit(50),
+    )
+    assert "ix_items_owner_id_id" in cursor_plan
+
+    get_plan = await utils.explain(
+        db_session,
+        select(Item).filter_by(id=1, owner_id=1),
+    )
+    # ``ix_items_owner_id_title_id`` can serve it as well, depending on the
+    # statistics, as long as ``id`` is an index condition.
+    assert "Seq Scan" not in get_plan
+    assert "Filter" not in get_plan
+    assert "(id = 1)" in get_plan
+
+
+@pytest.mark.anyio
+async def test_item_search_uses_gin_index(db_session: AsyncSession) -> None:
+    # The search configuration is a regconfig, which cannot be rendered as
+    # a literal by SQLAlchemy.
+    query = func.websearch_to_tsquery(
+        literal_column(f"'{SEARCH_CONFIG}'"),
+        "apple",
+    )
+    plan = await utils.explain(
+        db_session,
+        select(Item.id).filter(Item.search_vector.bool_op("@@")(query)),
+    )
+    assert "ix_items_search_vector" in plan
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    ("filters", "sort"),
+    [
+        (["title:prefix:Red"], "id"),
+        (["title:eq:Red"], "id"),
+        (["title:in:Red,Blue"], "id"),
+        (["id:gte:10", "id:lt:20"], "-id"),
+        ([], "title"),
+        ([], "-title"),
+    ],
+)
+async def test_item_list_filters_use_index(
+    db_session: AsyncSession,
+    filters: list[str],
+    sort: str,
+) -> None:
+    _, sort_option = parse_sort(sort, ITEM_LIST_SPEC)
+    plan = await utils.explain(
+        db_session,
+        select(Item)
+        .filter_by(owner_id=1)
+        .filter(*parse_filters(filters, ITEM_LIST_SPEC, max_in_values=10))
+        .order_by(*sort_option.order_by)
+        .limit(50),
+    )
+    assert "Seq Scan" not in plan
+    assert "ix_items_owner_id" in plan
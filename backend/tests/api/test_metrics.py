@@ -0,0 +1,71 @@
+import pytest
+from app.core.config import settings
+from app.core.database import get_pool_options
+from fastapi import status
+from httpx import AsyncClient
+
+from tests import utils
+
+API_METRICS_ENDPOINT = "/api/metrics"
+
+
+@pytest.mark.anyio
+async def test_metrics_no_credentials(http_client: AsyncClient) -> None:
+    response = await http_client.get(API_METRICS_ENDPOINT)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.anyio
+async def test_metrics_non_admin(http_client_external: AsyncClient) -> None:
+    response = await http_client_external.get(API_METRICS_ENDPOINT)
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.anyio
+async def test_metrics_client_cache(http_client_admin: AsyncClient) -> None:
+    response = await http_client_admin.get(API_METRICS_ENDPOINT)
+    assert response.status_code == status.HTTP_200_OK
+    before = response.json()["caches"]["clients"]
+
+    response = await http_client_admin.get(API_METRICS_ENDPOINT)
+    assert response.status_code == status.HTTP_200_OK
+    after = response.json()["caches"]["clients"]
+
+    assert after["size"] >= 1
+    assert after["hits"] == before["hits"] + 1
+    assert after["misses"] == before["misses"]
+
+
+@pytest.mark.anyio
+async def test_metrics_password_hash_executor(
+    http_client: AsyncClient,
+    http_client_admin: AsyncClient,
+) -> None:
+    response = await http_client_admin.get(API_METRICS_ENDPOINT)
+    before = response.json()["executors"]["password_hash"]
+
+    await utils.get_client_token(
+        http_client,
+        client_id=settings.EXTERNAL_CLIENT_ID,
+        client_secret=settings.EXTERNAL_CLIENT_SECRET,
+    )
+
+    response = await http_client_admin.get(API_METRICS_ENDPOINT)
+    after = response.json()["executors"]["password_hash"]
+
+    assert after["pending"] == 0
+    assert after["completed"] == before["completed"] + 1
+    assert after["run_time_total"] > before["run_time_total"]
+
+
+@pytest.mark.anyio
+async def test_metrics_database_pool(http_client_admin: AsyncClient) -> None:
+    response = await http_client_admin.get(API_METRICS_ENDPOINT)
+    assert response.status_code == status.HTTP_200_OK
+    pool = response.json()["pools"]["primary"]
+
+    # The test session holds a connection for the whole run.
+    assert pool["checked_out"] >= 1
+    assert pool["checkouts"] >= 1
+    assert pool["timeouts"] == 0
+    assert pool["size"] == get_pool_options().get("pool_size", 0)
@@ -3,8 +3,19 @@ from collections.abc import AsyncGenerator
 import pytest
 from app.core.config import settings
 from app.core.database import engine
-from app.core.deps import get_db_session
+from app.core.deps import (
+    get_count_db_session,
+    get_db_session,
+    token_address_rate_limiter,
+    token_client_rate_limiter,
+)
+from app.core.security import token_cache
 from app.main import app
+from app.services.clients import (
+    client_cache,
+    service_client,
+    verified_secret_cache,
+)
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
 
@@ -42,10 +53,25 @@ async def db_session(
 @pytest.fixture(autouse=True)
 async def override_get_db_session(db_session: AsyncSession):
     app.dependency_overrides[get_db_session] = lambda: db_session
+    # Counts then run after the page query, on the same session, and see
+    # the test's uncommitted data. Tests of the concurrent count, on a
+    # session of its own, delete this override.
+    app.dependency_overrides[get_count_db_session] = lambda: db_session
     yield
     app.dependency_overrides.clear()
 
 
+@pytest.fixture(autouse=True)
+async def clear_caches():
+    yield
+    client_cache.clear()
+    token_cache.clear()
+    verified_secret_cache.clear()
+    await token_address_rate_limiter.reset()
+    await token_client_rate_limiter.reset()
+    service_client.oauth_id_filter = None
+
+
 @pytest.fixture
 def client_factory():
     async def _make():
@@ -1,3 +1,5 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
 from datetime import timedelta
 
 from app.core.config import settings
@@ -8,6 +10,8 @@ from app.services.clients import service_client
 from app.services.items import service_item
 from fastapi import status
 from httpx import AsyncClient
+from sqlalchemy import Select, event, text
+from sqlalchemy.dialects import postgresql
 
 NONEXISTENT_ID = 999_999_999
 
@@ -99,3 +103,39 @@ async def create_items(
         db_items.append(db_item)
 
     return db_items
+
+
+async def explain(db_session, statement: Select) -> str:
+    """Return the query plan of ``statement``, with sequential scans and
+    explicit sorts disabled so that the planner picks indexes, including
+    for the ordering, even on tiny tables."""
+    sql = statement.compile(
+        dialect=postgresql.dialect(),
+        compile_kwargs={"literal_binds": True},
+    )
+    await db_session.execute(text("SET LOCAL enable_seqscan = off"))
+    await db_session.execute(text("SET LOCAL enable_sort = off"))
+    rows = await db_session.execute(text(f"EXPLAIN {sql}"))
+    return "\n".join(rows.scalars())
+
+
+@contextmanager
+def capture_statements(db_session) -> Iterator[list[str]]:
+    """Collect the SQL statements sent by ``db_session``, savepoints
+    excluded."""
+    statements: list[str] = []
+    sync_engine = db_session.bind.sync_engine
+
+    def before_cursor_execute(_conn, _cursor, statement, *_args) -> None:
+        if "SAVEPOINT" not in statement:
+            statements.append(statement)
+
+    event.listen(sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(
+            sync_engine,
+            "before_cursor_execute",
+            before_cursor_execute,
+        )